@@ -1,12 +1,72 @@
 import requests
 import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from Dinero import Dinero
 from Producto import Producto
+from ProductStore import ProductStore
 from ClienteNatural import ClienteNatural
 from ClienteJuridico import ClienteJuridico
 from Venta import Venta
 from Pago import Pago
 from Envio import Envio
+from RegistroCambios import RegistroCambios
+from GuardadoAutomatico import GuardadoAutomatico
+from MotorVentas import MotorVentas, TIPOS_PAGO
+from RepositorioJSON import RepositorioJSON
+from CatalogoMapeado import CatalogoMapeado
+from ParticionesMensuales import ParticionesMensuales
+from CodecJSON import CodecJSON
+from IndiceTrigramas import IndiceTrigramas
+from IndicePrecios import IndicePrecios
+from IndiceVehiculos import IndiceVehiculos
+from IndiceVentas import IndiceVentas
+from lector_json import TAMANO_TROZO, iterar_arreglo, trozos_archivo
+from instantanea_binaria import escribir_instantanea, leer_instantanea
+
+URL_API = "https://raw.githubusercontent.com/Algoritmos-y-Programacion/api-proyecto/main/products.json"
+
+# Colecciones cuyo archivo JSON cambia con cada tipo de cambio del registro
+COLECCIONES_CAMBIO = {
+    "cliente": ("clientes",),
+    "cliente_eliminado": ("clientes",),
+    "producto": ("productos",),
+    "producto_eliminado": ("productos",),
+    "venta": ("ventas", "productos"),
+    "pago": ("pagos",),
+    "envio": ("envios",),
+}
+
+# Colecciones que se guardan por mes, con el atributo que define el mes de cada elemento
+FECHA_PARTICION = {"ventas": "fecha", "pagos": "fecha", "envios": "fecha_envio"}
+# Colección guardada por mes que cambia con cada tipo de cambio del registro
+PARTICION_CAMBIO = {"venta": "ventas", "pago": "pagos", "envio": "envios"}
+
+# Archivo y campos de cada colección en la instantánea binaria (ver instantanea_binaria.py)
+ARCHIVO_INSTANTANEA = "datos.tvib"
+ESQUEMA_INSTANTANEA = {
+    "clientes": [("tipo", "texto"), ("correo", "texto"), ("direccion", "texto"), ("telefono", "texto"),
+                 ("nombre", "texto"), ("cedula", "texto"), ("razon_social", "texto"), ("rif", "texto"),
+                 ("nombre_contacto", "texto"), ("telf_contacto", "texto"), ("correo_contacto", "texto")],
+    "productos": [("id", "entero"), ("nombre", "texto"), ("descripcion", "texto"), ("precio", "real"),
+                  ("categoria", "texto"), ("inventario", "entero"), ("compatible_vehicles", ["lista", "texto"])],
+    "ventas": [("id", "entero"), ("fecha", "texto"), ("cliente_cedula", "texto"), ("cliente_rif", "texto"),
+               ("productos", ["lista", ["registro", [["id", "entero"], ["nombre", "texto"], ["precio", "real"],
+                                                     ["cantidad", "entero"]]]]),
+               ("metodo_pago", "texto"), ("metodo_envio", "texto"), ("subtotal", "real"), ("descuento", "real"),
+               ("iva", "real"), ("igtf", "real"), ("total", "real")],
+    "pagos": [("id", "entero"), ("cliente_cedula", "texto"), ("cliente_rif", "texto"), ("venta_id", "entero"),
+              ("monto_pago", "real"), ("metodo_pago", "texto"), ("moneda_pago", "texto"), ("estado", "booleano"),
+              ("fecha", "texto")],
+    "envios": [("id", "entero"), ("cliente_cedula", "texto"), ("cliente_rif", "texto"), ("venta_id", "entero"),
+               ("servicio_envio", "texto"), ("costo_servicio", "real"), ("nombre_motorizado", "texto"),
+               ("telefono_motorizado", "texto"), ("placa_motorizado", "texto"), ("fecha", "texto"),
+               ("estado", "booleano")],
+}
+
 
 class App:
     """
@@ -15,145 +75,1545 @@ class App:
 
     Atributos:
         clientes (list): Lista de clientes (naturales y jurídicos).
-        productos (list): Lista de productos disponibles.
+        productos (ProductStore): Catálogo columnar de productos disponibles.
         ventas (list): Lista de ventas realizadas.
         envios (list): Lista de envíos realizados.
         pagos (list): Lista de pagos registrados.
+        indice_nombres (IndiceTrigramas): Índice de trigramas sobre los nombres de los productos.
+        indice_precios (IndicePrecios): Índice de productos ordenado por precio.
+        indice_vehiculos (IndiceVehiculos): Índice inverso de vehículo a productos compatibles.
+        indice_ventas (IndiceVentas): Índices de las ventas cargadas por cliente y por fecha.
+        productos_por_id (dict): ID -> producto.
+        ventas_por_id (dict): ID -> venta.
+        pagos_por_id (dict): ID -> pago.
+        envios_por_id (dict): ID -> envío.
+        pagos_pendientes (dict): ID -> pago cargado pendiente (estado False).
+        pendientes_por_cliente (dict): Cédula o RIF -> {ID: pago pendiente} del cliente.
+        candado_pendientes (threading.Lock): Protege `pagos_pendientes` y
+            `pendientes_por_cliente` entre las cajas que venden a crédito, registran pagos y
+            consultan los pendientes de un cliente a la vez.
+        proximo_id (dict): Colección ("ventas", "pagos" o "envios") -> siguiente ID a asignar.
+        candado_ids (threading.Lock): Hace atómica la asignación de IDs entre las cajas que
+            registran ventas en paralelo.
+        clientes_por_cedula (dict): Cédula -> cliente natural.
+        clientes_por_rif (dict): RIF -> cliente jurídico.
+        clientes_por_correo (dict): Correo -> lista de clientes con ese correo, en orden de registro.
+        ultimo_id_producto (int): Mayor ID de producto registrado, para asignar IDs nuevos.
+        url_api (str): URL de la API del catálogo de productos.
+        ruta_cache (str): Archivo donde se guarda la última copia descargada del catálogo.
+        timeout_api (float): Segundos máximos de espera por la API antes de usar la copia local.
+        catalogo_listo (threading.Event): Se activa cuando el catálogo terminó de cargarse.
+        estado_catalogo (str): Último mensaje sobre el origen o el estado de la carga del catálogo.
+        catalogo_completo (bool): True si los registros de la última descarga del catálogo
+            llegaron hasta el final de una copia completa (API, caché o productos.json).
+        productos_cargados (int): Productos construidos hasta el momento durante la carga.
+        bytes_cargados (int): Bytes del catálogo leídos hasta el momento durante la carga.
+        bytes_totales (int): Tamaño del catálogo en bytes, si se conoce.
+        metricas_arranque (dict): Tiempos de arranque en milisegundos ("datos_ms", "primer_menu_ms", "catalogo_ms").
+        catalogo_compartido (CatalogoMapeado | None): Copia de solo lectura de la caché del catálogo,
+            mapeada en memoria y compartida entre los procesos que usan la misma caché.
+        catalogo_base (dict): ID -> valores del producto según la última versión aplicada de la API,
+            usado para combinar los cambios de la API con las modificaciones locales.
+        directorio_datos (str): Carpeta de los archivos JSON de clientes, productos, ventas, envíos y pagos.
+        productos_retirados (dict): ID -> producto vendido que ya no está en el catálogo, reconstruido
+            al cargar las ventas guardadas.
+        clientes_retirados (dict): ("cedula" | "rif", valor) -> cliente eliminado, reconstruido al cargar
+            las ventas, pagos y envíos guardados.
+        registro (RegistroCambios | None): Registro de cambios de la sesión, abierto por `abrir_registro`.
+        limite_registro (int): Cantidad de cambios a partir de la cual se compacta el registro.
+        modificados (set): Colecciones con cambios que aún no están en su archivo JSON, y
+            particiones ("ventas/2024-11") con cambios que aún no están en su archivo.
+        candado_modificados (threading.Lock): Protege `modificados` entre el menú y el guardado
+            automático.
+        guardado_cada (float | None): Segundos máximos entre puntos de control del guardado
+            automático, o None para no iniciarlo.
+        guardado_cambios (int): Cambios que adelantan el siguiente punto de control.
+        guardado_automatico (GuardadoAutomatico | None): Hilo del guardado automático.
+        particiones (dict): Colección -> `ParticionesMensuales` con sus archivos por mes.
+        por_mes (dict): Colección -> mes -> elementos cargados de ese mes.
+        ubicacion (dict): Colección -> ID -> mes de la partición donde está el elemento.
+        meses_recientes (int | None): Meses de ventas, pagos y envíos que se cargan al iniciar;
+            los anteriores se cargan cuando se necesitan. None para cargar todos.
+        formato (str): Formato de la copia completa de los datos: "json" (un archivo JSON por
+            colección) o "binario" (una instantánea binaria en `ARCHIVO_INSTANTANEA`).
+        codec_json (CodecJSON): Codificación de los archivos JSON de datos.
+        repositorio (Repositorio): Almacenamiento que carga los datos, guarda los cambios y
+            resuelve las búsquedas e informes.
+        motor_ventas (MotorVentas): Registro de ventas sin interacción, usado por el menú y
+            por la carga de pedidos por lotes.
     """
 
-    def __init__(self):
+    def __init__(self, url_api=URL_API, ruta_cache="catalogo_cache.json", timeout_api=3, directorio_datos=".",
+                 limite_registro=10_000, repositorio=None, formato="json", meses_recientes=3,
+                 guardado_cada=300, guardado_cambios=500, codec_json=None):
         """
-        Inicializa la aplicación con listas vacías para clientes, productos, ventas, envíos y pagos.
+        Inicializa la aplicación con listas vacías para clientes, ventas, envíos y pagos,
+        y un catálogo de productos vacío.
+
+        Args:
+            url_api (str): URL de la API del catálogo de productos.
+            ruta_cache (str): Archivo de caché del catálogo.
+            timeout_api (float): Tiempo máximo de espera por la API, en segundos.
+            directorio_datos (str): Carpeta de los archivos JSON guardados.
+            limite_registro (int): Cambios registrados a partir de los cuales se compacta el registro.
+            repositorio (Repositorio | None): Almacenamiento de los datos. Por defecto, los archivos
+                JSON con su registro de cambios (`RepositorioJSON`).
+            formato (str): "json" o "binario", formato de la copia completa de los datos.
+            meses_recientes (int | None): Meses de ventas, pagos y envíos cargados al iniciar.
+            guardado_cada (float | None): Segundos máximos entre puntos de control; None
+                para no guardar automáticamente.
+            guardado_cambios (int): Cambios que adelantan el punto de control.
+            codec_json (CodecJSON | None): Codificación de los archivos JSON. Por defecto,
+                indentada y con orjson si está instalado.
         """
         self.clientes = []
-        self.productos = []
+        self.productos = ProductStore()
         self.ventas = []
         self.envios = []  
         self.pagos = []
+        self.indice_nombres = IndiceTrigramas()
+        self.indice_precios = IndicePrecios()
+        self.indice_vehiculos = IndiceVehiculos()
+        self.indice_ventas = IndiceVentas()
+        self.productos_por_id = {}
+        self.ventas_por_id = {}
+        self.pagos_por_id = {}
+        self.envios_por_id = {}
+        self.pagos_pendientes = {}
+        self.pendientes_por_cliente = {}
+        self.candado_pendientes = threading.Lock()
+        self.proximo_id = {coleccion: 0 for coleccion in FECHA_PARTICION}
+        self.candado_ids = threading.Lock()
+        self.clientes_por_cedula = {}
+        self.clientes_por_rif = {}
+        self.clientes_por_correo = {}
+        self.ultimo_id_producto = 0
+        self.url_api = url_api
+        self.ruta_cache = ruta_cache
+        self.timeout_api = timeout_api
+        self.catalogo_listo = threading.Event()
+        self.estado_catalogo = "Cargando datos de la API"
+        self.catalogo_completo = False
+        self.productos_cargados = 0
+        self.bytes_cargados = 0
+        self.bytes_totales = 0
+        self.metricas_arranque = {}
+        self.catalogo_compartido = None
+        self.catalogo_base = {}
+        self.directorio_datos = directorio_datos
+        self.productos_retirados = {}
+        self.clientes_retirados = {}
+        self.registro = None
+        self.limite_registro = limite_registro
+        self.modificados = set()
+        self.candado_modificados = threading.Lock()
+        self.guardado_cada = guardado_cada
+        self.guardado_cambios = guardado_cambios
+        self.guardado_automatico = None
+        self.formato = formato
+        self.codec_json = codec_json if codec_json is not None else CodecJSON()
+        self.particiones = {coleccion: ParticionesMensuales(self.ruta_datos(coleccion), self.codec_json)
+                            for coleccion in FECHA_PARTICION}
+        self.por_mes = {coleccion: {} for coleccion in FECHA_PARTICION}
+        self.ubicacion = {coleccion: {} for coleccion in FECHA_PARTICION}
+        self.meses_recientes = meses_recientes
+        self.repositorio = repositorio if repositorio is not None else RepositorioJSON()
+        self.repositorio.vincular(self)
+        self.motor_ventas = MotorVentas(self)
+
+    def iniciar_carga_catalogo(self):
+        """
+        Inicia la carga del catálogo en un hilo de fondo. Al terminar (incluso con error)
+        se activa `catalogo_listo` y se registra la duración en `metricas_arranque`.
+        """
+        def cargar():
+            inicio = time.perf_counter()
+            try:
+                self.cargar_data_api()
+            except Exception as error:
+                self.estado_catalogo = f"Error cargando el catálogo: {error}"
+            finally:
+                self.metricas_arranque["catalogo_ms"] = (time.perf_counter() - inicio) * 1000
+                self.catalogo_listo.set()
+
+        threading.Thread(target=cargar, name="carga-catalogo", daemon=True).start()
+
+    def resumen_catalogo(self):
+        """
+        Devuelve una línea con el progreso de la carga del catálogo o su resultado.
+        """
+        if not self.catalogo_listo.is_set():
+            if self.productos_cargados:
+                porcentaje = f", {self.bytes_cargados / self.bytes_totales:.0%}" if self.bytes_totales else ""
+                return f"Catálogo: cargando ({self.productos_cargados} productos{porcentaje})"
+            return f"Catálogo: {self.estado_catalogo}"
+        return (f"Catálogo: {len(self.productos)} productos en "
+                f"{self.metricas_arranque.get('catalogo_ms', 0):.0f} ms - {self.estado_catalogo}")
+
+    def esperar_catalogo(self):
+        """
+        Bloquea hasta que el catálogo esté cargado, mostrando el progreso mientras tanto.
+        Solo lo usan las operaciones que dependen de los productos.
+        """
+        if self.catalogo_listo.is_set():
+            return
+        print("\nEsperando a que termine de cargar el catálogo de productos...")
+        while not self.catalogo_listo.wait(0.5):
+            print(self.resumen_catalogo())
+        print(self.resumen_catalogo())
+
+    def leer_cache_catalogo(self):
+        """
+        Lee los validadores HTTP de la copia local del catálogo descargada previamente.
+
+        La copia se guarda tal como la envió la API en `ruta_cache`, y su ETag y
+        Last-Modified en `ruta_cache` + ".meta".
+
+        Returns:
+            dict | None: Diccionario con "etag" y "last_modified", o None si no existe
+            una caché completa.
+        """
+        if not os.path.exists(self.ruta_cache):
+            return None
+        try:
+            with open(self.ruta_cache + ".meta", "r") as file:
+                meta = json.load(file)
+        except (OSError, ValueError):
+            return None
+        return meta if isinstance(meta, dict) else None
+
+    def descargar_catalogo(self, revalidar=False):
+        """
+        Obtiene los registros del catálogo, priorizando no bloquear el arranque. El origen
+        de los datos queda descrito en `estado_catalogo`.
+
+        Si existe una caché, se revalida contra la API con If-None-Match/If-Modified-Since:
+        una respuesta 304 reutiliza la copia local sin volver a descargarla. Si la API no
+        responde dentro de `timeout_api` o falla, se usa la caché, y si no la hay, el
+        archivo productos.json guardado en la última sesión. Si los productos ya se
+        restauraron de los datos guardados, productos.json no se vuelve a leer: es la misma
+        copia, sin los cambios del registro, y no una versión de la API.
+
+        Los registros se leen de forma incremental: nunca se decodifica el documento completo.
+        `catalogo_completo` solo pasa a True cuando se terminan de generar los registros de
+        una copia completa; si la copia local también falla, los registros terminan antes y
+        queda en False.
+
+        Args:
+            revalidar (bool): True para una actualización del catálogo ya cargado: si la API
+                responde 304 o no está disponible no hay nada que aplicar y se devuelve None.
+
+        Returns:
+            iterator | None: Registros de productos (formato de la API o de productos.json).
+        """
+        self.catalogo_completo = False
+        cache = self.leer_cache_catalogo()
+        restaurado = len(self.productos) > 0
+        headers = {}
+        if cache is not None:
+            if cache.get("etag"):
+                headers["If-None-Match"] = cache["etag"]
+            if cache.get("last_modified"):
+                headers["If-Modified-Since"] = cache["last_modified"]
+
+        try:
+            respuesta = requests.get(self.url_api, headers=headers, timeout=self.timeout_api, stream=True)
+            if respuesta.status_code == 304 and cache is not None:
+                respuesta.close()
+                if revalidar:
+                    self.estado_catalogo = "Catálogo sin cambios."
+                    return None
+                return self._registros_locales(cache, set(), "Catálogo sin cambios", restaurado)
+            respuesta.raise_for_status()
+        except requests.RequestException:
+            if revalidar:
+                self.estado_catalogo = "No se pudo contactar la API."
+                return None
+            return self._registros_locales(cache, set(), "No se pudo contactar la API", restaurado)
+
+        return self._registros_api(respuesta, cache, restaurado)
+
+    def _registros_api(self, respuesta, cache, restaurado):
+        """
+        Genera los registros de la respuesta de la API a medida que llegan los trozos,
+        copiando los bytes recibidos a la caché. La caché solo se reemplaza si la
+        descarga termina completa; si se interrumpe, se continúa con la copia local
+        omitiendo los productos ya generados.
+        """
+        self.bytes_totales = int(respuesta.headers.get("Content-Length") or 0)
+        temporal = self.ruta_cache + ".tmp"
+        vistos = set()
+
+        def trozos(file):
+            for trozo in respuesta.iter_content(chunk_size=TAMANO_TROZO):
+                file.write(trozo)
+                self.bytes_cargados += len(trozo)
+                yield trozo
+
+        try:
+            with respuesta, open(temporal, "wb") as file:
+                for registro in iterar_arreglo(trozos(file)):
+                    vistos.add(registro["id"])
+                    yield registro
+            os.replace(temporal, self.ruta_cache)
+            with open(self.ruta_cache + ".meta", "w") as file:
+                json.dump({"etag": respuesta.headers.get("ETag"),
+                           "last_modified": respuesta.headers.get("Last-Modified")}, file)
+            self.estado_catalogo = "Catálogo actualizado desde la API."
+            self.catalogo_completo = True
+        except (requests.RequestException, OSError, ValueError, KeyError):
+            if os.path.exists(temporal):
+                os.remove(temporal)
+            yield from self._registros_locales(cache, vistos, "La descarga del catálogo se interrumpió", restaurado)
+
+    def _registros_locales(self, cache, vistos, motivo, restaurado):
+        """
+        Genera los registros de la caché del catálogo o, si no existe, de productos.json,
+        omitiendo los IDs indicados en `vistos`.
+
+        Args:
+            cache (dict | None): Validadores de la caché, o None si no hay caché.
+            vistos (set): IDs de productos ya generados.
+            motivo (str): Motivo por el que se usa la copia local, para `estado_catalogo`.
+            restaurado (bool): True si los productos ya se cargaron de los datos guardados;
+                entonces no se usa productos.json.
+        """
+        if cache is None and restaurado:
+            # Sincronizar contra productos.json revertiría los cambios del registro
+            self.estado_catalogo = f"{motivo}, se conservan los productos guardados."
+            return
+        catalogo = self.abrir_catalogo_compartido() if cache is not None else None
+        if catalogo is not None:
+            ruta, origen = catalogo.ruta, "el catálogo compartido"
+        elif cache is not None:
+            ruta, origen = self.ruta_cache, "la copia local del catálogo"
+        else:
+            ruta, origen = self.ruta_datos("productos.json"), "productos.json"
+        try:
+            if catalogo is not None:
+                # Sin decodificar JSON: los registros se leen del mapeo compartido
+                registros = catalogo.registros()
+            else:
+                self.bytes_totales = os.path.getsize(ruta)
+                registros = iterar_arreglo(self._contar_bytes(trozos_archivo(ruta)))
+            for registro in registros:
+                if registro["id"] not in vistos:
+                    yield registro
+        except (OSError, ValueError, KeyError):
+            self.estado_catalogo = f"{motivo} y no hay una copia local válida del catálogo."
+            return
+        self.estado_catalogo = f"{motivo}, usando {origen}."
+        self.catalogo_completo = True
+
+    def ruta_catalogo_compartido(self):
+        """
+        Devuelve la ruta del catálogo mapeado que acompaña a la caché del catálogo.
+        """
+        return self.ruta_cache + ".tvcm"
+
+    def abrir_catalogo_compartido(self):
+        """
+        Abre el catálogo mapeado en memoria si fue escrito a partir de la versión actual de
+        la caché del catálogo (mismo tamaño y fecha de modificación).
+
+        Returns:
+            CatalogoMapeado | None: El catálogo abierto, o None si no existe o está desactualizado.
+        """
+        ruta = self.ruta_catalogo_compartido()
+        try:
+            origen = CatalogoMapeado.origen_archivo(self.ruta_cache)
+            if self.catalogo_compartido is not None and self.catalogo_compartido.origen == origen:
+                return self.catalogo_compartido
+            catalogo = CatalogoMapeado(ruta)
+        except (OSError, ValueError):
+            return None
+        if catalogo.origen != origen:
+            catalogo.cerrar()
+            return None
+        if self.catalogo_compartido is not None:
+            self.catalogo_compartido.cerrar()
+        self.catalogo_compartido = catalogo
+        return catalogo
+
+    def publicar_catalogo_compartido(self):
+        """
+        Escribe el catálogo mapeado a partir de la caché del catálogo, si aún no existe para
+        esta versión de la caché. Así los demás procesos que usan la misma caché cargan el
+        catálogo desde el mapeo, sin decodificar el JSON, y comparten sus páginas de memoria.
+        """
+        if self.leer_cache_catalogo() is None or self.abrir_catalogo_compartido() is not None:
+            return
+        try:
+            origen = CatalogoMapeado.origen_archivo(self.ruta_cache)
+            CatalogoMapeado.escribir(self.ruta_catalogo_compartido(),
+                                     (self.valores_registro(registro)
+                                      for registro in iterar_arreglo(trozos_archivo(self.ruta_cache))),
+                                     origen)
+        except (OSError, ValueError, KeyError):
+            return
+        self.abrir_catalogo_compartido()
+
+    def _contar_bytes(self, trozos):
+        """
+        Acumula en `bytes_cargados` el tamaño de los trozos leídos, para mostrar el progreso.
+        """
+        self.bytes_cargados = 0
+        for trozo in trozos:
+            self.bytes_cargados += len(trozo)
+            yield trozo
+
+    @staticmethod
+    def valores_registro(producto_info):
+        """
+        Extrae los valores de un registro de producto, con las claves de la API o con
+        las de productos.json.
+
+        Returns:
+            tuple: (id, nombre, descripcion, precio, categoria, inventario, compatible)
+        """
+        if 'name' in producto_info:
+            return (producto_info['id'], producto_info['name'], producto_info['description'], producto_info['price'],
+                    producto_info['category'], producto_info['inventory'], producto_info['compatible_vehicles'])
+        return (producto_info['id'], producto_info['nombre'], producto_info['descripcion'], producto_info['precio'],
+                producto_info['categoria'], producto_info['inventario'], producto_info['compatible_vehicles'])
 
     def cargar_data_api(self):
         """
-        Carga datos de productos desde una API y los almacena en la lista de productos.
-        La API proporciona información como ID, nombre, descripción, precio, categoría,
-        inventario y vehículos compatibles.
+        Carga datos de productos desde la API (o su copia local) y los almacena en la lista
+        de productos. La API proporciona información como ID, nombre, descripción, precio,
+        categoría, inventario y vehículos compatibles.
+        Los productos se construyen uno a uno a medida que se leen, por lo que la memoria
+        adicional usada durante la carga es la de un solo registro.
+        Al terminar se activa `catalogo_listo`.
+
+        Si el catálogo ya se restauró desde productos.json, se sincroniza contra la copia en
+        caché de la API para conservar las modificaciones locales.
+        """
+        if len(self.productos) and not self.catalogo_base:
+            self.cargar_base_catalogo()
+        conteo = self.sincronizar_catalogo(self.descargar_catalogo())
+        self.catalogo_listo.set()
+        self.publicar_catalogo_compartido()
+        return conteo
+
+    def actualizar_catalogo(self):
         """
-        data = requests.get("https://raw.githubusercontent.com/Algoritmos-y-Programacion/api-proyecto/main/products.json").json()
+        Revalida el catálogo contra la API y aplica solo las diferencias, mostrando cuántos
+        productos se insertaron, actualizaron y eliminaron.
+        """
+        registros = self.descargar_catalogo(revalidar=True)
+        if registros is None:
+            print(f"\n{self.estado_catalogo} No hay cambios que aplicar.")
+            return
+        conteo = self.sincronizar_catalogo(registros)
+        self.publicar_catalogo_compartido()
+        print(f"\n{self.estado_catalogo}")
+        print(f"Insertados: {conteo['insertados']} - Actualizados: {conteo['actualizados']} - "
+              f"Eliminados: {conteo['eliminados']} - Sin cambios: {conteo['sin_cambios']}")
 
-        for producto_info in data:
-            id = producto_info['id']
-            nombre = producto_info['name']
-            descripcion = producto_info['description']
-            precio = producto_info['price']
-            categoria = producto_info['category']
-            inventario = producto_info['inventory']
-            compatible = []
+    def sincronizar_catalogo(self, registros):
+        """
+        Compara los registros de la API con el catálogo actual por ID y aplica solo las diferencias.
+
+        Para cada producto se compara la versión nueva de la API con la última aplicada
+        (`catalogo_base`): solo los campos que cambiaron en la API se escriben en el producto
+        local, de modo que las modificaciones locales de los demás campos se conservan. El
+        inventario se combina sumando la variación de la API al inventario local, para no
+        perder las unidades descontadas por las ventas. Si no se conoce la versión anterior
+        de un producto local (no hay caché del catálogo), se conserva el producto local y la
+        versión de la API queda como base para las próximas sincronizaciones. Los productos
+        que la API dejó de publicar se eliminan, pero solo si los registros llegaron hasta el
+        final del catálogo (`catalogo_completo`): si la descarga y la copia local fallaron a
+        mitad, los productos que faltan no se leyeron, no se dejaron de publicar. Los
+        agregados localmente no se tocan, y los eliminados localmente solo vuelven si la API
+        los modificó.
+
+        Los productos sin cambios no se reconstruyen ni se reindexan. En la carga inicial
+        (catálogo vacío) los índices se construyen una sola vez al final. Los productos
+        insertados, actualizados y eliminados se agregan al registro de cambios.
 
-            for vehiculo in producto_info['compatible_vehicles']:
-                compatible.append(vehiculo)
-            producto = Producto(id, nombre, descripcion, precio, categoria, inventario, compatible)
+        Args:
+            registros (iterable): Registros de productos (formato de la API o de productos.json).
 
-            self.productos.append(producto)
+        Returns:
+            dict: Cantidad de productos "insertados", "actualizados", "eliminados" y "sin_cambios".
+        """
+        conteo = {"insertados": 0, "actualizados": 0, "eliminados": 0, "sin_cambios": 0}
+        carga_inicial = len(self.productos) == 0
+        vistos = set()
+
+        for producto_info in registros:
+            id, nombre, descripcion, precio, categoria, inventario, compatible = self.valores_registro(producto_info)
+            nuevo = (nombre, descripcion, precio, categoria, inventario, tuple(compatible))
+            vistos.add(id)
+            producto = self.productos_por_id.get(id)
+
+            if producto is None and self.catalogo_base.get(id) == nuevo:
+                # Eliminado localmente y sin cambios en la API: no se vuelve a agregar
+                conteo["sin_cambios"] += 1
+            elif producto is None:
+                producto = Producto(id, nombre, descripcion, precio, categoria, inventario, list(compatible), store=self.productos)
+                if carga_inicial:
+                    self.productos_por_id[id] = producto
+                    self.ultimo_id_producto = max(self.ultimo_id_producto, id)
+                else:
+                    self.indexar_producto(producto)
+                self.registrar_cambio("producto", self.serializar_producto(producto), sincronizar=False)
+                conteo["insertados"] += 1
+            else:
+                base = self.catalogo_base.get(id)
+                if base is None:
+                    # Sin versión previa conocida no se sabe qué cambió en la API y qué
+                    # localmente: se conserva el producto local
+                    conteo["sin_cambios"] += 1
+                else:
+                    # Las cajas pueden estar descontando el inventario de este producto
+                    with self.motor_ventas.candado_producto(producto):
+                        actualizado = self._aplicar_cambios(producto, base, nuevo)
+                        if actualizado:
+                            self.registrar_cambio("producto", self.serializar_producto(producto), sincronizar=False)
+                    conteo["actualizados" if actualizado else "sin_cambios"] += 1
+
+            self.catalogo_base[id] = nuevo
+            self.productos_cargados += 1
+
+        # Productos que venían de la API y ya no se publican. Si los registros se cortaron
+        # antes del final, los que faltan solo no se leyeron y se conservan
+        if self.catalogo_completo:
+            for id in [id for id in self.catalogo_base if id not in vistos]:
+                del self.catalogo_base[id]
+                producto = self.productos_por_id.get(id)
+                if producto is not None:
+                    self.productos.remove(producto)
+                    self.desindexar_producto(producto)
+                    self.registrar_cambio("producto_eliminado", {"id": id}, sincronizar=False)
+                    conteo["eliminados"] += 1
+
+        if carga_inicial:
+            self.indice_nombres.construir(self.productos)
+            self.indice_precios.construir(self.productos)
+            self.indice_vehiculos.construir(self.productos)
+        # Los cambios del catálogo se confirman juntos, con una sola sincronización a disco
+        self.repositorio.sincronizar()
+        return conteo
+
+    def _aplicar_cambios(self, producto, base, nuevo):
+        """
+        Escribe en un producto los campos que cambiaron entre la versión base y la nueva
+        versión de la API, actualizando solo los índices afectados. Se llama con el candado
+        del producto tomado (`MotorVentas.candado_producto`), porque la variación del
+        inventario se suma al que descuentan las ventas.
+
+        Returns:
+            bool: True si se modificó algún campo.
+        """
+        if base == nuevo:
+            return False
+        nombre, descripcion, precio, categoria, inventario, compatible = nuevo
+        nombre_base, descripcion_base, precio_base, categoria_base, inventario_base, compatible_base = base
+
+        if nombre != nombre_base:
+            producto.nombre = nombre
+            self.indice_nombres.actualizar(producto)
+        if descripcion != descripcion_base:
+            producto.descripcion = descripcion
+        if precio != precio_base:
+            producto.precio = precio
+            self.indice_precios.actualizar(producto)
+        if categoria != categoria_base:
+            producto.categoria = categoria
+        if inventario != inventario_base:
+            producto.inventario = max(0, producto.inventario + inventario - inventario_base)
+        if compatible != compatible_base:
+            self.indice_vehiculos.eliminar(producto)
+            producto.compatible = list(compatible)
+            self.indice_vehiculos.agregar(producto)
+        return True
+
+    @staticmethod
+    def clave_cliente(cliente):
+        """
+        Devuelve la cédula o el RIF de un cliente.
+        """
+        return getattr(cliente, "cedula", None) or getattr(cliente, "rif", None)
+
+    @staticmethod
+    def referencia_cliente(cliente):
+        """
+        Devuelve la referencia a un cliente con la que se guardan ventas, pagos y envíos.
+        """
+        return {
+            "cliente_cedula": cliente.cedula if isinstance(cliente, ClienteNatural) else None,
+            "cliente_rif": cliente.rif if isinstance(cliente, ClienteJuridico) else None,
+        }
+
+    def serializar_cliente(self, cliente):
+        """
+        Convierte un cliente en el diccionario que se guarda en clientes.json.
+        """
+        if isinstance(cliente, ClienteNatural):
+            return {
+                "tipo": "Natural",
+                "correo": cliente.correo,
+                "direccion": cliente.direccion,
+                "telefono": cliente.telefono,
+                "nombre": cliente.nombre,
+                "cedula": cliente.cedula
+            }
+        return {
+            "tipo": "Juridico",
+            "correo": cliente.correo,
+            "direccion": cliente.direccion,
+            "telefono": cliente.telefono,
+            "razon_social": cliente.razon_social,
+            "rif": cliente.rif,
+            "nombre_contacto": cliente.nombre_contacto,
+            "telf_contacto": cliente.telf_contacto,
+            "correo_contacto": cliente.correo_contacto
+        }
+
+    def serializar_producto(self, producto):
+        """
+        Convierte un producto en el diccionario que se guarda en productos.json.
+        """
+        return {
+            "id": producto.id,
+            "nombre": producto.nombre,
+            "descripcion": producto.descripcion,
+            "precio": float(producto.precio),
+            "categoria": producto.categoria,
+            "inventario": producto.inventario,
+            "compatible_vehicles": producto.compatible
+        }
+
+    @staticmethod
+    def serializar_fila_producto(fila):
+        """
+        Convierte los valores de una fila del catálogo (`ProductStore.leer_fila`) en el
+        diccionario que se guarda en productos.json.
+        """
+        id, nombre, descripcion, precio, categoria, inventario, compatible = fila
+        return {"id": id, "nombre": nombre, "descripcion": descripcion, "precio": float(precio),
+                "categoria": categoria, "inventario": inventario, "compatible_vehicles": compatible}
 
-    def guardar_JSON(self):     
+    def serializar_venta(self, venta):
+        """
+        Convierte una venta en el diccionario que se guarda en ventas.json. Los montos se
+        guardan como números con dos decimales.
+        """
+        return {
+            "id": venta.id,
+            "fecha": venta.fecha,
+            **self.referencia_cliente(venta.cliente),
+            "productos": [{"id": p.id, "nombre": p.nombre, "precio": float(p.precio), "cantidad": c}
+                          for p, c in venta.productos.items()],
+            "metodo_pago": venta.metodo_pago,
+            "metodo_envio": venta.metodo_envio,
+            "subtotal": float(venta.subtotal),
+            "descuento": float(venta.descuento),
+            "iva": float(venta.iva),
+            "igtf": float(venta.igtf),
+            "total": float(venta.total)
+        }
+
+    def serializar_envio(self, envio):
+        """
+        Convierte un envío en el diccionario que se guarda en envios.json.
+        """
+        return {
+            "id": envio.id,
+            **self.referencia_cliente(envio.cliente),
+            "venta_id": envio.orden_compra.id,
+            "servicio_envio": envio.servicio_envio,
+            "costo_servicio": envio.costo_servicio,
+            "nombre_motorizado": envio.nombre_motorizado,
+            "telefono_motorizado": envio.telefono_motorizado,
+            "placa_motorizado": envio.placa_motorizado,
+            "fecha": envio.fecha_envio,
+            "estado": envio.estado
+        }
+
+    def serializar_pago(self, pago):
+        """
+        Convierte un pago en el diccionario que se guarda en pagos.json.
+        """
+        return {
+            "id": pago.id,
+            **self.referencia_cliente(pago.cliente),
+            "venta_id": pago.venta.id,
+            "monto_pago": float(pago.monto_pago),
+            "metodo_pago": pago.metodo_pago,
+            "moneda_pago": pago.moneda_pago,
+            "estado": pago.estado,
+            "fecha": pago.fecha
+        }
+
+    def guardar_JSON(self, todo=False):
         """
         Guarda los datos de clientes, productos, ventas, envíos y pagos en archivos JSON.
         Los datos se estructuran según su tipo (ClienteNatural, ClienteJuridico, Venta, Envio, Pago)
         y se almacenan en archivos independientes.
+
+        Es la copia completa de los datos: los cambios posteriores se agregan al registro de
+        cambios, y al compactarlo se vuelve a guardar esta copia.
+
+        Las ventas, pagos y envíos se guardan por mes (`ventas/2024-11.json`), con un
+        manifiesto por colección (ver ParticionesMensuales.py); los clientes y productos, en
+        un archivo cada uno. Solo se reescriben los archivos de las colecciones y los meses en
+        `modificados` y los que aún no existen. Cada archivo se serializa y se escribe en su
+        propio hilo, y los manifiestos se escriben al final.
+
+        El guardado tiene dos pasos: elegir qué escribir (`capturar_JSON`) y escribirlo
+        (`escribir_captura`). Aquí los archivos se escriben directamente desde los objetos;
+        el guardado automático, que corre mientras se usa el menú, escribe una copia.
+
+        Args:
+            todo (bool): True para reescribir todos los archivos aunque no tengan cambios.
+
+        Returns:
+            dict: Nombre del archivo -> (bytes escritos, segundos), y "total" -> (bytes, segundos
+            de todo el guardado).
         """
-        # Guardar clientes en clientes.json
-        clientes_data = []
-        for cliente in self.clientes:
-            if isinstance(cliente, ClienteNatural):
-                clientes_data.append({
-                    "tipo": "Natural",
-                    "correo": cliente.correo,
-                    "direccion": cliente.direccion,
-                    "telefono": cliente.telefono,
-                    "nombre": cliente.nombre,
-                    "cedula": cliente.cedula
-                })
-            elif isinstance(cliente, ClienteJuridico):
-                clientes_data.append({
-                    "tipo": "Juridico",
-                    "correo": cliente.correo,
-                    "direccion": cliente.direccion,
-                    "telefono": cliente.telefono,
-                    "razon_social": cliente.razon_social,
-                    "rif": cliente.rif,
-                    "nombre_contacto": cliente.nombre_contacto,
-                    "telf_contacto": cliente.telf_contacto,
-                    "correo_contacto": cliente.correo_contacto
-                })
-        with open("clientes.json", "w") as file:
-            json.dump(clientes_data, file, indent=4)
-        
-        # Guardar productos en productos.json
-        productos_data = []
-        for producto in self.productos:
-            productos_data.append({
-                "id": producto.id,
-                "nombre": producto.nombre,
-                "descripcion": producto.descripcion,
-                "precio": producto.precio,
-                "categoria": producto.categoria,
-                "inventario": producto.inventario,
-                "compatible_vehicles": producto.compatible
-            })
-        with open("productos.json", "w") as file:
-            json.dump(productos_data, file, indent=4)
-
-        # Guardar ventas en ventas.json
-        ventas_data = []
-        for venta in self.ventas:
-            ventas_data.append({
-                "id": venta.id,
-                "fecha": venta.fecha,
-                "cliente_cedula": venta.cliente.cedula if isinstance(venta.cliente, ClienteNatural) else None,
-                "cliente_rif": venta.cliente.rif if isinstance(venta.cliente, ClienteJuridico) else None,
-                "productos": [{"id": p.id, "cantidad": c} for p, c in venta.productos.items()],
-                "metodo_pago": venta.metodo_pago,
-                "metodo_envio": venta.metodo_envio,
-                "subtotal": venta.subtotal,
-                "descuento": venta.descuento,
-                "iva": venta.iva,
-                "igtf": venta.igtf,
-                "total": venta.total
-            })
-        with open("ventas.json", "w") as file:
-            json.dump(ventas_data, file, indent=4)
-
-        # Guardar envíos en envios.json
-        envios_data = []
-        for envio in self.envios:
-            envios_data.append({
-                "cliente_cedula": envio.cliente.cedula if isinstance(envio.cliente, ClienteNatural) else None,
-                "cliente_rif": envio.cliente.rif if isinstance(envio.cliente, ClienteJuridico) else None,
-                "venta_id": envio.orden_compra.id,
-                "servicio_envio": envio.servicio_envio,
-                "costo_servicio": envio.costo_servicio,
-                "nombre_motorizado": envio.nombre_motorizado,
-                "telefono_motorizado": envio.telefono_motorizado,
-                "placa_motorizado": envio.placa_motorizado,
-                "fecha": envio.fecha_envio,
-            })
-        with open("envios.json", "w") as file:
-            json.dump(envios_data, file, indent=4)
-
-        # Guardar pagos en pagos.json
-        pagos_data = []
-        for pago in self.pagos:
-            pagos_data.append({
-                "cliente_cedula": pago.cliente.cedula if isinstance(pago.cliente, ClienteNatural) else None,
-                "cliente_rif": pago.cliente.rif if isinstance(pago.cliente, ClienteJuridico) else None,
-                "venta_id": pago.venta.id,
-                "monto_pago": pago.monto_pago,
-                "metodo_pago": pago.metodo_pago,
-                "moneda_pago": pago.moneda_pago,
-                "estado": pago.estado,
-                "fecha": pago.fecha
-            })
-        with open("pagos.json", "w") as file:
-            json.dump(pagos_data, file, indent=4)
+        return self.escribir_captura(self.capturar_JSON(todo, copiar=False))
+
+    def capturar_JSON(self, todo=False, copiar=True):
+        """
+        Elige los archivos que escribe `guardar_JSON` y, con `copiar`, toma una copia de sus
+        datos: los clientes, ventas, pagos y envíos se convierten en sus diccionarios, y del
+        catálogo se copian las columnas (`ProductStore.copiar_columnas`), de modo que los
+        cambios posteriores no alteran la copia mientras se escribe.
+
+        Args:
+            todo (bool): True para elegir todos los archivos aunque no tengan cambios.
+            copiar (bool): False para escribir después directamente desde los objetos, sin
+                copia; solo sirve si nada cambia hasta terminar de escribir.
+
+        Returns:
+            dict: "formato", "inicio" (instante de la copia), "modificados" (marcas que se
+            devuelven a `modificados` si la escritura falla), "archivos" (archivo ->
+            (elementos, función que los serializa o None)) y "particiones" (colección -> mes ->
+            elementos, para actualizar los manifiestos).
+        """
+        inicio = time.perf_counter()
+        # Los cambios que lleguen después quedan marcados para el siguiente guardado
+        with self.candado_modificados:
+            modificados, self.modificados = self.modificados, set()
+
+        def pendiente(nombre):
+            return todo or nombre in modificados or not os.path.exists(self.ruta_datos(nombre + ".json"))
+
+        archivos = {}
+        if pendiente("clientes"):
+            if copiar:
+                archivos["clientes.json"] = ([self.serializar_cliente(cliente) for cliente in list(self.clientes)], None)
+            else:
+                archivos["clientes.json"] = (self.clientes, self.serializar_cliente)
+        if pendiente("productos"):
+            if copiar:
+                archivos["productos.json"] = (self.productos.copiar_columnas().filas(), self.serializar_fila_producto)
+            else:
+                archivos["productos.json"] = (self.productos, self.serializar_producto)
+
+        # Colección -> mes -> elementos de cada partición que se reescribe
+        particiones = {}
+        for coleccion, serializar in (("ventas", self.serializar_venta), ("envios", self.serializar_envio),
+                                      ("pagos", self.serializar_pago)):
+            if todo or not self.particiones[coleccion].existe():
+                # Se reescriben todos los meses, así que antes se cargan los que falten
+                self.cargar_particiones(coleccion)
+                meses = set(self.por_mes[coleccion]) | set(self.particiones[coleccion].particiones)
+            else:
+                meses = {nombre.split("/", 1)[1] for nombre in modificados if nombre.startswith(coleccion + "/")}
+            particiones[coleccion] = {mes: list(self.por_mes[coleccion].get(mes, ())) for mes in meses}
+            for mes, elementos in particiones[coleccion].items():
+                if elementos and copiar:
+                    archivos[f"{coleccion}/{mes}.json"] = ([serializar(elemento) for elemento in elementos], None)
+                elif elementos:
+                    archivos[f"{coleccion}/{mes}.json"] = (elementos, serializar)
+
+        return {"formato": "json", "inicio": inicio, "modificados": modificados,
+                "archivos": archivos, "particiones": particiones}
+
+    def escribir_captura(self, captura):
+        """
+        Escribe una copia tomada con `capturar_JSON` o `capturar_binario`. Si falla, las
+        colecciones y meses de la copia vuelven a quedar en `modificados`.
+
+        Returns:
+            dict: Nombre del archivo -> (bytes escritos, segundos), y "total" -> (bytes, segundos
+            desde que se tomó la copia).
+        """
+        reporte = {}
+        try:
+            if captura["formato"] == "binario":
+                if captura["colecciones"] is not None:
+                    colecciones = dict(captura["colecciones"])
+                    productos, serializar = colecciones["productos"]
+                    colecciones["productos"] = [serializar(fila) for fila in productos]
+                    escritos = escribir_instantanea(self.ruta_datos(ARCHIVO_INSTANTANEA),
+                                                    {nombre: (ESQUEMA_INSTANTANEA[nombre], registros)
+                                                     for nombre, registros in colecciones.items()})
+                    reporte[ARCHIVO_INSTANTANEA] = (escritos, time.perf_counter() - captura["inicio"])
+            else:
+                for coleccion in captura["particiones"]:
+                    os.makedirs(self.particiones[coleccion].directorio, exist_ok=True)
+                archivos = captura["archivos"]
+                with ThreadPoolExecutor(max_workers=max(1, len(archivos))) as ejecutor:
+                    tareas = {archivo: ejecutor.submit(self.escribir_JSON, archivo, elementos, serializar)
+                              for archivo, (elementos, serializar) in archivos.items()}
+                    for archivo, tarea in tareas.items():
+                        reporte[archivo] = tarea.result()
+                for coleccion, meses in captura["particiones"].items():
+                    if meses or not self.particiones[coleccion].existe():
+                        for mes, elementos in meses.items():
+                            self.particiones[coleccion].actualizar(mes, elementos)
+                        self.particiones[coleccion].guardar_manifiesto()
+        except BaseException:
+            with self.candado_modificados:
+                self.modificados |= captura["modificados"]
+            raise
+        reporte["total"] = (sum(escritos for escritos, _ in reporte.values()), time.perf_counter() - captura["inicio"])
+        return reporte
+
+    def escribir_JSON(self, nombre, elementos, serializar=None):
+        """
+        Serializa una colección en un archivo temporal y lo reemplaza de una sola vez, para
+        que una interrupción nunca deje el archivo a medio escribir. Cada elemento se
+        serializa y se codifica con `codec_json` recién cuando se escribe.
+
+        Args:
+            nombre (str): Nombre del archivo (por ejemplo "ventas.json").
+            elementos (iterable): Elementos de la colección.
+            serializar (callable | None): Convierte un elemento en su diccionario; None si los
+                elementos ya son diccionarios.
+
+        Returns:
+            tuple: (bytes escritos, segundos).
+        """
+        inicio = time.perf_counter()
+        ruta = self.ruta_datos(nombre)
+        if serializar is not None:
+            elementos = map(serializar, elementos)
+        with open(ruta + ".tmp", "wb") as file:
+            escritos = self.codec_json.escribir_arreglo(file, elementos)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(ruta + ".tmp", ruta)
+        return escritos, time.perf_counter() - inicio
+
+    def guardar_binario(self, todo=False):
+        """
+        Guarda clientes, productos, ventas, envíos y pagos en una instantánea binaria
+        (`ARCHIVO_INSTANTANEA`). Es la alternativa compacta a `guardar_JSON`: un solo archivo
+        con los campos de cada colección en columnas y los textos repetidos en tablas.
+
+        Como todas las colecciones van en el mismo archivo, se reescribe completo si hay
+        alguna colección en `modificados` o si aún no existe.
+
+        Args:
+            todo (bool): True para reescribir la instantánea aunque no haya cambios.
+
+        Returns:
+            dict: El mismo reporte que `guardar_JSON`.
+        """
+        # La instantánea tiene todos los datos: se cargan los meses que falten
+        self.cargar_historial()
+        return self.escribir_captura(self.capturar_binario(todo))
+
+    def capturar_binario(self, todo=False):
+        """
+        Toma la copia de los datos que escribe `guardar_binario`, como `capturar_JSON`.
+        Como la instantánea se reescribe completa, se copian todas las colecciones.
+
+        Returns:
+            dict: "formato", "inicio", "modificados" y "colecciones" (nombre -> registros, y
+            para "productos" las columnas copiadas y la función que serializa cada fila), o
+            None en "colecciones" si no hay nada que escribir.
+        """
+        inicio = time.perf_counter()
+        with self.candado_modificados:
+            modificados, self.modificados = self.modificados, set()
+        colecciones = None
+        if todo or modificados or not os.path.exists(self.ruta_datos(ARCHIVO_INSTANTANEA)):
+            colecciones = {
+                "clientes": [self.serializar_cliente(cliente) for cliente in list(self.clientes)],
+                "productos": (self.productos.copiar_columnas().filas(), self.serializar_fila_producto),
+                "ventas": [self.serializar_venta(venta) for venta in list(self.ventas)],
+                "envios": [self.serializar_envio(envio) for envio in list(self.envios)],
+                "pagos": [self.serializar_pago(pago) for pago in list(self.pagos)],
+            }
+        return {"formato": "binario", "inicio": inicio, "modificados": modificados, "colecciones": colecciones}
+
+    def capturar_datos(self):
+        """
+        Toma la copia de los datos de `guardar_datos` en el formato de la aplicación, sin
+        escribirla.
+        """
+        if self.formato == "binario":
+            return self.capturar_binario()
+        return self.capturar_JSON()
+
+    def guardar_datos(self, todo=False):
+        """
+        Guarda la copia completa de los datos en el formato de la aplicación (`formato`).
+        """
+        if self.formato == "binario":
+            return self.guardar_binario(todo)
+        return self.guardar_JSON(todo)
+
+    @staticmethod
+    def resumen_guardado(reporte):
+        """
+        Devuelve una línea con los bytes escritos y el tiempo de cada archivo de un guardado.
+        """
+        def tamano(escritos):
+            return f"{escritos / 1e6:.1f} MB" if escritos >= 1e6 else f"{escritos / 1e3:.1f} KB"
+
+        escritos, segundos = reporte["total"]
+        archivos = [f"{archivo} {tamano(bytes_archivo)} en {segundos_archivo * 1000:.0f} ms"
+                    for archivo, (bytes_archivo, segundos_archivo) in reporte.items() if archivo != "total"]
+        if not archivos:
+            return "Guardado: sin cambios que escribir."
+        return f"Guardado: {tamano(escritos)} en {segundos * 1000:.0f} ms (" + ", ".join(archivos) + ")"
+
+    def ruta_datos(self, nombre):
+        """
+        Devuelve la ruta de un archivo de datos dentro de `directorio_datos`.
+        """
+        return os.path.join(self.directorio_datos, nombre)
+
+    def leer_guardados(self, nombre):
+        """
+        Genera los registros de un archivo JSON guardado por `guardar_JSON`, leyéndolo con
+        `codec_json`. Si el archivo no existe no genera nada.
+
+        Args:
+            nombre (str): Nombre del archivo (por ejemplo "ventas.json").
+        """
+        ruta = self.ruta_datos(nombre)
+        if os.path.exists(ruta):
+            yield from self.codec_json.leer_arreglo(ruta)
+
+    def buscar_cliente_guardado(self, registro):
+        """
+        Resuelve la referencia a un cliente de un registro guardado por su cédula o RIF.
+
+        Si el cliente fue eliminado, se reconstruye fuera de la lista de clientes con solo su
+        cédula o RIF, para no perder sus ventas, pagos y envíos. Esos clientes se comparten
+        entre registros mediante `clientes_retirados`.
+
+        Returns:
+            ClienteNatural | ClienteJuridico: Cliente referenciado.
+        """
+        cedula = registro.get("cliente_cedula")
+        if cedula is not None:
+            cliente = self.clientes_por_cedula.get(cedula)
+            clave = ("cedula", cedula)
+        else:
+            cliente = self.clientes_por_rif.get(registro.get("cliente_rif"))
+            clave = ("rif", registro.get("cliente_rif"))
+        if cliente is None:
+            cliente = self.clientes_retirados.get(clave)
+        if cliente is None:
+            if cedula is not None:
+                cliente = ClienteNatural("", "", "", "Cliente eliminado", cedula)
+            else:
+                cliente = ClienteJuridico("", "", "", "Cliente eliminado", clave[1], "", "", "")
+            self.clientes_retirados[clave] = cliente
+        return cliente
+
+    def crear_cliente(self, registro):
+        """
+        Construye un cliente a partir de su registro guardado.
+        """
+        if registro["tipo"] == "Natural":
+            return ClienteNatural(registro["correo"], registro["direccion"], registro["telefono"],
+                                  registro["nombre"], registro["cedula"])
+        return ClienteJuridico(registro["correo"], registro["direccion"], registro["telefono"],
+                               registro["razon_social"], registro["rif"], registro["nombre_contacto"],
+                               registro["telf_contacto"], registro["correo_contacto"])
+
+    def crear_venta(self, registro):
+        """
+        Construye una venta a partir de su registro guardado, resolviendo sus productos por ID.
+        Los productos que ya no están en el catálogo se reconstruyen fuera de él con el nombre
+        y el precio guardados en la venta, y se comparten entre ventas mediante `productos_retirados`.
+        Los montos se convierten a `Dinero`.
+        """
+        productos = {}
+        for linea in registro["productos"]:
+            producto = self.productos_por_id.get(linea["id"]) or self.productos_retirados.get(linea["id"])
+            if producto is None:
+                producto = Producto(linea["id"], linea.get("nombre", f"Producto {linea['id']}"), "",
+                                    linea.get("precio", 0), "", 0, [])
+                self.productos_retirados[linea["id"]] = producto
+            productos[producto] = linea["cantidad"]
+        return Venta(registro["id"], registro["fecha"], self.buscar_cliente_guardado(registro), productos, registro["metodo_pago"],
+                     registro["metodo_envio"], Dinero.de(registro["subtotal"]), Dinero.de(registro["descuento"]),
+                     Dinero.de(registro["iva"]), Dinero.de(registro["igtf"]), Dinero.de(registro["total"]))
+
+    def crear_pago(self, registro, venta):
+        """
+        Construye un pago a partir de su registro guardado. Los archivos anteriores a los IDs
+        de pago usan la posición en la lista.
+        """
+        return Pago(self.buscar_cliente_guardado(registro), venta, Dinero.de(registro["monto_pago"]),
+                    registro["metodo_pago"], registro["moneda_pago"], registro["fecha"], registro["estado"],
+                    registro.get("id", len(self.pagos)))
+
+    def crear_envio(self, registro, venta):
+        """
+        Construye un envío a partir de su registro guardado. Los archivos anteriores a los IDs
+        de envío usan la posición en la lista.
+        """
+        return Envio(self.buscar_cliente_guardado(registro), venta, registro["servicio_envio"],
+                     registro["costo_servicio"], registro["nombre_motorizado"],
+                     registro["telefono_motorizado"], registro["placa_motorizado"],
+                     registro["fecha"], registro.get("estado", False), registro.get("id", len(self.envios)))
+
+    def cargar_JSON(self):
+        """
+        Reconstruye clientes, productos, ventas, envíos y pagos a partir de los archivos JSON
+        guardados por `guardar_JSON` en la sesión anterior. Los archivos se leen de forma
+        incremental.
+
+        De las ventas, pagos y envíos guardados por mes se cargan los últimos `meses_recientes`
+        meses y los meses con pagos o envíos pendientes; los demás se cargan cuando se
+        necesitan (`cargar_particiones`). Las colecciones guardadas en un solo archivo, como
+        en las versiones anteriores, se cargan completas y el siguiente guardado las divide
+        por mes.
+
+        Returns:
+            dict: Cantidad de registros cargados por colección y "omitidos".
+        """
+        desde = None
+        if self.meses_recientes is not None:
+            desde = ParticionesMensuales.mes_anterior(self.meses_recientes - 1)
+
+        def leer(coleccion):
+            particiones = self.particiones.get(coleccion)
+            if particiones is None or not particiones.abrir():
+                return self.leer_guardados(coleccion + ".json")
+            self.proximo_id[coleccion] = max(self.proximo_id[coleccion], particiones.id_maximo() + 1)
+            meses = particiones.sin_cargar(None if desde is None else particiones.meses_iniciales(desde))
+            return (registro for mes in meses for registro in particiones.leer(mes))
+
+        return self.cargar_registros(leer)
+
+    def cargar_binario(self):
+        """
+        Reconstruye clientes, productos, ventas, envíos y pagos a partir de la instantánea
+        binaria guardada por `guardar_binario`. Si no existe no carga nada.
+
+        Returns:
+            dict: Cantidad de registros cargados por colección y "omitidos".
+        """
+        ruta = self.ruta_datos(ARCHIVO_INSTANTANEA)
+        colecciones = leer_instantanea(ruta) if os.path.exists(ruta) else {}
+        return self.cargar_registros(lambda coleccion: colecciones.get(coleccion, ()))
+
+    def cargar_datos(self):
+        """
+        Carga la copia completa de los datos en el formato de la aplicación (`formato`).
+        Con el formato binario, si todavía no hay instantánea pero sí archivos JSON de una
+        sesión anterior, se cargan los JSON con todos sus meses; el siguiente guardado crea
+        la instantánea.
+
+        Returns:
+            dict: Cantidad de registros cargados por colección y "omitidos".
+        """
+        if self.formato == "binario":
+            if os.path.exists(self.ruta_datos(ARCHIVO_INSTANTANEA)) or not os.path.exists(self.ruta_datos("clientes.json")):
+                return self.cargar_binario()
+            self.meses_recientes = None
+        return self.cargar_JSON()
+
+    def cargar_registros(self, leer):
+        """
+        Reconstruye clientes, productos, ventas, envíos y pagos a partir de sus registros
+        guardados, con el formato de los archivos JSON.
+
+        Las referencias entre registros (cliente_cedula/cliente_rif, venta_id e ID de
+        producto) se resuelven con los diccionarios de la aplicación, a medida que cada
+        colección queda cargada. Por eso el orden de carga es clientes, productos, ventas y
+        luego pagos y envíos. Las ventas de meses que no se cargaron se buscan con
+        `buscar_elemento`. Solo se omiten los pagos y envíos cuya venta no existe.
+
+        Args:
+            leer (callable): Recibe el nombre de una colección ("clientes", "productos",
+                "ventas", "pagos" o "envios") y devuelve un iterable con sus registros.
+
+        Returns:
+            dict: Cantidad de registros cargados por colección y "omitidos".
+        """
+        conteo = {"clientes": 0, "productos": 0, "ventas": 0, "pagos": 0, "envios": 0, "omitidos": 0}
+
+        # Cargar clientes
+        for registro in leer("clientes"):
+            cliente = self.crear_cliente(registro)
+            self.clientes.append(cliente)
+            self.indexar_cliente(cliente)
+            conteo["clientes"] += 1
+
+        # Cargar productos (los índices se construyen una sola vez al final)
+        for registro in leer("productos"):
+            producto = Producto(*self.valores_registro(registro), store=self.productos)
+            self.productos_por_id[producto.id] = producto
+            self.ultimo_id_producto = max(self.ultimo_id_producto, producto.id)
+            conteo["productos"] += 1
+        self.indice_nombres.construir(self.productos)
+        self.indice_precios.construir(self.productos)
+        self.indice_vehiculos.construir(self.productos)
+
+        # Cargar ventas, pagos y envíos
+        for coleccion in ("ventas", "pagos", "envios"):
+            conteo["omitidos"] += self.agregar_registros(coleccion, leer(coleccion))
+        for coleccion in ("ventas", "pagos", "envios"):
+            conteo[coleccion] = len(getattr(self, coleccion))
+
+        return conteo
+
+    def agregar_registros(self, coleccion, registros):
+        """
+        Construye y agrega las ventas, pagos o envíos de sus registros guardados, salvo los
+        que ya están cargados, y deja la lista de la colección ordenada por ID.
+
+        Args:
+            coleccion (str): "ventas", "pagos" o "envios".
+            registros (iterable): Registros guardados de la colección.
+
+        Returns:
+            int: Cantidad de pagos o envíos omitidos porque su venta no existe.
+        """
+        por_id = getattr(self, coleccion + "_por_id")
+        omitidos = 0
+        agregados = 0
+        ventas = []
+        for registro in registros:
+            if registro.get("id") in por_id:
+                continue
+            if coleccion == "ventas":
+                elemento = self.crear_venta(registro)
+                ventas.append(elemento)
+            else:
+                venta = self.buscar_elemento("ventas", registro["venta_id"])
+                if venta is None:
+                    omitidos += 1
+                    continue
+                crear = self.crear_pago if coleccion == "pagos" else self.crear_envio
+                elemento = crear(registro, venta)
+            self.agregar_elemento(coleccion, elemento, indexar=False)
+            agregados += 1
+        self.indice_ventas.agregar_lote(ventas)
+        if agregados:
+            # Los meses cargados más tarde pueden tener IDs menores que los ya cargados
+            getattr(self, coleccion).sort(key=lambda elemento: elemento.id)
+        return omitidos
+
+    def agregar_elemento(self, coleccion, elemento, indexar=True):
+        """
+        Agrega una venta, pago o envío a su lista, a su diccionario por ID y a la partición
+        del mes de su fecha. Las ventas, además, a los índices por cliente y por fecha.
+
+        Args:
+            coleccion (str): "ventas", "pagos" o "envios".
+            elemento (Venta | Pago | Envio): Elemento a agregar.
+            indexar (bool): False si quien llama indexa las ventas en lote
+                (`IndiceVentas.agregar_lote`).
+        """
+        getattr(self, coleccion).append(elemento)
+        getattr(self, coleccion + "_por_id")[elemento.id] = elemento
+        if coleccion == "ventas" and indexar:
+            self.indice_ventas.agregar(elemento)
+        with self.candado_ids:
+            self.proximo_id[coleccion] = max(self.proximo_id[coleccion], elemento.id + 1)
+        self.ubicar(coleccion, elemento)
+
+    def nuevo_id(self, coleccion):
+        """
+        Devuelve el ID de una venta, pago o envío nuevo. No depende de cuántos elementos
+        están cargados, porque los meses anteriores pueden no estarlo, y dos hilos nunca
+        reciben el mismo ID.
+        """
+        with self.candado_ids:
+            id = self.proximo_id[coleccion]
+            self.proximo_id[coleccion] += 1
+        return id
+
+    def ubicar(self, coleccion, elemento):
+        """
+        Ubica un elemento en la partición del mes de su fecha y lo saca de la anterior si
+        su fecha cambió de mes (por ejemplo, un pago pendiente que se paga otro mes). Los
+        pagos, además, entran o salen de `pagos_pendientes` y `pendientes_por_cliente` según
+        su estado.
+
+        Returns:
+            set: Meses de las particiones que cambiaron.
+        """
+        if coleccion == "pagos":
+            clave = self.clave_cliente(elemento.cliente)
+            with self.candado_pendientes:
+                if elemento.estado:
+                    if self.pagos_pendientes.pop(elemento.id, None) is not None:
+                        del self.pendientes_por_cliente[clave][elemento.id]
+                        if not self.pendientes_por_cliente[clave]:
+                            del self.pendientes_por_cliente[clave]
+                else:
+                    self.pagos_pendientes[elemento.id] = elemento
+                    self.pendientes_por_cliente.setdefault(clave, {})[elemento.id] = elemento
+        mes = ParticionesMensuales.mes_de(getattr(elemento, FECHA_PARTICION[coleccion]))
+        anterior = self.ubicacion[coleccion].get(elemento.id)
+        if anterior == mes:
+            return {mes}
+        if anterior is not None:
+            self.por_mes[coleccion][anterior].remove(elemento)
+        self.por_mes[coleccion].setdefault(mes, []).append(elemento)
+        self.ubicacion[coleccion][elemento.id] = mes
+        return {mes} if anterior is None else {anterior, mes}
+
+    def buscar_elemento(self, coleccion, id):
+        """
+        Busca una venta, pago o envío por ID. Si no está cargado, carga las particiones
+        cuyo rango de IDs lo incluye.
+
+        Returns:
+            Venta | Pago | Envio | None: Elemento con ese ID, o None si no existe.
+        """
+        por_id = getattr(self, coleccion + "_por_id")
+        if id not in por_id:
+            self.cargar_particiones(coleccion, self.particiones[coleccion].meses_de_id(id))
+        return por_id.get(id)
+
+    def cargar_particiones(self, coleccion, meses=None):
+        """
+        Carga las particiones guardadas de una colección que todavía no se leyeron.
+
+        Args:
+            coleccion (str): "ventas", "pagos" o "envios".
+            meses (iterable | None): Meses a cargar; None para todos.
+
+        Returns:
+            int: Cantidad de pagos o envíos omitidos porque su venta no existe.
+        """
+        particiones = self.particiones[coleccion]
+        meses = particiones.sin_cargar(meses)
+        if not meses:
+            return 0
+        return self.agregar_registros(coleccion, (registro for mes in meses for registro in particiones.leer(mes)))
+
+    def cargar_historial(self):
+        """
+        Carga todos los meses de ventas, pagos y envíos que todavía no se leyeron, para las
+        búsquedas e informes sobre todo el historial.
+        """
+        for coleccion in ("ventas", "pagos", "envios"):
+            self.cargar_particiones(coleccion)
+
+    def elementos_periodo(self, coleccion, desde, hasta):
+        """
+        Devuelve las ventas, pagos o envíos de los meses entre dos fechas, cargando solo las
+        particiones de esos meses.
+
+        Args:
+            coleccion (str): "ventas", "pagos" o "envios".
+            desde (str): Fecha inicial ("AAAA-MM-DD").
+            hasta (str): Fecha final ("AAAA-MM-DD").
+
+        Returns:
+            list: Elementos de esos meses, ordenados por ID. Hay que filtrar los días.
+        """
+        self.cargar_particiones(coleccion, self.particiones[coleccion].meses_en_rango(desde, hasta))
+        desde, hasta = ParticionesMensuales.mes_de(desde), ParticionesMensuales.mes_de(hasta)
+        elementos = [elemento for mes, delmes in self.por_mes[coleccion].items() if desde <= mes <= hasta
+                     for elemento in delmes]
+        return sorted(elementos, key=lambda elemento: elemento.id)
+
+    def hay_registros(self, coleccion):
+        """
+        Indica si hay ventas, pagos o envíos, cargados o guardados en meses aún sin cargar.
+        """
+        return bool(getattr(self, coleccion)) or bool(self.particiones[coleccion].sin_cargar())
+
+    def registros_historial(self, coleccion):
+        """
+        Genera, mes por mes, los registros de todas las ventas, pagos o envíos sin cargar los
+        meses que faltan: los elementos cargados se serializan desde sus objetos y los demás
+        se leen de las particiones guardadas.
+
+        Args:
+            coleccion (str): "ventas", "pagos" o "envios".
+        """
+        serializar = {"ventas": self.serializar_venta, "pagos": self.serializar_pago,
+                      "envios": self.serializar_envio}[coleccion]
+        particiones = self.particiones[coleccion]
+        ubicacion = self.ubicacion[coleccion]
+        for mes in sorted(set(self.por_mes[coleccion]) | set(particiones.particiones)):
+            if mes in particiones.particiones and mes not in particiones.cargadas:
+                for registro in particiones.registros(mes):
+                    # Los que ya están cargados (por ejemplo, agregados en esta sesión) salen de sus objetos
+                    if registro["id"] not in ubicacion:
+                        yield registro
+            for elemento in self.por_mes[coleccion].get(mes, ()):
+                yield serializar(elemento)
+
+    def exportar_JSONL(self, directorio, colecciones=("ventas", "pagos", "envios")):
+        """
+        Exporta el historial de ventas, pagos y envíos a archivos JSON Lines
+        (`<colección>.jsonl`, un registro por línea) en `directorio`. Los registros se
+        escriben a medida que se generan (`registros_historial`), así que la memoria usada
+        no depende del tamaño del historial, y otro proceso puede leer cada archivo mientras
+        se escribe.
+
+        Args:
+            directorio (str): Carpeta de destino; se crea si no existe.
+            colecciones (iterable): Colecciones a exportar.
+
+        Returns:
+            dict: Nombre del archivo -> (bytes escritos, segundos), y "total".
+        """
+        os.makedirs(directorio, exist_ok=True)
+        reporte = {}
+        inicio_total = time.perf_counter()
+        for coleccion in colecciones:
+            inicio = time.perf_counter()
+            with open(os.path.join(directorio, coleccion + ".jsonl"), "wb") as file:
+                escritos = self.codec_json.escribir_lineas(file, self.registros_historial(coleccion))
+            reporte[coleccion + ".jsonl"] = (escritos, time.perf_counter() - inicio)
+        reporte["total"] = (sum(escritos for escritos, _ in reporte.values()), time.perf_counter() - inicio_total)
+        return reporte
+
+    def importar_JSONL(self, directorio):
+        """
+        Importa las ventas, pagos y envíos de los archivos JSON Lines de `directorio`
+        (exportados por `exportar_JSONL`), leyéndolos línea por línea. Cada registro nuevo
+        se aplica y se registra como un cambio, igual que una venta, pago o envío hecho desde
+        el menú; los que ya existen se ignoran.
+
+        Args:
+            directorio (str): Carpeta con ventas.jsonl, pagos.jsonl y envios.jsonl. Los
+                archivos que falten se saltan.
+
+        Returns:
+            dict: Cantidad de registros importados por colección, "repetidos" (ya existían)
+            y "omitidos" (pagos o envíos de ventas inexistentes).
+        """
+        conteo = {"ventas": 0, "pagos": 0, "envios": 0, "repetidos": 0, "omitidos": 0}
+        for coleccion, operacion in (("ventas", "venta"), ("pagos", "pago"), ("envios", "envio")):
+            ruta = os.path.join(directorio, coleccion + ".jsonl")
+            if not os.path.exists(ruta):
+                continue
+            for registro in self.codec_json.leer_lineas(ruta):
+                if self.buscar_elemento(coleccion, registro["id"]) is not None:
+                    conteo["repetidos"] += 1
+                    continue
+                if coleccion != "ventas" and self.buscar_elemento("ventas", registro["venta_id"]) is None:
+                    conteo["omitidos"] += 1
+                    continue
+                # El mes del registro se reescribe en el próximo guardado: antes se carga completo
+                self.cargar_particiones(coleccion, [ParticionesMensuales.mes_de(registro["fecha"])])
+                datos = {**registro, "inventarios": []} if coleccion == "ventas" else registro
+                self.aplicar_cambio({"op": operacion, **datos})
+                self.registrar_cambio(operacion, datos, sincronizar=False)
+                conteo[coleccion] += 1
+            if conteo[coleccion]:
+                getattr(self, coleccion).sort(key=lambda elemento: elemento.id)
+        self.repositorio.sincronizar()
+        return conteo
+
+    def registrar_cambio(self, operacion, datos, sincronizar=True):
+        """
+        Guarda un cambio en el repositorio y marca las colecciones y meses afectados para el
+        próximo guardado de los archivos JSON.
+
+        Args:
+            operacion (str): Tipo de cambio ("cliente", "cliente_eliminado", "producto",
+                "producto_eliminado", "venta", "pago" o "envio").
+            datos (dict): Datos del cambio, con el mismo formato de los archivos JSON.
+            sincronizar (bool): False para agrupar varios cambios y sincronizarlos juntos
+                con `repositorio.sincronizar()`.
+        """
+        self.marcar_modificado(operacion, datos)
+        self.repositorio.registrar_cambio(operacion, datos, sincronizar)
+        if self.guardado_automatico is not None:
+            self.guardado_automatico.notificar()
+
+    def marcar_modificado(self, operacion, datos):
+        """
+        Marca en `modificados` las colecciones que cambian con un cambio y, para ventas,
+        pagos y envíos, la partición del mes del elemento (y la de su mes anterior, si su
+        fecha cambió de mes).
+        """
+        with self.candado_modificados:
+            self.modificados.update(COLECCIONES_CAMBIO[operacion])
+            coleccion = PARTICION_CAMBIO.get(operacion)
+            if coleccion is not None:
+                elemento = getattr(self, coleccion + "_por_id").get(datos["id"])
+                if elemento is not None:
+                    self.modificados.update(f"{coleccion}/{mes}" for mes in self.ubicar(coleccion, elemento))
+
+    def abrir_registro(self):
+        """
+        Reproduce sobre los datos cargados los cambios del registro de la sesión anterior y
+        lo deja abierto para los cambios de esta sesión. Si el registro acumula
+        `limite_registro` cambios o más, se compacta. Luego inicia el guardado automático,
+        salvo que `guardado_cada` sea None.
+
+        Returns:
+            int: Cantidad de cambios reproducidos.
+        """
+        registro = RegistroCambios(self.ruta_datos("cambios.jsonl"))
+        aplicados = 0
+        for cambio in registro.leer():
+            self.aplicar_cambio(cambio)
+            self.marcar_modificado(cambio["op"], cambio)
+            aplicados += 1
+        self.registro = registro
+        if registro.cantidad >= self.limite_registro:
+            self.compactar_registro()
+        registro.abrir()
+        if self.guardado_cada is not None:
+            self.guardado_automatico = GuardadoAutomatico(self, self.guardado_cada, self.guardado_cambios)
+            self.guardado_automatico.iniciar()
+        return aplicados
+
+    def compactar_registro(self):
+        """
+        Guarda la copia completa de los datos y vacía el registro de cambios, mostrando
+        el tiempo y los bytes escritos.
+        """
+        reporte = self.registro.compactar(self.guardar_datos)
+        print(self.resumen_guardado(reporte))
+
+    def cerrar_registro(self):
+        """
+        Cierra el registro de cambios al salir, compactándolo si superó `limite_registro`.
+        Espera a que termine la carga del catálogo, que también registra cambios, y detiene
+        el guardado automático mostrando sus métricas.
+        """
+        if self.registro is None:
+            return
+        self.catalogo_listo.wait()
+        if self.guardado_automatico is not None:
+            self.guardado_automatico.detener()
+            if self.guardado_automatico.metricas["puntos_control"]:
+                print(self.guardado_automatico.resumen())
+        if self.registro.cantidad >= self.limite_registro:
+            self.compactar_registro()
+        self.registro.cerrar()
+
+    def aplicar_cambio(self, cambio):
+        """
+        Aplica un cambio del registro sobre los datos cargados.
+
+        Aplicar dos veces el mismo cambio no tiene efecto adicional: los clientes y productos
+        se reemplazan por su cédula/RIF o ID, las ventas ya cargadas se ignoran y los pagos y
+        envíos se reemplazan por su ID. Así el registro puede reproducirse sobre una copia
+        completa que ya incluya parte de sus cambios.
+
+        Args:
+            cambio (dict): Cambio leído del registro.
+        """
+        operacion = cambio["op"]
+
+        if operacion == "cliente":
+            if cambio["tipo"] == "Natural":
+                cliente = self.clientes_por_cedula.get(cambio["cedula"])
+            else:
+                cliente = self.clientes_por_rif.get(cambio["rif"])
+            if cliente is None:
+                cliente = self.crear_cliente(cambio)
+                self.clientes.append(cliente)
+                self.indexar_cliente(cliente)
+                return
+            for campo, valor in cambio.items():
+                if campo == "correo":
+                    if valor != cliente.correo:
+                        self.cambiar_correo_cliente(cliente, valor)
+                elif campo not in ("op", "tipo", "cedula", "rif"):
+                    setattr(cliente, campo, valor)
+
+        elif operacion == "cliente_eliminado":
+            if "cedula" in cambio:
+                cliente = self.clientes_por_cedula.get(cambio["cedula"])
+            else:
+                cliente = self.clientes_por_rif.get(cambio["rif"])
+            if cliente is not None:
+                self.clientes.remove(cliente)
+                self.desindexar_cliente(cliente)
+
+        elif operacion == "producto":
+            id, nombre, descripcion, precio, categoria, inventario, compatible = self.valores_registro(cambio)
+            producto = self.productos_por_id.get(id)
+            if producto is None:
+                producto = Producto(id, nombre, descripcion, precio, categoria, inventario, compatible, store=self.productos)
+            else:
+                self.desindexar_producto(producto)
+                producto.nombre = nombre
+                producto.descripcion = descripcion
+                producto.precio = precio
+                producto.categoria = categoria
+                with self.motor_ventas.candado_producto(producto):
+                    producto.inventario = inventario
+                producto.compatible = compatible
+            self.indexar_producto(producto)
+
+        elif operacion == "producto_eliminado":
+            producto = self.productos_por_id.get(cambio["id"])
+            if producto is not None:
+                self.productos.remove(producto)
+                self.desindexar_producto(producto)
+
+        elif operacion == "venta":
+            if self.buscar_elemento("ventas", cambio["id"]) is None:
+                self.agregar_elemento("ventas", self.crear_venta(cambio))
+            # Inventario de los productos después de la venta
+            for id, inventario in cambio["inventarios"]:
+                producto = self.productos_por_id.get(id)
+                if producto is not None:
+                    with self.motor_ventas.candado_producto(producto):
+                        producto.inventario = inventario
+
+        elif operacion == "pago":
+            pago = self.buscar_elemento("pagos", cambio["id"])
+            if pago is not None:
+                pago.fecha = cambio["fecha"]
+                pago.monto_pago = Dinero.de(cambio["monto_pago"])
+                pago.metodo_pago = cambio["metodo_pago"]
+                pago.moneda_pago = cambio["moneda_pago"]
+                pago.estado = cambio["estado"]
+            elif self.buscar_elemento("ventas", cambio["venta_id"]) is not None:
+                self.agregar_elemento("pagos", self.crear_pago(cambio, self.ventas_por_id[cambio["venta_id"]]))
+
+        elif operacion == "envio":
+            envio = self.buscar_elemento("envios", cambio["id"])
+            if envio is not None:
+                envio.fecha_envio = cambio["fecha"]
+                envio.servicio_envio = cambio["servicio_envio"]
+                envio.costo_servicio = cambio["costo_servicio"]
+                envio.nombre_motorizado = cambio["nombre_motorizado"]
+                envio.telefono_motorizado = cambio["telefono_motorizado"]
+                envio.placa_motorizado = cambio["placa_motorizado"]
+                envio.estado = cambio["estado"]
+            elif self.buscar_elemento("ventas", cambio["venta_id"]) is not None:
+                self.agregar_elemento("envios", self.crear_envio(cambio, self.ventas_por_id[cambio["venta_id"]]))
+
+    def cargar_base_catalogo(self):
+        """
+        Toma como versión base de la API (`catalogo_base`) la copia del catálogo en caché,
+        que es la última versión aplicada en una sesión anterior. Así, al sincronizar un
+        catálogo restaurado desde productos.json solo se aplican los cambios publicados
+        desde entonces.
+        """
+        if self.leer_cache_catalogo() is None:
+            return
+        catalogo = self.abrir_catalogo_compartido()
+        try:
+            registros = catalogo.registros() if catalogo is not None else iterar_arreglo(trozos_archivo(self.ruta_cache))
+            for registro in registros:
+                id, nombre, descripcion, precio, categoria, inventario, compatible = self.valores_registro(registro)
+                self.catalogo_base[id] = (nombre, descripcion, precio, categoria, inventario, tuple(compatible))
+        except (OSError, ValueError, KeyError):
+            self.catalogo_base = {}
 
 
 
@@ -168,12 +1628,22 @@ class App:
         Returns:
             bool: True si existe un pago pendiente, False en caso contrario.
         """
-        for pago in self.pagos:
-            if pago.cliente == cliente and not pago.estado:  # Verifica si el pago pertenece al cliente y está pendiente
-                print(f"\nPAGO PENDIENTE ENCONTRADO: {pago.show_attr()}")
-                return True
+        pago = self.pago_pendiente(cliente)
+        if pago is not None:
+            print(f"\nPAGO PENDIENTE ENCONTRADO: {pago.show_attr()}")
+            return True
         return False
 
+    def pago_pendiente(self, cliente):
+        """
+        Devuelve el primer pago pendiente de un cliente, o None. Solo revisa los pagos
+        pendientes del cliente (`pendientes_por_cliente`), no todos los pagos, bajo
+        `candado_pendientes` para no recorrerlos mientras otra caja los modifica.
+        """
+        with self.candado_pendientes:
+            pendientes = self.pendientes_por_cliente.get(self.clave_cliente(cliente))
+            return min(pendientes.values(), key=lambda pago: pago.id) if pendientes else None
+
     def existe_cedula(self, cedula):
         """
         Verifica si existe un cliente natural registrado con una cédula específica.
@@ -184,10 +1654,7 @@ class App:
         Returns:
             bool: True si se encuentra un cliente natural con esa cédula, False en caso contrario.
         """
-        for cliente in self.clientes:
-            if isinstance(cliente, ClienteNatural) and cliente.cedula == cedula:  # Verifica si el cliente es natural y coincide la cédula
-                return True
-        return False
+        return cedula in self.clientes_por_cedula
 
     def existe_rif(self, rif):
         """
@@ -199,14 +1666,89 @@ class App:
         Returns:
             bool: True si se encuentra un cliente jurídico con ese RIF, False en caso contrario.
         """
-        for cliente in self.clientes:
-            if isinstance(cliente, ClienteJuridico) and cliente.rif == rif:  # Verifica si el cliente es jurídico y coincide el RIF
-                return True
-        return False
+        return rif in self.clientes_por_rif
+
+    def indexar_producto(self, producto):
+        """
+        Registra un producto nuevo en todos los índices del catálogo.
+
+        Args:
+            producto (Producto): Producto agregado al catálogo.
+        """
+        self.productos_por_id[producto.id] = producto
+        self.ultimo_id_producto = max(self.ultimo_id_producto, producto.id)
+        self.indice_nombres.agregar(producto)
+        self.indice_precios.agregar(producto)
+        self.indice_vehiculos.agregar(producto)
+
+    def desindexar_producto(self, producto):
+        """
+        Quita un producto de todos los índices del catálogo.
+
+        Args:
+            producto (Producto): Producto eliminado del catálogo.
+        """
+        self.productos_por_id.pop(producto.id, None)
+        self.indice_nombres.eliminar(producto)
+        self.indice_precios.eliminar(producto)
+        self.indice_vehiculos.eliminar(producto)
+
+    def indexar_cliente(self, cliente):
+        """
+        Registra un cliente en los índices por cédula/RIF y por correo.
+
+        Args:
+            cliente (ClienteNatural | ClienteJuridico): Cliente registrado.
+        """
+        if isinstance(cliente, ClienteNatural):
+            self.clientes_por_cedula[cliente.cedula] = cliente
+        else:
+            self.clientes_por_rif[cliente.rif] = cliente
+        self.clientes_por_correo.setdefault(cliente.correo, []).append(cliente)
+
+    def desindexar_cliente(self, cliente):
+        """
+        Quita un cliente de los índices por cédula/RIF y por correo.
+
+        Args:
+            cliente (ClienteNatural | ClienteJuridico): Cliente eliminado.
+        """
+        if isinstance(cliente, ClienteNatural):
+            self.clientes_por_cedula.pop(cliente.cedula, None)
+        else:
+            self.clientes_por_rif.pop(cliente.rif, None)
+        self._quitar_correo(cliente)
+
+    def cambiar_correo_cliente(self, cliente, nuevo_correo):
+        """
+        Modifica el correo de un cliente manteniendo actualizado el índice por correo.
+
+        Args:
+            cliente (ClienteNatural | ClienteJuridico): Cliente a modificar.
+            nuevo_correo (str): Correo nuevo.
+        """
+        self._quitar_correo(cliente)
+        cliente.correo = nuevo_correo
+        self.clientes_por_correo.setdefault(nuevo_correo, []).append(cliente)
+
+    def _quitar_correo(self, cliente):
+        """
+        Quita un cliente de la lista de su correo actual en el índice por correo.
+        """
+        clientes = self.clientes_por_correo.get(cliente.correo)
+        if clientes is None:
+            return
+        for i, registrado in enumerate(clientes):
+            if registrado is cliente:
+                del clientes[i]
+                break
+        if not clientes:
+            del self.clientes_por_correo[cliente.correo]
 
 
 
     def gestion_productos(self):
+        self.esperar_catalogo()
         while True:
             print(f'\n GESTIÓN DE PRODUCTOS ')
             opcion = input('''
@@ -214,10 +1756,11 @@ class App:
 2 -. Buscar Productos
 3 -. Modificar Productos
 4 -. Eliminar Productos
-5 -. Salir
+5 -. Sincronizar catálogo con la API
+6 -. Salir
 > Ingrese un número: ''')
-            while (not opcion.isnumeric()) or (not int(opcion) in range(1,    6)):
-                opcion = input("Opción inválida. Ingrese un número entre 1 y 5\n> Ingrese un número: ")
+            while (not opcion.isnumeric()) or (not int(opcion) in range(1,    7)):
+                opcion = input("Opción inválida. Ingrese un número entre 1 y 6\n> Ingrese un número: ")
             
             if opcion == "1":
                 self.agregar_productos()
@@ -227,6 +1770,8 @@ class App:
                 self.modificar_productos()
             elif opcion == "4":
                 self.eliminar_producto()
+            elif opcion == "5":
+                self.actualizar_catalogo()
             else:
                 print("\nSaliendo de 'Gestion de Productos'.")
                 break 
@@ -259,7 +1804,7 @@ class App:
             # Solicita y valida el precio del producto
             while True:
                 try:
-                    precio = float(input("Ingrese el precio del producto: "))
+                    precio = Dinero.de(input("Ingrese el precio del producto: "))
                     break
                 except ValueError:
                     print("Precio inválido. Debe ser un número.")
@@ -303,10 +1848,11 @@ class App:
 
             # Crea un nuevo producto con los datos ingresados y lo agrega al inventario
             producto = Producto(
-                len(self.productos), nombre, descripcion, float(precio),
-                categoria, int(inventario), compatibilidad
+                self.ultimo_id_producto + 1, nombre, descripcion, precio,
+                categoria, int(inventario), compatibilidad, store=self.productos
             )
-            self.productos.append(producto)
+            self.indexar_producto(producto)
+            self.registrar_cambio("producto", self.serializar_producto(producto))
             print("\nProducto Agregado!")
             print(producto.show_attr())
 
@@ -315,7 +1861,8 @@ class App:
     def buscar_productos(self):
         """
         Permite realizar búsquedas de productos según diferentes criterios: categoría, rango de precios, 
-        coincidencia de nombre y disponibilidad en inventario.
+        coincidencia de nombre, disponibilidad en inventario y vehículo compatible. También permite
+        listar el catálogo ordenado por precio.
 
         El usuario selecciona una opción del menú y proporciona los valores necesarios para el criterio
         de búsqueda seleccionado. Los productos encontrados se muestran con su información detallada.
@@ -328,21 +1875,20 @@ class App:
     2 -. Precio
     3 -. Nombre
     4 -. Disponibilidad de Inventario
-    5 -. Salir
+    5 -. Catálogo ordenado por precio
+    6 -. Vehículo compatible
+    7 -. Salir
     > Ingrese un número: ''')
             
             # Validación del input del usuario para asegurar que la opción sea válida
-            while (not opcion.isnumeric()) or (not int(opcion) in range(1, 6)):
-                print("Error. Ingrese un número entre 1 y 5.")
+            while (not opcion.isnumeric()) or (not int(opcion) in range(1, 8)):
+                print("Error. Ingrese un número entre 1 y 7.")
                 opcion = input("\nIngrese el número correspondiente a la acción que desea realizar: ")
             
             # Opción 1: Buscar productos por categoría
             if opcion == "1":
                 categoria_buscar = input("Ingrese la categoría a buscar: ").lower()
-                encontrados = [
-                    producto for producto in self.productos 
-                    if categoria_buscar in producto.categoria.lower()
-                ]
+                encontrados = self.productos.filtrar_categoria(categoria_buscar)
                 
                 if encontrados:
                     print(f"\nDE LA CATEGORÍA '{categoria_buscar.upper()}':")
@@ -356,25 +1902,22 @@ class App:
                 while True:
                     try:
                         # Solicita el rango de precios y asegura que sean válidos
-                        precio_min = float(input("Ingrese el precio mínimo: "))
+                        precio_min = Dinero.de(input("Ingrese el precio mínimo: "))
                         while precio_min < 0:
                             print("Error. Ingrese un precio válido.")
-                            precio_min = float(input("Ingrese el precio mínimo: "))
+                            precio_min = Dinero.de(input("Ingrese el precio mínimo: "))
 
-                        precio_max = float(input("Ingrese el precio máximo: "))
+                        precio_max = Dinero.de(input("Ingrese el precio máximo: "))
                         while precio_max < 0 or precio_max < precio_min:
                             print("Error. Ingrese un precio válido.")
                             if precio_max < precio_min:
                                 print("El precio máximo debe ser mayor o igual que el precio mínimo.")
-                            precio_max = float(input("Ingrese el precio máximo: "))
+                            precio_max = Dinero.de(input("Ingrese el precio máximo: "))
                         break
                     except ValueError:
                         print("Por favor ingrese valores numéricos válidos para los precios.")
 
-                encontrados = [
-                    producto for producto in self.productos 
-                    if precio_min <= producto.precio <= precio_max
-                ]
+                encontrados = self.indice_precios.buscar_rango(precio_min, precio_max)
 
                 if encontrados:
                     print(f"\nDE PRECIOS ${precio_min} a ${precio_max}:")
@@ -386,10 +1929,7 @@ class App:
             # Opción 3: Buscar productos por nombre
             elif opcion == "3":
                 nombre_buscar = input("Ingrese el nombre del producto a buscar: ")
-                encontrados = [
-                    producto for producto in self.productos 
-                    if nombre_buscar.lower() in producto.nombre.lower()
-                ]
+                encontrados = self.indice_nombres.buscar(nombre_buscar)
                 
                 if encontrados:
                     print(f"\nDE NOMBRE '{nombre_buscar}':")
@@ -411,10 +1951,7 @@ class App:
                     except ValueError:
                         print("Por favor ingrese un número válido para el inventario.")
 
-                encontrados = [
-                    producto for producto in self.productos 
-                    if producto.inventario >= inventario_min
-                ]
+                encontrados = self.productos.filtrar_inventario(inventario_min)
 
                 if encontrados:
                     print(f"\nDE INVENTARIO MÍNIMO {inventario_min}")
@@ -423,7 +1960,42 @@ class App:
                 else:
                     print("No se encontraron productos con ese inventario mínimo.")
 
-            # Opción 5: Salir del menú
+            # Opción 5: Listar el catálogo ordenado por precio
+            elif opcion == "5":
+                orden = input("1 -. Menor a mayor precio\n2 -. Mayor a menor precio\n> Ingrese un número: ")
+                while orden not in ["1", "2"]:
+                    orden = input("Error. Ingrese 1 o 2: ")
+
+                ordenados = self.indice_precios.ordenados(descendente=(orden == "2"))
+
+                if ordenados:
+                    print(f"\nCATÁLOGO POR PRECIO ({'MENOR A MAYOR' if orden == '1' else 'MAYOR A MENOR'}):")
+                    for i, producto in enumerate(ordenados):
+                        print(f"{i+1} -. {producto.show_attr()}")
+                else:
+                    print("No hay productos en el catálogo.")
+
+            # Opción 6: Buscar productos compatibles con un vehículo
+            elif opcion == "6":
+                vehiculos = self.indice_vehiculos.listar_vehiculos()
+                if vehiculos:
+                    print("\nVehículos registrados: " + ", ".join(vehiculos))
+
+                vehiculo_buscar = input("Ingrese el nombre del vehículo: ")
+                while len(vehiculo_buscar.strip()) == 0:
+                    print("No puede estar vacío.")
+                    vehiculo_buscar = input("Ingrese el nombre del vehículo: ")
+
+                encontrados = self.indice_vehiculos.buscar(vehiculo_buscar)
+
+                if encontrados:
+                    print(f"\nCOMPATIBLES CON '{vehiculo_buscar.upper()}':")
+                    for i, producto in enumerate(encontrados):
+                        print(f"{i+1} -. {producto.show_attr()}")
+                else:
+                    print("No se encontraron productos compatibles con ese vehículo.")
+
+            # Opción 7: Salir del menú
             else:
                 break
 
@@ -440,6 +2012,7 @@ class App:
                 3. Categoría
                 4. Inventario
                 5. Compatibilidad (Agregar o eliminar vehículos compatibles)
+                6. Precio
             - Valida los datos ingresados para asegurar que sean correctos.
             - Permite al usuario salir del proceso de modificación en cualquier momento.
 
@@ -468,12 +2041,13 @@ class App:
     3 -. Categoría
     4 -. Inventario
     5 -. Compatibilidad
-    6 -. Salir
+    6 -. Precio
+    7 -. Salir
     > Ingrese un número: ''')
 
             # Valida la opción seleccionada
-            while not opcion.isnumeric() or not int(opcion) in range(1, 7):
-                print("Opción inválida. Ingrese un número entre 1 y 6)")
+            while not opcion.isnumeric() or not int(opcion) in range(1, 8):
+                print("Opción inválida. Ingrese un número entre 1 y 7)")
                 opcion = input('''> Ingrese un número: ''')
 
             # Modificación del nombre del producto
@@ -482,6 +2056,7 @@ class App:
                     nuevo_nombre = input("Ingrese el nuevo nombre del producto: ")
                     if len(nuevo_nombre) >= 0:
                         producto.nombre = nuevo_nombre
+                        self.indice_nombres.actualizar(producto)
                         print(f"Nombre Actualizado!")
                         break
                     else:
@@ -514,7 +2089,8 @@ class App:
                 while True:
                     nuevo_inventario = input("Ingrese la nueva CANTIDAD DE inventario: ")
                     if nuevo_inventario.isnumeric() and int(nuevo_inventario) >= 0:
-                        producto.inventario = int(nuevo_inventario)
+                        with self.motor_ventas.candado_producto(producto):
+                            producto.inventario = int(nuevo_inventario)
                         print(f"Inventario Actualizado!")
                         break
                     else:
@@ -536,10 +2112,11 @@ class App:
                             print("No puede estar vacío.")
                             nombre_carro = input("Ingrese el nombre del carro compatible: ")
 
-                        if producto.verificar_vehiculos_compatibles(nombre_carro):
+                        if self.indice_vehiculos.es_compatible(producto, nombre_carro):
                             print(f'El carro {nombre_carro} ya se encuentra en la lista')
                         else:
                             producto.compatible.append(nombre_carro)
+                            self.indice_vehiculos.agregar_vehiculo(producto, nombre_carro)
 
                     elif opcion == '2':  # Eliminar un vehículo compatible
                         if len(producto.compatible) > 0:
@@ -551,7 +2128,8 @@ class App:
                                 indice_carro = input("Ingrese una opción VÁLIDA: ")
 
                             print(f'{producto.compatible[int(indice_carro) - 1]} ELIMINADO')
-                            producto.compatible.pop(int(indice_carro) - 1)
+                            eliminado = producto.compatible.pop(int(indice_carro) - 1)
+                            self.indice_vehiculos.eliminar_vehiculo(producto, eliminado)
 
                         else:
                             print("No hay vehiculos para eliminar")
@@ -559,10 +2137,28 @@ class App:
                     else:  # Salir del submenú de compatibilidad
                         break
 
-            # Salir del menú de modificación
+            # Modificación del precio del producto
             elif opcion == "6":
+                while True:
+                    try:
+                        nuevo_precio = Dinero.de(input("Ingrese el nuevo precio del producto: "))
+                        if nuevo_precio >= 0:
+                            producto.precio = nuevo_precio
+                            self.indice_precios.actualizar(producto)
+                            print(f"Precio Actualizado!")
+                            break
+                        print("Ingrese un precio válido.")
+                    except ValueError:
+                        print("Precio inválido. Debe ser un número.")
+
+            # Salir del menú de modificación
+            elif opcion == "7":
                 break
 
+            # Registra el producto modificado, con el inventario en el orden de las ventas
+            with self.motor_ventas.candado_producto(producto):
+                self.registrar_cambio("producto", self.serializar_producto(producto))
+
     def eliminar_producto(self):
         while True:
             print(f'\n  ELIMINAR PRODUCTO  ')
@@ -577,6 +2173,8 @@ class App:
 
             producto = self.productos[int(indice_producto) - 1]
             self.productos.remove(producto)
+            self.desindexar_producto(producto)
+            self.registrar_cambio("producto_eliminado", {"id": producto.id})
             print(f"{producto.nombre.upper()} ELIMINADO.")
             break
 
@@ -601,7 +2199,7 @@ class App:
                 else:
                     self.registrar_venta()
             elif opcion == "2":
-                if len(self.ventas) == 0:
+                if not self.hay_registros("ventas"):
                     print("No hay ventas registradas.")
                 else:
                     self.buscar_ventas()
@@ -639,8 +2237,10 @@ class App:
         Nota:
             - Valida todas las entradas para asegurar que sean correctas (números válidos, cantidades disponibles, etc.).
             - Proporciona mensajes claros al usuario en cada paso del proceso.
+            - Los pasos 5 a 8 los hace `MotorVentas.registrar_venta`, igual que para los pedidos por lotes.
         """
         print(f'\n  REGISTRAR VENTA  ')
+        self.esperar_catalogo()
 
         # Verifica si hay clientes registrados
         if len(self.clientes) == 0:
@@ -667,11 +2267,11 @@ class App:
             return
 
         # Selección de productos
+        # El inventario se descuenta al registrar la venta (`MotorVentas.registrar_venta`)
         productos_seleccionados = {}
-        subtotal_venta = 0
         while True:
             for i, producto in enumerate(self.productos):
-                print(f"{i+1} -. {producto.nombre}\n{'-'*30}Precio: ${producto.precio:.2f} <<>> Inventario disponible: {producto.inventario}\n")
+                print(f"{i+1} -. {producto.nombre}\n{'-'*30}Precio: ${producto.precio:.2f} <<>> Inventario disponible: {producto.inventario - productos_seleccionados.get(producto, 0)}\n")
 
             indice_producto = input("\nIntroduce el número del producto que desea agregar: ")
             while not indice_producto.isnumeric() or not int(indice_producto) in range(len(self.productos) + 1):
@@ -680,15 +2280,13 @@ class App:
 
             producto = self.productos[int(indice_producto) - 1]
 
-            # Solicita la cantidad deseada y actualiza inventario
+            # Solicita la cantidad deseada
             cantidad = input(f"\n¿Cuántas unidades desea comprar? ")
-            while not cantidad.isnumeric() or int(cantidad) <= 0 or int(cantidad) > producto.inventario:
+            disponible = producto.inventario - productos_seleccionados.get(producto, 0)
+            while not cantidad.isnumeric() or int(cantidad) <= 0 or int(cantidad) > disponible:
                 print(f"Cantidad inválida.")
                 cantidad = input(f"¿Cuántas unidades desea comprar? ")
 
-            producto.inventario -= int(cantidad)
-            subtotal_venta += producto.precio * int(cantidad)
-
             if producto in productos_seleccionados:
                 productos_seleccionados[producto] += int(cantidad)
             else:
@@ -703,7 +2301,7 @@ class App:
                 break
 
         # Métodos de pago para cliente jurídico
-        descuento = 0
+        dias = None
         if isinstance(cliente, ClienteJuridico):
             metodo_pago = input('''
     ¿Cuál es su método de pago?
@@ -715,8 +2313,7 @@ class App:
                 metodo_pago = input('Error.\nIngresa el número de la opción deseada: ')
 
             if metodo_pago == "1":
-                descuento += subtotal_venta * 0.05
-                metodo_pago = "Contado"
+                metodo_pago = "Contado"  # Con 5% de descuento
             else:
                 dias = input("1 -. 15\n2 -. 30\n ¿Dentro de cuántos días realizará el segundo pago?:")
                 while not dias.isnumeric() or not int(dias) in range(1, 3):
@@ -740,14 +2337,8 @@ class App:
         while not tipo_pago.isnumeric() or not int(tipo_pago) in range(1, 7):
             tipo_pago = input("Error.\nIngresa un número: ")
 
-        moneda, tipo_pago = (
-            ("Bolívares", "Punto de Venta") if tipo_pago == "1" else
-            ("Bolívares", "Pago móvil") if tipo_pago == "2" else
-            ("Bolívares", "Transferencia") if tipo_pago == "3" else
-            ("USD", "Zelle") if tipo_pago == "4" else
-            ("USD", "PayPal") if tipo_pago == "5" else
-            ("USD", "Efectivo")
-        )
+        # Las opciones siguen el orden de TIPOS_PAGO
+        tipo_pago = list(TIPOS_PAGO)[int(tipo_pago) - 1]
 
         # Selección de método de envío
         metodo_envio = input("\nMÉTODO DE ENVÍO:\n1 -. Zoom\n2 -. Delivery\n> Ingresa el número de la opción deseada: ")
@@ -757,95 +2348,46 @@ class App:
 
         metodo_envio = "Zoom" if metodo_envio == "1" else "Delivery"
 
-        # Cálculo de montos
-        iva = (subtotal_venta - descuento) * 0.16
-        total_venta = (subtotal_venta - descuento) + iva
-        igtf = 0
-        if moneda == "USD":
-            igtf += total_venta * 0.03
-
-        # Crear y registrar la venta
-        nueva_venta = Venta(len(self.ventas), datetime.now().strftime("%Y-%m-%d"), cliente, productos_seleccionados, metodo_pago, metodo_envio, subtotal_venta, descuento, iva, igtf, total_venta)
+        # Registrar la venta, sus pagos y su envío. Otra caja pudo vender el inventario o
+        # registrar un crédito del cliente mientras se llenaba el carrito
+        try:
+            nueva_venta, pagos, _ = self.motor_ventas.registrar_venta(cliente, productos_seleccionados, tipo_pago,
+                                                                      metodo_envio, metodo_pago, dias)
+        except ValueError as error:
+            print(f"\nNO SE PUDO REGISTRAR LA VENTA: {error}")
+            return
         print("\n  -- RESUMEN DE LA VENTA --  ")
         print(nueva_venta.show_attr())
-        self.ventas.append(nueva_venta)
         print("\nVENTA REGISTRADA.")
 
-        # Registro de pagos
-        if metodo_pago == "Crédito":
-            monto_inicial = (total_venta / 2)
-            igtf = 0
-            if moneda == "USD":
-                igtf += monto_inicial * 0.03
-                monto_inicial += igtf
-            self.pago_registrado_venta(nueva_venta, moneda, tipo_pago, monto_inicial, False)
-            self.pago_credito_venta(nueva_venta, (monto_inicial - igtf), int(dias))
-        else:
-            self.pago_registrado_venta(nueva_venta, moneda, tipo_pago, total_venta, True)
-
-        # Registro de envío
-        nuevo_envio = Envio(nueva_venta.cliente, nueva_venta, metodo_envio, None, None, None, None)
-        self.envios.append(nuevo_envio)
+        for pago in pagos:
+            if pago.estado:
+                if metodo_pago == "Contado":
+                    print("\n! REGISTRANDO PAGO !")
+                print(f'PAGO GENERADO -\n{pago.show_attr()}\n')
+            else:
+                print("\n! REGISTRANDO PAGO PENDIENTE !")
+                print(f"\nPAGO PENDIENTE GENERADO -\n{pago.show_attr()}")
+                print(f"PUEDE CANCELAR HASTA DENTRO DE {dias} DÍAS\nACCEDE AL MÓDULO DE PAGOS PARA EFECTUARLO")
         print("Dirígase al apartado de envíos para enviar su compra")
 
 
-    def pago_registrado_venta(self, nueva_venta, moneda, tipo_pago, monto, metodo_pago):
+    @staticmethod
+    def pedir_fecha(mensaje):
         """
-        Registra un pago asociado a una venta.
-
-        Args:
-            nueva_venta (Venta): Venta para la que se está registrando el pago.
-            moneda (str): Moneda del pago (USD o Bolívares).
-            tipo_pago (str): Método de pago utilizado (Zelle, Transferencia, etc.).
-            monto (float): Monto total del pago.
-            metodo_pago (bool): Indica si el pago es inmediato (True) o si es parte de un crédito (False).
-
-        Funcionalidad:
-            - Si el método de pago es inmediato, muestra un mensaje indicando el registro del pago.
-            - Crea un objeto `Pago` con estado `True` (pagado).
-            - Agrega el pago a la lista de pagos registrados y muestra su información.
-        """
-        if metodo_pago:
-            print("\n! REGISTRANDO PAGO !")
-
-        nuevo_pago = Pago(nueva_venta.cliente, nueva_venta, monto, tipo_pago, moneda)
-        nuevo_pago.estado = True  # Marca el pago como completado
-        self.pagos.append(nuevo_pago)
-        print(f'PAGO GENERADO -\n{nuevo_pago.show_attr()}\n')
-
-    def pago_credito_venta(self, nueva_venta, monto_inicial, dias):
-        """
-        Genera un pago pendiente como parte de un plan de crédito.
-
-        Args:
-            nueva_venta (Venta): Venta para la que se está generando el pago pendiente.
-            monto_inicial (float): Monto inicial que debe pagarse como parte del crédito.
-            dias (int): Plazo en días para efectuar el pago pendiente.
-
-        Funcionalidad:
-            - Muestra un mensaje indicando el registro del pago pendiente.
-            - Crea un objeto `Pago` con estado `False` (pendiente), sin especificar tipo de pago ni moneda.
-            - Calcula la fecha límite para realizar el pago, sumando los días del plazo al día actual.
-            - Agrega el pago a la lista de pagos registrados y muestra su información.
+        Solicita una fecha hasta que sea válida y la devuelve en formato "YYYY-MM-DD"
+        (con ceros a la izquierda, para poder compararla como texto).
         """
-        print("\n! REGISTRANDO PAGO PENDIENTE !")
-        tipo_pago = None
-        moneda = None
-        nuevo_pago = Pago(nueva_venta.cliente, nueva_venta, monto_inicial, tipo_pago, moneda)
-
-        # Calcula la fecha límite del pago pendiente
-        nueva_fecha = datetime.strptime(nuevo_pago.fecha, "%Y-%m-%d %H:%M:%S") + timedelta(days=dias)
-        nuevo_pago.fecha = nueva_fecha.strftime("%Y-%m-%d %H:%M:%S")
-
-        self.pagos.append(nuevo_pago)
-        print(f"\nPAGO PENDIENTE GENERADO -\n{nuevo_pago.show_attr()}")
-        print(f"PUEDE CANCELAR HASTA DENTRO DE {dias} DÍAS\nACCEDE AL MÓDULO DE PAGOS PARA EFECTUARLO")
-
+        while True:
+            try:
+                return datetime.strptime(input(mensaje).strip(), "%Y-%m-%d").strftime("%Y-%m-%d")
+            except ValueError:
+                print("Fecha inválida.")
 
     def buscar_ventas(self):
         """
-        Permite buscar ventas registradas en el sistema mediante dos criterios: 
-        por cliente o por fecha.
+        Permite buscar ventas registradas en el sistema mediante tres criterios: 
+        por cliente, por fecha o por rango de fechas.
 
         Flujo del método:
             1. Solicita al usuario seleccionar el criterio de búsqueda:
@@ -853,6 +2395,8 @@ class App:
                 y muestra todas las ventas asociadas al cliente seleccionado.
             - **Por Fecha:** Solicita una fecha en formato `YYYY-MM-DD`. Busca y muestra todas 
                 las ventas realizadas en la fecha ingresada.
+            - **Por Rango de Fechas:** Solicita la fecha inicial y la final y muestra las
+                ventas de ese periodo, ordenadas por fecha.
             2. Validaciones:
             - Para la búsqueda por cliente, valida que el índice ingresado sea correcto.
             - Para la búsqueda por fecha, valida el formato y la consistencia de la fecha.
@@ -869,8 +2413,9 @@ class App:
         opcion_busqueda = input('''
     1 -. Por Cliente
     2 -. Por Fecha
+    3 -. Por Rango de Fechas
     > Ingrese un número: ''')
-        while not opcion_busqueda.isnumeric() or not int(opcion_busqueda) in range(1, 3):
+        while not opcion_busqueda.isnumeric() or not int(opcion_busqueda) in range(1, 4):
             opcion_busqueda = input('''Error.\nIngrese un número: ''')
 
         if opcion_busqueda == "1":  # Búsqueda por cliente
@@ -891,10 +2436,7 @@ class App:
             cliente = self.clientes[int(cliente_indice) - 1]
 
             # Búsqueda de ventas asociadas al cliente
-            ventas_cliente = []
-            for venta in self.ventas:
-                if venta.cliente == cliente:
-                    ventas_cliente.append(venta)
+            ventas_cliente = self.repositorio.ventas_cliente(cliente)
 
             # Muestra los resultados de la búsqueda por cliente
             if not ventas_cliente:
@@ -920,10 +2462,7 @@ class App:
             fecha = f"{fecha_lista[0]}-{fecha_lista[1]}-{fecha_lista[2]}"
 
             # Búsqueda de ventas asociadas a la fecha
-            ventas_fecha = []
-            for venta in self.ventas:
-                if venta.fecha.split(" ")[0] == fecha:
-                    ventas_fecha.append(venta)
+            ventas_fecha = self.repositorio.ventas_fecha(fecha)
 
             # Muestra los resultados de la búsqueda por fecha
             if not ventas_fecha:
@@ -933,6 +2472,25 @@ class App:
                 for i, venta in enumerate(ventas_fecha):
                     print(f'{i+1} -. {venta.show_attr()}')
 
+        elif opcion_busqueda == "3":  # Búsqueda por rango de fechas
+            print("\n  BÚSQUEDA POR RANGO DE FECHAS  ")
+
+            desde = self.pedir_fecha("Introduzca la fecha inicial (YYYY-MM-DD): ")
+            hasta = self.pedir_fecha("Introduzca la fecha final (YYYY-MM-DD): ")
+            while hasta < desde:
+                print("La fecha final debe ser igual o posterior a la inicial.")
+                hasta = self.pedir_fecha("Introduzca la fecha final (YYYY-MM-DD): ")
+
+            # Búsqueda de las ventas del periodo en el índice por fecha
+            ventas_periodo = self.repositorio.ventas_periodo(desde, hasta)
+
+            if not ventas_periodo:
+                print(f"No se encontraron ventas entre {desde} y {hasta}.")
+            else:
+                print(f"\nDEL {desde} AL {hasta} ({len(ventas_periodo)} ventas):")
+                for i, venta in enumerate(ventas_periodo):
+                    print(f'{i+1} -. {venta.show_attr()}')
+
 
     def gestion_clientes(self):
         while True:
@@ -1037,6 +2595,7 @@ class App:
             # Crea una instancia de ClienteNatural
             cliente = ClienteNatural(correo, direccion, telefono, nombre, cedula)
             self.clientes.append(cliente)
+            self.indexar_cliente(cliente)
 
         elif opcion == "2":  # Cliente Jurídico
             # Solicita y valida los datos específicos del cliente jurídico
@@ -1068,6 +2627,9 @@ class App:
             # Crea una instancia de ClienteJuridico
             cliente = ClienteJuridico(correo, direccion, telefono, razon_social, rif, nombre_contacto, telf_contacto, correo_contacto)
             self.clientes.append(cliente)
+            self.indexar_cliente(cliente)
+
+        self.registrar_cambio("cliente", self.serializar_cliente(cliente))
 
         # Muestra un mensaje de confirmación
         print("\nCliente registrado.\n")
@@ -1152,12 +2714,14 @@ class App:
                     while len(nuevo_correo) == 0:
                         print("No debe estar vacío.")
                         nuevo_correo = input("Ingrese un correo válido: ")
-                    cliente_seleccionado.correo = nuevo_correo
+                    self.cambiar_correo_cliente(cliente_seleccionado, nuevo_correo)
                     print("Correo modificado!")
 
                 elif opcion == "4":
                     break
 
+                self.registrar_cambio("cliente", self.serializar_cliente(cliente_seleccionado))
+
         # Modificación para Cliente Jurídico
         elif isinstance(cliente_seleccionado, ClienteJuridico):
             while True:
@@ -1197,7 +2761,7 @@ class App:
                     while len(nuevo_correo) == 0:
                         print("No debe estar vacío.")
                         nuevo_correo = input("Ingrese un correo válido: ")
-                    cliente_seleccionado.correo = nuevo_correo
+                    self.cambiar_correo_cliente(cliente_seleccionado, nuevo_correo)
                     print("Correo modificado exitosamente.")
 
                 elif opcion == "4":
@@ -1227,6 +2791,8 @@ class App:
                 elif opcion == "7":
                     break
 
+                self.registrar_cambio("cliente", self.serializar_cliente(cliente_seleccionado))
+
     def eliminar_cliente(self):
         print("\n  ELIMINAR CLIENTE  ")
 
@@ -1252,6 +2818,11 @@ class App:
         cliente_seleccionado = self.clientes[int(seleccion) - 1]
 
         self.clientes.remove(cliente_seleccionado)
+        self.desindexar_cliente(cliente_seleccionado)
+        if isinstance(cliente_seleccionado, ClienteNatural):
+            self.registrar_cambio("cliente_eliminado", {"cedula": cliente_seleccionado.cedula})
+        else:
+            self.registrar_cambio("cliente_eliminado", {"rif": cliente_seleccionado.rif})
         print(f"\n{cliente_seleccionado.nombre if isinstance(cliente_seleccionado, ClienteNatural) else cliente_seleccionado.razon_social} eliminado.")
         
     def buscar_cliente(self):
@@ -1263,7 +2834,7 @@ class App:
             1. Solicita al usuario seleccionar un criterio de búsqueda:
             - **Por Identificación:** Busca un cliente natural o jurídico cuya cédula o RIF coincida con la identificación ingresada.
             - **Por Correo:** Busca un cliente cuyo correo coincida con el ingresado.
-            2. Itera sobre la lista de clientes registrados, verificando coincidencias según el criterio seleccionado.
+            2. Consulta el repositorio por cédula/RIF o por correo según el criterio seleccionado.
             3. Si encuentra un cliente, muestra su información detallada utilizando el método `show_attr`.
             4. Si no encuentra coincidencias, informa al usuario.
             5. Permite salir del menú de búsqueda seleccionando la opción correspondiente.
@@ -1292,36 +2863,25 @@ class App:
                 print("\n  BÚSQUEDA POR IDENTIFICACIÓN  ")
 
                 id_cliente = input("\nIngrese la identificación del cliente (cédula/RIF): ")
-                cliente_encontrado = False
 
-                # Itera por la lista de clientes y verifica coincidencias con cédula o RIF
-                for cliente in self.clientes:
-                    if isinstance(cliente, ClienteNatural) and cliente.cedula == id_cliente:
-                        cliente_encontrado = True
-                        print(f"\nCliente encontrado:\n{cliente.show_attr()}")
-                        break
-                    elif isinstance(cliente, ClienteJuridico) and cliente.rif == id_cliente:
-                        cliente_encontrado = True
-                        print(f"\nCliente encontrado:\n{cliente.show_attr()}")
-                        break
+                # Busca la identificación por cédula y por RIF
+                cliente = self.repositorio.buscar_cliente(id_cliente)
 
-                if not cliente_encontrado:
+                if cliente is not None:
+                    print(f"\nCliente encontrado:\n{cliente.show_attr()}")
+                else:
                     print("No se encontró ningún cliente con esa identificación.")
 
             # Búsqueda por correo
             elif opcion == "2":
                 print("\n  BÚSQUEDA POR CORREO  ")
                 correo = input("Ingrese el correo del cliente: ")
-                cliente_encontrado = False
 
-                # Itera por la lista de clientes y verifica coincidencias con el correo
-                for cliente in self.clientes:
-                    if cliente.correo == correo:
-                        cliente_encontrado = True
-                        print(f"\nCliente encontrado:\n{cliente.show_attr()}")
-                        break
+                cliente = self.repositorio.buscar_cliente_correo(correo)
 
-                if not cliente_encontrado:
+                if cliente is not None:
+                    print(f"\nCliente encontrado:\n{cliente.show_attr()}")
+                else:
                     print("No se encontró ningún cliente con esa identificación.")
 
             # Salida del menú
@@ -1441,6 +3001,7 @@ class App:
             pago_seleccionado.moneda_pago = moneda
             pago_seleccionado.estado = True
             pago_seleccionado.fecha = datetime.now().strftime("%Y-%m-%d")
+            self.registrar_cambio("pago", self.serializar_pago(pago_seleccionado))
 
             # Muestra el estado actualizado del pago
             print(f'\nESTADO DEL PAGO ACTUALIZADO:\n{pago_seleccionado.show_attr()}')
@@ -1477,7 +3038,7 @@ class App:
             print(f'\n  BUSCAR PAGOS  ')
 
             # Verifica si hay pagos registrados
-            if len(self.pagos) == 0:
+            if not self.hay_registros("pagos"):
                 print("No hay pagos registrados.")
                 return
 
@@ -1507,7 +3068,7 @@ class App:
                     cliente_indice = input("Error.\nSeleccione el cliente para buscar sus pagos: ")
 
                 cliente = self.clientes[int(cliente_indice) - 1]
-                pagos_cliente = [pago for pago in self.pagos if pago.cliente == cliente]
+                pagos_cliente = self.repositorio.pagos_cliente(cliente)
 
                 if not pagos_cliente:
                     print("No se encontraron pagos con este cliente.")
@@ -1528,7 +3089,7 @@ class App:
                     fecha_lista = fecha_busqueda.split("-")
 
                 fecha = f"{fecha_lista[0]}-{fecha_lista[1]}-{fecha_lista[2]}"
-                pagos_fecha = [pago for pago in self.pagos if pago.fecha.split(" ")[0] == fecha]
+                pagos_fecha = self.repositorio.pagos_fecha(fecha)
 
                 if not pagos_fecha:
                     print(f"No se encontraron pagos en esta fecha: {fecha}.")
@@ -1561,7 +3122,7 @@ class App:
                     "6": "Efectivo"
                 }[tipo_pago]
 
-                pagos_encontrados = [pago for pago in self.pagos if pago.metodo_pago == tipo_seleccionado]
+                pagos_encontrados = self.repositorio.pagos_metodo(tipo_seleccionado)
 
                 if pagos_encontrados:
                     print(f"\nDEL TIPO '{tipo_seleccionado}':")
@@ -1578,8 +3139,8 @@ class App:
                     print("Opción inválida. Ingrese un 1 o 2")
                     moneda = input("Selecciona la moneda: ")
 
-                moneda_seleccionada = "USD" if moneda == "1" else "Bolivares"
-                pagos_encontrados = [pago for pago in self.pagos if pago.moneda_pago and pago.moneda_pago.lower() == moneda_seleccionada.lower()]
+                moneda_seleccionada = "USD" if moneda == "1" else "Bolívares"
+                pagos_encontrados = self.repositorio.pagos_moneda(moneda_seleccionada)
 
                 if pagos_encontrados:
                     print(f"\nDEL LA MONEDA '{moneda_seleccionada}':")
@@ -1605,12 +3166,12 @@ class App:
                 opcion = input("> Ingrese un número: ")
 
             if opcion == "1":
-                if len(self.ventas) == 0:
+                if not self.hay_registros("ventas"):
                     print("No hay ventas a ser enviadas")
                 else:
                     self.registrar_envio()
             elif opcion == "2":
-                if len(self.envios) == 0:
+                if not self.hay_registros("envios"):
                     print("No hay envíos registrados para buscar")
                 else:
                     self.buscar_envios()
@@ -1672,21 +3233,22 @@ class App:
             metodo_envio = envio_seleccionado.servicio_envio
             if metodo_envio.lower() == "delivery":
                 print("\n  INFORMACIÓN DEL MOTORIZADO  ")
-                envio.nombre_motorizado = input("Introduce el nombre del motorizado: ")
-                envio.telefono_motorizado = input("Introduce el teléfono del motorizado: ")
-                envio.placa_motorizado = input("Introduce la placa del motorizado: ")
+                envio_seleccionado.nombre_motorizado = input("Introduce el nombre del motorizado: ")
+                envio_seleccionado.telefono_motorizado = input("Introduce el teléfono del motorizado: ")
+                envio_seleccionado.placa_motorizado = input("Introduce la placa del motorizado: ")
 
             # Solicita el costo del servicio de envío
             while True:
                 try:
                     costo_servicio = float(input("Introduce el costo del servicio de envío: $"))
-                    envio.costo_servicio = costo_servicio
+                    envio_seleccionado.costo_servicio = costo_servicio
                     break
                 except ValueError:
                     print("Precio inválido\n")
 
             # Actualiza el estado del envío
             envio_seleccionado.estado = True
+            self.registrar_cambio("envio", self.serializar_envio(envio_seleccionado))
             print("\nEnvio Actualizado! Su compra está en camino...")
             break
 
@@ -1718,7 +3280,7 @@ class App:
             print(f'\n  BUSCAR ENVÍOS  ')
 
             # Verifica si hay envíos registrados
-            if len(self.envios) == 0:
+            if not self.hay_registros("envios"):
                 print("No hay envíos registrados.")
                 return
 
@@ -1745,7 +3307,7 @@ class App:
                     cliente_indice = input("Error.\nSeleccione el cliente para buscar sus envíos: ")
 
                 cliente = self.clientes[int(cliente_indice) - 1]
-                envios_cliente = [envio for envio in self.envios if envio.cliente == cliente]
+                envios_cliente = self.repositorio.envios_cliente(cliente)
 
                 # Muestra los resultados de la búsqueda
                 if not envios_cliente:
@@ -1768,7 +3330,7 @@ class App:
                     fecha_lista = fecha_busqueda.split("-")
 
                 fecha = f"{fecha_lista[0]}-{fecha_lista[1]}-{fecha_lista[2]}"
-                envios_fecha = [envio for envio in self.envios if envio.fecha.split(" ")[0] == fecha]
+                envios_fecha = self.repositorio.envios_fecha(fecha)
 
                 # Muestra los resultados de la búsqueda
                 if not envios_fecha:
@@ -1832,50 +3394,21 @@ class App:
                         print("Error. Selección inválida.")
                         opcion = input("> Ingrese el número de la opción deseada:  ")
 
-                    if opcion == "1":
-                        print("Pendiente...")  # Ventas totales (por implementar)
+                    if opcion == "1":  # Ventas totales
+                        cantidad, total = self.repositorio.ventas_totales()
+                        print(f"\n VENTAS TOTALES \nVentas registradas: {cantidad}\nMonto total: ${total}\n")
 
                     elif opcion == "2":  # Productos más vendidos
+                        self.esperar_catalogo()
                         print("\n 3 PRODUCTOS MÁS VENDIDOS ")
-                        productos = {}
-                        for venta in self.ventas:
-                            for producto, cantidad in venta.productos.items():
-                                if producto.nombre not in productos:
-                                    productos[producto.nombre] = cantidad
-                                else:
-                                    productos[producto.nombre] += cantidad
-
-                        for i in range(min(3, len(productos))):
-                            max_cantidad = None
-                            nombre_producto = ""
-                            for producto, cantidad in productos.items():
-                                if max_cantidad is None or cantidad > max_cantidad:
-                                    max_cantidad = cantidad
-                                    nombre_producto = producto
-
+                        for i, (nombre_producto, max_cantidad) in enumerate(self.repositorio.productos_mas_vendidos(3)):
                             print(f"{i + 1}. {nombre_producto.upper()}: {max_cantidad}")
-                            del productos[nombre_producto]
                         print("\n")
 
                     elif opcion == "3":  # Clientes frecuentes
                         print("\n 3 CLIENTES MÁS FRECUENTES")
-                        clientes = {}
-                        for venta in self.ventas:
-                            if venta.cliente not in clientes:
-                                clientes[venta.cliente] = 1
-                            else:
-                                clientes[venta.cliente] += 1
-
-                        for i in range(min(3, len(clientes))):
-                            frecuencia = None
-                            cliente = ""
-                            for cliente_obj, frecuencia_compra in clientes.items():
-                                if frecuencia is None or frecuencia_compra > frecuencia:
-                                    frecuencia = frecuencia_compra
-                                    cliente = cliente_obj
-
+                        for i, (cliente, frecuencia) in enumerate(self.repositorio.clientes_frecuentes(3)):
                             print(f"{i + 1}. {cliente.show_attr()} --> {frecuencia}")
-                            del clientes[cliente]
 
                     else:  # Salir de informes de ventas
                         break
@@ -1890,12 +3423,14 @@ class App:
                         print("Error. Selección inválida.")
                         opcion = input("> Ingrese el número de la opción deseada:  ")
 
-                    if opcion == "1":
-                        print("Pendiente...")  # Pagos totales (por implementar)
+                    if opcion == "1":  # Pagos totales
+                        cantidad, cobrado, pendiente = self.repositorio.pagos_totales()
+                        print(f"\n PAGOS TOTALES \nPagos registrados: {cantidad}\n"
+                              f"Monto cobrado: ${cobrado}\nMonto pendiente: ${pendiente}\n")
 
                     elif opcion == "2":  # Clientes con pagos pendientes
                         print("\n PAGOS PENDIENTES ")
-                        clientes_con_pagos_pendientes = [pago.cliente for pago in self.pagos if not pago.estado]
+                        clientes_con_pagos_pendientes = self.repositorio.clientes_pagos_pendientes()
 
                         if clientes_con_pagos_pendientes:
                             for i, cliente in enumerate(clientes_con_pagos_pendientes):
@@ -1920,29 +3455,14 @@ class App:
                         print("Pendiente")  # Envíos totales (por implementar)
 
                     elif opcion == "2":  # Productos más enviados
-                        productos = {}
-                        for envio in self.envios:
-                            for producto, cantidad in envio.orden_compra.productos.items():
-                                if producto.nombre not in productos:
-                                    productos[producto.nombre] = cantidad
-                                else:
-                                    productos[producto.nombre] += cantidad
-
+                        self.esperar_catalogo()
                         print("\n 3 PRODUCTOS MÁS ENVIADOS ")
-                        for i in range(min(3, len(productos))):
-                            max_cantidad = None
-                            nombre_producto = ""
-                            for product, quantity in productos.items():
-                                if max_cantidad is None or max_cantidad < quantity:
-                                    max_cantidad = quantity
-                                    nombre_producto = product
-
+                        for i, (nombre_producto, max_cantidad) in enumerate(self.repositorio.productos_mas_enviados(3)):
                             print(f'{i + 1}). {nombre_producto.upper()}: {max_cantidad}')
-                            del productos[nombre_producto]
 
                     elif opcion == "3":  # Clientes con envíos pendientes
                         print("\n ENVÍOS PENDIENTES ")
-                        envios_pendientes = [envio.cliente for envio in self.envios if not envio.estado]
+                        envios_pendientes = self.repositorio.clientes_envios_pendientes()
 
                         if envios_pendientes:
                             for i, cliente in enumerate(envios_pendientes):
@@ -1957,12 +3477,64 @@ class App:
                 break
     
     
+    def ejecutar_JSONL(self, importar=None, exportar=None):
+        """
+        Carga los datos, importa y/o exporta el historial en JSON Lines y cierra, sin mostrar
+        el menú ni cargar el catálogo de la API.
+
+        Args:
+            importar (str | None): Carpeta de la que se importa (`importar_JSONL`).
+            exportar (str | None): Carpeta a la que se exporta (`exportar_JSONL`).
+        """
+        self.repositorio.cargar()
+        # Sin menú no se carga el catálogo: el guardado y el cierre no deben esperarlo
+        self.catalogo_listo.set()
+        if importar is not None:
+            conteo = self.importar_JSONL(importar)
+            print(f"Importados: {conteo['ventas']} ventas, {conteo['pagos']} pagos y {conteo['envios']} envíos "
+                  f"({conteo['repetidos']} ya existían, {conteo['omitidos']} de ventas inexistentes)")
+        if exportar is not None:
+            print(self.resumen_guardado(self.exportar_JSONL(exportar)).replace("Guardado", "Exportado", 1))
+        self.repositorio.cerrar()
+
+    def ejecutar_pedidos(self, ruta):
+        """
+        Carga los datos y el catálogo, registra las ventas de un archivo de pedidos
+        (`MotorVentas.procesar_lote`) y cierra, sin mostrar el menú.
+
+        Args:
+            ruta (str): Archivo JSON Lines o CSV con los pedidos.
+        """
+        self.repositorio.cargar()
+        self.iniciar_carga_catalogo()
+        self.esperar_catalogo()
+        resumen = self.motor_ventas.procesar_lote(ruta)
+        print(f"{resumen['ventas']} de {resumen['pedidos']} pedidos registrados en {resumen['segundos']:.2f} s "
+              f"({resumen['pedidos'] / max(resumen['segundos'], 1e-9):.0f} pedidos/s)")
+        for numero, motivo in resumen["rechazados"]:
+            print(f"  Pedido {numero} rechazado: {motivo}")
+        self.repositorio.cerrar()
+
     def start(self):
-        print('\nCargando datos de la API\n')
-        self.cargar_data_api()
+        inicio = time.perf_counter()
+        conteo = self.repositorio.cargar()
+        self.metricas_arranque["datos_ms"] = (time.perf_counter() - inicio) * 1000
+        print(f"\nDatos restaurados en {self.metricas_arranque['datos_ms']:.0f} ms: {conteo['clientes']} clientes, "
+              f"{conteo['productos']} productos, {conteo['ventas']} ventas, {conteo['pagos']} pagos y "
+              f"{conteo['envios']} envíos")
+        if conteo["omitidos"]:
+            print(f"Se omitieron {conteo['omitidos']} pagos o envíos de ventas inexistentes.")
+        if conteo["cambios"]:
+            print(f"Se recuperaron {conteo['cambios']} cambios registrados después del último guardado.")
+        print('\nCargando datos de la API en segundo plano\n')
+        self.iniciar_carga_catalogo()
 
         while True:
             print("\nTIENDA DE VEHÍCULOS - MENÚ")
+            print(self.resumen_catalogo())
+            if "primer_menu_ms" not in self.metricas_arranque:
+                self.metricas_arranque["primer_menu_ms"] = (time.perf_counter() - inicio) * 1000
+                print(f"Menú disponible en {self.metricas_arranque['primer_menu_ms']:.0f} ms")
             opcion = input('''
 1 -. Gestión de productos    
 2 -. Gestión de ventas       
@@ -1988,6 +3560,6 @@ class App:
             elif opcion == "6":
                 self.estadisticas()
             else:
-                self.guardar_JSON()
+                self.repositorio.cerrar()
                 print("\nHasta Luego!")
                 break
\ No newline at end of file
@@ -0,0 +1,212 @@
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+
+from Producto import Producto
+
+MAGICO = b"TVCM"
+VERSION = 1
+# Mágico, versión, cantidad de productos, tamaño y fecha de modificación (ns) del archivo de origen
+CABECERA = struct.Struct("<4sHxxQQq")
+# ID, precio e inventario de cada fila
+FILA = struct.Struct("<qdq")
+# Textos de cada fila, en este orden: nombre, descripción, categoría y vehículos compatibles (JSON)
+TEXTOS_POR_FILA = 4
+
+
+class CatalogoMapeado:
+    """
+    Catálogo de productos de solo lectura sobre un archivo mapeado en memoria (mmap).
+
+    El archivo tiene filas de ancho fijo con el ID, el precio y el inventario, una tabla de
+    desplazamientos para los textos de largo variable (nombre, descripción, categoría y
+    vehículos compatibles) y un directorio de IDs ordenados para buscar por ID con
+    búsqueda binaria. Nada se copia al abrirlo: los valores se leen del mapeo cuando se
+    piden, y varios procesos que abren el mismo archivo comparten las mismas páginas
+    físicas de memoria. Un `Producto` solo se construye cuando se pide con `producto`.
+
+    Estructura del archivo (little-endian):
+
+        cabecera | filas (id q, precio d, inventario q) | IDs ordenados (q) |
+        fila de cada ID ordenado (q) | desplazamientos de los textos (q) | textos UTF-8
+
+    Atributos:
+        ruta (str): Archivo del catálogo.
+        cantidad (int): Cantidad de productos.
+        origen (tuple): (tamaño, fecha de modificación en ns) del archivo a partir del cual
+            se escribió, para saber si sigue actualizado.
+        mapa (mmap.mmap): Mapeo de solo lectura del archivo.
+        ids_ordenados (memoryview): IDs en orden ascendente.
+        filas_ordenadas (memoryview): Fila de cada ID de `ids_ordenados`.
+        desplazamientos (memoryview): Inicio de cada texto dentro de la zona de textos.
+        inicio_textos (int): Posición de la zona de textos en el archivo.
+    """
+
+    def __init__(self, ruta):
+        """
+        Abre y mapea un catálogo escrito por `escribir`.
+
+        Args:
+            ruta (str): Archivo del catálogo.
+
+        Raises:
+            ValueError: Si el archivo no es un catálogo mapeado compatible.
+        """
+        if sys.byteorder != "little":
+            raise ValueError("El catálogo mapeado solo puede leerse en equipos little-endian.")
+        self.ruta = ruta
+        with open(ruta, "rb") as file:
+            self.mapa = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.mapa) < CABECERA.size:
+            self.mapa.close()
+            raise ValueError(f"{ruta} no es un catálogo mapeado")
+        magico, version, cantidad, tamano_origen, fecha_origen = CABECERA.unpack_from(self.mapa)
+        if magico != MAGICO or version != VERSION:
+            self.mapa.close()
+            raise ValueError(f"{ruta} no es un catálogo mapeado compatible")
+        self.cantidad = cantidad
+        self.origen = (tamano_origen, fecha_origen)
+
+        vista = memoryview(self.mapa)
+        inicio = CABECERA.size + FILA.size * cantidad
+        self.ids_ordenados = vista[inicio:inicio + 8 * cantidad].cast("q")
+        inicio += 8 * cantidad
+        self.filas_ordenadas = vista[inicio:inicio + 8 * cantidad].cast("q")
+        inicio += 8 * cantidad
+        total_textos = TEXTOS_POR_FILA * cantidad + 1
+        self.desplazamientos = vista[inicio:inicio + 8 * total_textos].cast("q")
+        self.inicio_textos = inicio + 8 * total_textos
+
+    @staticmethod
+    def escribir(ruta, productos, origen=(0, 0)):
+        """
+        Escribe un catálogo mapeado en un archivo temporal y lo reemplaza de una sola vez.
+        Los procesos que ya tenían mapeado el archivo anterior siguen leyéndolo sin errores.
+
+        Args:
+            ruta (str): Archivo del catálogo.
+            productos (iterable): Tuplas (id, nombre, descripcion, precio, categoria,
+                inventario, compatible), en el orden del catálogo.
+            origen (tuple): (tamaño, fecha de modificación en ns) del archivo de origen.
+
+        Returns:
+            int: Cantidad de productos escritos.
+        """
+        filas = bytearray()
+        ids = array("q")
+        desplazamientos = array("q", [0])
+        textos = []
+        total = 0
+        for id, nombre, descripcion, precio, categoria, inventario, compatible in productos:
+            filas += FILA.pack(id, float(precio), inventario)
+            ids.append(id)
+            for texto in (nombre, descripcion, categoria, json.dumps(list(compatible), ensure_ascii=False)):
+                codificado = texto.encode("utf-8")
+                textos.append(codificado)
+                total += len(codificado)
+                desplazamientos.append(total)
+
+        orden = sorted(range(len(ids)), key=ids.__getitem__)
+        ids_ordenados = array("q", (ids[fila] for fila in orden))
+        filas_ordenadas = array("q", orden)
+        if sys.byteorder != "little":
+            for arreglo in (ids_ordenados, filas_ordenadas, desplazamientos):
+                arreglo.byteswap()
+
+        # Temporal propio de cada proceso, por si varios publican el catálogo a la vez
+        temporal = f"{ruta}.{os.getpid()}.tmp"
+        with open(temporal, "wb") as file:
+            file.write(CABECERA.pack(MAGICO, VERSION, len(ids), *origen))
+            file.write(filas)
+            file.write(ids_ordenados.tobytes())
+            file.write(filas_ordenadas.tobytes())
+            file.write(desplazamientos.tobytes())
+            file.write(b"".join(textos))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporal, ruta)
+        return len(ids)
+
+    @staticmethod
+    def origen_archivo(ruta):
+        """
+        Devuelve el (tamaño, fecha de modificación en ns) de un archivo, con el que se
+        identifica la versión a partir de la cual se escribió un catálogo mapeado.
+        """
+        estado = os.stat(ruta)
+        return estado.st_size, estado.st_mtime_ns
+
+    def __len__(self):
+        return self.cantidad
+
+    def fila(self, id):
+        """
+        Busca un ID en el directorio ordenado con búsqueda binaria.
+
+        Returns:
+            int | None: Fila del producto, o None si no está en el catálogo.
+        """
+        posicion = bisect_left(self.ids_ordenados, id)
+        if posicion < self.cantidad and self.ids_ordenados[posicion] == id:
+            return self.filas_ordenadas[posicion]
+        return None
+
+    def numeros(self, fila):
+        """
+        Devuelve (id, precio, inventario) de una fila, leídos directamente del mapeo.
+        """
+        return FILA.unpack_from(self.mapa, CABECERA.size + FILA.size * fila)
+
+    def texto(self, fila, campo):
+        """
+        Decodifica uno de los textos de una fila (0: nombre, 1: descripción, 2: categoría,
+        3: vehículos compatibles en JSON).
+        """
+        indice = TEXTOS_POR_FILA * fila + campo
+        inicio = self.inicio_textos + self.desplazamientos[indice]
+        fin = self.inicio_textos + self.desplazamientos[indice + 1]
+        return self.mapa[inicio:fin].decode("utf-8")
+
+    def valores(self, fila):
+        """
+        Devuelve los valores de una fila en el orden del constructor de `Producto`.
+        """
+        id, precio, inventario = self.numeros(fila)
+        return (id, self.texto(fila, 0), self.texto(fila, 1), precio, self.texto(fila, 2),
+                inventario, json.loads(self.texto(fila, 3)))
+
+    def precio(self, id):
+        """
+        Devuelve el precio de un producto sin construirlo, o None si no existe.
+        """
+        fila = self.fila(id)
+        return None if fila is None else self.numeros(fila)[1]
+
+    def producto(self, id):
+        """
+        Construye el `Producto` de un ID, con su propio almacén, o None si no existe.
+        """
+        fila = self.fila(id)
+        return None if fila is None else Producto(*self.valores(fila))
+
+    def registros(self):
+        """
+        Genera los productos del catálogo como registros con las claves de productos.json,
+        en el orden del catálogo.
+        """
+        for fila in range(self.cantidad):
+            id, nombre, descripcion, precio, categoria, inventario, compatible = self.valores(fila)
+            yield {"id": id, "nombre": nombre, "descripcion": descripcion, "precio": precio,
+                   "categoria": categoria, "inventario": inventario, "compatible_vehicles": compatible}
+
+    def cerrar(self):
+        """
+        Libera las vistas y el mapeo del archivo.
+        """
+        for vista in (self.ids_ordenados, self.filas_ordenadas, self.desplazamientos):
+            vista.release()
+        self.mapa.close()
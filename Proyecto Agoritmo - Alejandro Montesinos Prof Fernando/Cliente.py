@@ -9,6 +9,8 @@ class Cliente:
         telefono (str): Número telefónico del cliente.
     """
 
+    __slots__ = ("correo", "direccion", "telefono")
+
     def __init__(self, correo, direccion, telefono):
         """
         Constructor para inicializar un cliente con información básica.
@@ -12,6 +12,8 @@ class ClienteJuridico(Cliente):
         correo_contacto (str): Correo electrónico de la persona de contacto.
     """
 
+    __slots__ = ("razon_social", "rif", "nombre_contacto", "telf_contacto", "correo_contacto")
+
     def __init__(self, correo, direccion, telefono, razon_social, rif, nombre_contacto, telf_contacto, correo_contacto):
         """
         Constructor para inicializar un cliente jurídico. 
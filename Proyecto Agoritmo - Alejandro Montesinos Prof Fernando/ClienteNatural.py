@@ -9,6 +9,8 @@ class ClienteNatural(Cliente):
         cedula (str): Número de cédula del cliente.
     """
 
+    __slots__ = ("nombre", "cedula")
+
     def __init__(self, correo, direccion, telefono, nombre, cedula):
         """
         Inicializa un cliente natural con los datos generales heredados de Cliente,
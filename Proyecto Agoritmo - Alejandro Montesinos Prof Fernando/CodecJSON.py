@@ -0,0 +1,155 @@
+import json
+from functools import partial
+
+from lector_json import iterar_arreglo, trozos_archivo
+
+try:
+    import orjson
+except ImportError:  # orjson es opcional: sin él se usa el módulo json
+    orjson = None
+
+
+class CodecJSON:
+    """
+    Codificación de los archivos JSON de datos (clientes, productos y las particiones de
+    ventas, pagos y envíos).
+
+    Los registros se escriben uno a uno a medida que se generan, sin armar antes la lista
+    completa de diccionarios ni el texto completo del archivo. Hay dos modos:
+
+        "indentado": cada registro con sangría, legible a simple vista.
+        "compacto": sin sangría ni espacios, con los textos en UTF-8 sin escapar.
+
+    Si está instalado orjson, se usa para codificar y para decodificar las líneas de JSON
+    Lines; si no, el módulo json de la biblioteca estándar. Los dos leen los archivos
+    escritos por el otro. Los arreglos se leen siempre de forma incremental (ver
+    lector_json.py), con la memoria acotada por el registro más grande y no por el archivo:
+    orjson solo decodifica documentos completos.
+
+    También escribe y lee JSON Lines (un registro compacto por línea), el formato de
+    exportación del historial: se procesa línea por línea, sin leer el archivo completo,
+    y otro proceso puede seguirlo mientras se escribe.
+
+    Atributos:
+        modo (str): "indentado" o "compacto".
+        rapido (bool): True si se usa orjson.
+        nombre (str): Modo y biblioteca, para los reportes.
+        codificar (callable): Convierte un registro en bytes UTF-8.
+        separador (bytes): Se escribe entre dos registros.
+        codificar_linea (callable): Convierte un registro en una línea JSON compacta, en bytes.
+        decodificar (callable): Convierte un registro JSON (bytes o str) en su valor.
+    """
+
+    MODOS = ("indentado", "compacto")
+
+    def __init__(self, modo="indentado", rapido=True):
+        """
+        Args:
+            modo (str): "indentado" o "compacto".
+            rapido (bool): False para usar el módulo json aunque orjson esté instalado.
+
+        Raises:
+            ValueError: Si el modo no existe.
+        """
+        if modo not in self.MODOS:
+            raise ValueError(f"Modo de JSON desconocido: {modo!r}")
+        self.modo = modo
+        self.rapido = rapido and orjson is not None
+        self.nombre = f"{modo} ({'orjson' if self.rapido else 'json'})"
+        if self.rapido:
+            self.codificar = partial(orjson.dumps, option=orjson.OPT_INDENT_2 if modo == "indentado" else 0)
+        elif modo == "indentado":
+            self.codificar = partial(self._codificar_json, json.JSONEncoder(indent=4))
+        else:
+            self.codificar = partial(self._codificar_json, json.JSONEncoder(separators=(",", ":"), ensure_ascii=False))
+        self.separador = b",\n" if modo == "indentado" else b","
+        if self.rapido:
+            self.codificar_linea = orjson.dumps
+            self.decodificar = orjson.loads
+        else:
+            self.codificar_linea = partial(self._codificar_json, json.JSONEncoder(separators=(",", ":"), ensure_ascii=False))
+            self.decodificar = json.loads
+
+    @staticmethod
+    def _codificar_json(codificador, registro):
+        return codificador.encode(registro).encode("utf-8")
+
+    def escribir_arreglo(self, file, registros):
+        """
+        Escribe un arreglo JSON con los registros, codificándolos de a uno.
+
+        Args:
+            file (file): Archivo abierto en modo binario.
+            registros (iterable): Diccionarios a escribir.
+
+        Returns:
+            int: Bytes escritos.
+        """
+        codificar = self.codificar
+        escritos = file.write(b"[")
+        separador = b""
+        for registro in registros:
+            escritos += file.write(separador)
+            escritos += file.write(codificar(registro))
+            separador = self.separador
+        escritos += file.write(b"]")
+        return escritos
+
+    def leer_arreglo(self, ruta):
+        """
+        Genera los registros de un archivo con un arreglo JSON, leyéndolo de forma
+        incremental (ver lector_json.py) también con orjson, para no cargar el archivo
+        completo en memoria.
+
+        Args:
+            ruta (str): Archivo a leer.
+        """
+        yield from iterar_arreglo(trozos_archivo(ruta))
+
+    def escribir_lineas(self, file, registros, cada=1000):
+        """
+        Escribe los registros en formato JSON Lines, siempre compactos. Cada `cada` registros
+        se vacía el búfer, para que un proceso que sigue el archivo los reciba de a poco.
+
+        Args:
+            file (file): Archivo abierto en modo binario.
+            registros (iterable): Diccionarios a escribir.
+            cada (int): Registros entre dos vaciados del búfer.
+
+        Returns:
+            int: Bytes escritos.
+        """
+        codificar = self.codificar_linea
+        escritos = 0
+        for numero, registro in enumerate(registros, 1):
+            escritos += file.write(codificar(registro) + b"\n")
+            if numero % cada == 0:
+                file.flush()
+        file.flush()
+        return escritos
+
+    def leer_lineas(self, ruta):
+        """
+        Genera los registros de un archivo JSON Lines, leyéndolo línea por línea. Las líneas
+        vacías se saltan. Si la última línea no termina en salto de línea y no se puede
+        decodificar, se ignora: es un registro que otro proceso todavía está escribiendo.
+
+        Args:
+            ruta (str): Archivo a leer.
+
+        Raises:
+            ValueError: Si una línea completa no es JSON válido.
+        """
+        decodificar = self.decodificar
+        with open(ruta, "rb") as file:
+            for linea in file:
+                if not linea.strip():
+                    continue
+                if not linea.endswith(b"\n"):
+                    try:
+                        registro = decodificar(linea)
+                    except ValueError:
+                        return
+                    yield registro
+                    return
+                yield decodificar(linea)
@@ -0,0 +1,240 @@
+import math
+from decimal import Decimal, ROUND_HALF_UP
+from fractions import Fraction
+
+
+class Dinero:
+    """
+    Monto de dinero exacto, guardado como un entero de centavos.
+
+    Los precios, los montos de las ventas y los pagos usan este tipo en lugar de float:
+    sumar millones de montos da el resultado exacto al centavo y es más rápido que con
+    `Decimal`, porque cada operación es una suma de enteros.
+
+    Reglas de redondeo:
+        - Un número se convierte al centavo más cercano, y la mitad de un centavo se
+          redondea alejándose de cero (19.995 -> 20.00).
+        - Los porcentajes (descuento, IVA, IGTF) se calculan una sola vez sobre un monto
+          ya redondeado y se redondean al centavo con la misma regla (`porcentaje`).
+        - Un monto solo se multiplica por enteros (cantidades) y se divide en partes
+          exactas (`dividir`), así nunca aparecen fracciones de centavo.
+
+    En los archivos los montos se siguen guardando como números con dos decimales, y al
+    leerlos se convierten con `de`, que también corrige los montos guardados con float.
+
+    Las sumas y restas con int o float convierten el número con `de`, pero las
+    comparaciones son exactas: un monto es igual a un int, float o Decimal solo si vale
+    exactamente lo mismo (Dinero(1999) != 19.994, y tampoco es igual al float 19.99, que
+    no vale 19.99 exacto; se compara con Dinero.de(19.99)). Su hash es el de ese número,
+    así que montos iguales son la misma clave en un dict. El monto no se puede
+    modificar; cada operación devuelve un `Dinero` nuevo.
+
+    Atributos:
+        centavos (int): Monto en centavos (solo lectura).
+    """
+
+    __slots__ = ("_centavos",)
+
+    def __init__(self, centavos=0):
+        """
+        Args:
+            centavos (int): Monto en centavos.
+        """
+        self._centavos = centavos
+
+    @property
+    def centavos(self):
+        """
+        int: Monto en centavos. No tiene setter: un monto usado como clave de un dict
+        no puede cambiar de valor.
+        """
+        return self._centavos
+
+    @classmethod
+    def de(cls, valor):
+        """
+        Convierte un número o un texto en un monto, redondeando al centavo.
+
+        Args:
+            valor (Dinero | int | float | str): Monto a convertir. Un texto se convierte
+                de forma exacta ("19.995" -> 20.00).
+
+        Returns:
+            Dinero: El monto.
+
+        Raises:
+            ValueError: Si el texto no es un número.
+            TypeError: Si el valor no es un número.
+        """
+        if type(valor) is cls:
+            return valor
+        if type(valor) is int:
+            return cls(valor * 100)
+        if type(valor) is float:
+            # Los float guardados tienen dos decimales: valor * 100 queda a una fracción
+            # mínima de un entero, que se corrige al redondear
+            centavos = valor * 100
+            return cls(int(centavos + 0.5) if centavos >= 0 else -int(0.5 - centavos))
+        if isinstance(valor, str):
+            try:
+                return cls(int(Decimal(valor.strip()).scaleb(2).quantize(1, ROUND_HALF_UP)))
+            except ArithmeticError:
+                raise ValueError(f"Monto inválido: {valor!r}") from None
+        raise TypeError(f"No se puede convertir a Dinero: {valor!r}")
+
+    @staticmethod
+    def sumar(montos):
+        """
+        Suma montos de forma exacta, sumando directamente sus centavos.
+
+        Args:
+            montos (iterable): Objetos `Dinero`.
+
+        Returns:
+            Dinero: La suma.
+        """
+        return Dinero(sum(monto._centavos for monto in montos))
+
+    def porcentaje(self, tasa):
+        """
+        Devuelve el `tasa` por ciento del monto, redondeado al centavo (la mitad se
+        redondea alejándose de cero).
+
+        Args:
+            tasa (int): Porcentaje entero (16 para el IVA).
+
+        Returns:
+            Dinero: El porcentaje del monto.
+        """
+        centavos = self._centavos * tasa
+        if centavos >= 0:
+            return Dinero((centavos + 50) // 100)
+        return Dinero(-((50 - centavos) // 100))
+
+    def dividir(self, partes):
+        """
+        Divide el monto en `partes` montos que suman exactamente el original; los
+        centavos que sobran van a las primeras partes.
+
+        Args:
+            partes (int): Cantidad de partes.
+
+        Returns:
+            list: Montos de las partes.
+        """
+        cociente, resto = divmod(self._centavos, partes)
+        return [Dinero(cociente + 1 if i < resto else cociente) for i in range(partes)]
+
+    @staticmethod
+    def _centavos_de(otro):
+        """
+        Devuelve los centavos de otro monto o número para sumar o restar, redondeando al
+        centavo, o None si no se puede convertir.
+        """
+        if type(otro) is Dinero:
+            return otro._centavos
+        if type(otro) in (int, float):
+            return Dinero.de(otro)._centavos
+        return None
+
+    @staticmethod
+    def _centavos_exactos(otro):
+        """
+        Devuelve el valor exacto de otro monto o número en centavos para compararlo, sin
+        redondear (una fracción de centavo queda como `Fraction`), o None si no es un
+        número comparable.
+        """
+        if type(otro) is Dinero:
+            return otro._centavos
+        if type(otro) is int:
+            return otro * 100
+        if type(otro) in (float, Decimal):
+            # inf y nan no tienen fracción exacta, pero se comparan igual con un int
+            return Fraction(otro) * 100 if math.isfinite(otro) else float(otro)
+        return None
+
+    def __add__(self, otro):
+        centavos = self._centavos_de(otro)
+        if centavos is None:
+            return NotImplemented
+        return Dinero(self._centavos + centavos)
+
+    # sum() empieza sumando 0 + monto
+    __radd__ = __add__
+
+    def __sub__(self, otro):
+        centavos = self._centavos_de(otro)
+        if centavos is None:
+            return NotImplemented
+        return Dinero(self._centavos - centavos)
+
+    def __rsub__(self, otro):
+        centavos = self._centavos_de(otro)
+        if centavos is None:
+            return NotImplemented
+        return Dinero(centavos - self._centavos)
+
+    def __mul__(self, cantidad):
+        if type(cantidad) is not int:
+            return NotImplemented
+        return Dinero(self._centavos * cantidad)
+
+    __rmul__ = __mul__
+
+    def __neg__(self):
+        return Dinero(-self._centavos)
+
+    def __eq__(self, otro):
+        centavos = self._centavos_exactos(otro)
+        if centavos is None:
+            return NotImplemented
+        return self._centavos == centavos
+
+    def __lt__(self, otro):
+        centavos = self._centavos_exactos(otro)
+        if centavos is None:
+            return NotImplemented
+        return self._centavos < centavos
+
+    def __le__(self, otro):
+        centavos = self._centavos_exactos(otro)
+        if centavos is None:
+            return NotImplemented
+        return self._centavos <= centavos
+
+    def __gt__(self, otro):
+        centavos = self._centavos_exactos(otro)
+        if centavos is None:
+            return NotImplemented
+        return self._centavos > centavos
+
+    def __ge__(self, otro):
+        centavos = self._centavos_exactos(otro)
+        if centavos is None:
+            return NotImplemented
+        return self._centavos >= centavos
+
+    def __hash__(self):
+        # El mismo hash que el int, float o Decimal con igual valor exacto
+        if self._centavos % 100 == 0:
+            return hash(self._centavos // 100)
+        return hash(Fraction(self._centavos, 100))
+
+    def __bool__(self):
+        return self._centavos != 0
+
+    def __float__(self):
+        return self._centavos / 100
+
+    def __str__(self):
+        signo = "-" if self._centavos < 0 else ""
+        enteros, centavos = divmod(abs(self._centavos), 100)
+        return f"{signo}{enteros}.{centavos:02d}"
+
+    def __repr__(self):
+        return f"Dinero('{self}')"
+
+    def __format__(self, formato):
+        if not formato:
+            return str(self)
+        return format(float(self), formato)
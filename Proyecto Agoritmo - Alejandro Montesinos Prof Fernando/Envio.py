@@ -5,6 +5,7 @@ class Envio:
     Clase que representa el envío de una orden de compra a un cliente.
 
     Atributos:
+        id (int): Número del envío, asignado por el contador de la aplicación (`App.nuevo_id`).
         fecha_envio (str): Fecha en que se realiza el envío, formato YYYY-MM-DD.
         cliente (ClienteNatural | ClienteJuridico): Cliente asociado al envío.
         orden_compra (Venta): Orden de compra asociada al envío.
@@ -16,13 +17,21 @@ class Envio:
         estado (bool): Estado del envío (True si está completado, False si está pendiente).
     """
 
-    def __init__(self, cliente, orden_compra, servicio_envio, costo_servicio, nombre_motorizado, telefono_motorizado, placa_motorizado):
+    __slots__ = ("id", "fecha_envio", "cliente", "orden_compra", "servicio_envio", "costo_servicio",
+                 "nombre_motorizado", "telefono_motorizado", "placa_motorizado", "estado")
+
+    def __init__(self, cliente, orden_compra, servicio_envio, costo_servicio, nombre_motorizado, telefono_motorizado, placa_motorizado,
+                 fecha_envio=None, estado=False, id=None):
         """
         Inicializa los detalles de un envío, asignando datos del cliente, orden de compra, 
         servicio utilizado y motorizado en caso de que aplique. 
-        El estado del envío inicia como pendiente.
+        El estado del envío inicia como pendiente, y la fecha es la actual, salvo que se
+        indiquen las de un envío guardado.
         """
-        self.fecha_envio = datetime.now().strftime("%Y-%m-%d")
+        self.id = id
+        if fecha_envio is None:
+            fecha_envio = datetime.now().strftime("%Y-%m-%d")
+        self.fecha_envio = fecha_envio
         self.cliente = cliente
         self.orden_compra = orden_compra
         self.servicio_envio = servicio_envio
@@ -30,7 +39,7 @@ class Envio:
         self.nombre_motorizado = nombre_motorizado
         self.telefono_motorizado = telefono_motorizado
         self.placa_motorizado = placa_motorizado
-        self.estado = False
+        self.estado = estado
 
     def show_motorizado(self):
         """
@@ -0,0 +1,126 @@
+import threading
+
+
+class GuardadoAutomatico:
+    """
+    Hilo que guarda puntos de control de los datos en segundo plano, cada cierto tiempo o
+    después de cierta cantidad de cambios.
+
+    Un punto de control tiene dos partes. Primero, con el candado del registro de cambios
+    tomado, se copian los datos modificados (`App.capturar_datos`) y los cambios registrados
+    pasan al segmento anterior del registro (`RegistroCambios.punto_control`); es la única
+    pausa que puede notar el menú, y solo si registra un cambio en ese momento. Después, ya
+    sin el candado, la copia se serializa y se escribe en disco, y el segmento anterior se
+    descarta. Así el registro de cambios no crece durante toda la sesión y salir no requiere
+    un guardado largo.
+
+    Atributos:
+        app (App): Aplicación cuyos datos se guardan.
+        intervalo (float): Segundos máximos entre puntos de control, si hubo cambios.
+        cambios (int): Cambios registrados que adelantan el siguiente punto de control.
+        pendientes (int): Cambios registrados desde el último punto de control.
+        candado (threading.Lock): Protege `pendientes`, que cuentan el menú y las cajas
+            que registran ventas en paralelo.
+        despertar (threading.Event): Se activa para adelantar el punto de control o detener el hilo.
+        detenido (bool): True cuando se pidió detener el hilo.
+        hilo (threading.Thread | None): Hilo del guardado, o None si no se inició.
+        metricas (dict): "puntos_control", "errores", "ultimo_ms" y "maximo_ms" (duración
+            total), "pausa_ms" y "pausa_maxima_ms" (tiempo con el candado tomado),
+            "espera_maxima_ms" (mayor espera de un cambio por el candado) y "bytes" (último
+            punto de control).
+    """
+
+    def __init__(self, app, intervalo=300, cambios=500):
+        """
+        Args:
+            app (App): Aplicación cuyos datos se guardan.
+            intervalo (float): Segundos máximos entre puntos de control.
+            cambios (int): Cambios que adelantan el punto de control.
+        """
+        self.app = app
+        self.intervalo = intervalo
+        self.cambios = cambios
+        self.pendientes = 0
+        self.candado = threading.Lock()
+        self.despertar = threading.Event()
+        self.detenido = False
+        self.hilo = None
+        self.metricas = {"puntos_control": 0, "errores": 0, "ultimo_ms": 0.0, "maximo_ms": 0.0,
+                         "pausa_ms": 0.0, "pausa_maxima_ms": 0.0, "espera_maxima_ms": 0.0, "bytes": 0}
+
+    def iniciar(self):
+        """
+        Inicia el hilo del guardado.
+        """
+        self.hilo = threading.Thread(target=self._ejecutar, name="guardado-automatico", daemon=True)
+        self.hilo.start()
+
+    def notificar(self):
+        """
+        Cuenta un cambio registrado y, al llegar a `cambios`, adelanta el punto de control.
+        """
+        with self.candado:
+            self.pendientes += 1
+            adelantar = self.pendientes >= self.cambios
+        if adelantar:
+            self.despertar.set()
+
+    def _ejecutar(self):
+        while not self.detenido:
+            self.despertar.wait(self.intervalo)
+            self.despertar.clear()
+            if self.detenido:
+                break
+            # La carga del catálogo agrega miles de productos seguidos: se espera a que termine
+            self.app.catalogo_listo.wait()
+            if self.app.modificados and not self.detenido:
+                try:
+                    self.punto_control()
+                except Exception as error:
+                    # Los cambios siguen en el registro y quedan marcados para el siguiente intento
+                    self.metricas["errores"] += 1
+                    print(f"\nNo se pudo guardar el punto de control: {error}")
+
+    def punto_control(self):
+        """
+        Copia los datos modificados, pasa los cambios del registro a su segmento anterior y
+        escribe la copia; al terminar descarta ese segmento.
+
+        Returns:
+            dict: Reporte de `App.escribir_captura`.
+        """
+        registro = self.app.registro
+        with self.candado:
+            self.pendientes = 0
+        captura, pausa = registro.punto_control(self.app.capturar_datos)
+        reporte = self.app.escribir_captura(captura)
+        registro.descartar_anterior()
+
+        duracion = reporte["total"][1] * 1000
+        self.metricas["puntos_control"] += 1
+        self.metricas["ultimo_ms"] = duracion
+        self.metricas["maximo_ms"] = max(self.metricas["maximo_ms"], duracion)
+        self.metricas["pausa_ms"] = pausa * 1000
+        self.metricas["pausa_maxima_ms"] = max(self.metricas["pausa_maxima_ms"], pausa * 1000)
+        self.metricas["espera_maxima_ms"] = registro.espera_maxima * 1000
+        self.metricas["bytes"] = reporte["total"][0]
+        return reporte
+
+    def detener(self):
+        """
+        Detiene el hilo y espera a que termine el punto de control en curso, si lo hay.
+        """
+        self.detenido = True
+        self.despertar.set()
+        if self.hilo is not None:
+            self.hilo.join()
+
+    def resumen(self):
+        """
+        Devuelve una línea con las métricas de los puntos de control de la sesión.
+        """
+        metricas = self.metricas
+        return (f"Guardado automático: {metricas['puntos_control']} puntos de control, último en "
+                f"{metricas['ultimo_ms']:.0f} ms (máximo {metricas['maximo_ms']:.0f} ms), pausa máxima "
+                f"{metricas['pausa_maxima_ms']:.1f} ms, espera máxima de un cambio "
+                f"{metricas['espera_maxima_ms']:.1f} ms")
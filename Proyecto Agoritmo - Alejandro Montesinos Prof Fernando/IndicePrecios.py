@@ -0,0 +1,124 @@
+from bisect import bisect_left, bisect_right
+
+from Dinero import Dinero
+
+
+class IndicePrecios:
+    """
+    Índice de productos ordenado por precio.
+
+    Mantiene dos listas paralelas ordenadas por (precio, id): los precios, en centavos
+    enteros, y los productos.
+    Los rangos de precio se responden con búsqueda binaria y el listado ordenado por
+    precio se obtiene directamente del índice, sin volver a ordenar el catálogo.
+
+    Atributos:
+        precios (list): Precios indexados en centavos, en orden ascendente.
+        productos (list): Productos en el mismo orden que `precios`.
+        indexados (dict): Producto -> precio en centavos con el que fue indexado.
+    """
+
+    def __init__(self):
+        """
+        Inicializa el índice vacío.
+        """
+        self.precios = []
+        self.productos = []
+        self.indexados = {}
+
+    def construir(self, productos):
+        """
+        Reconstruye el índice completo a partir de una colección de productos.
+
+        Args:
+            productos (iterable): Productos a indexar.
+        """
+        ordenados = sorted(productos, key=lambda producto: (producto.precio.centavos, producto.id))
+        self.precios = [producto.precio.centavos for producto in ordenados]
+        self.productos = ordenados
+        self.indexados = dict(zip(ordenados, self.precios))
+
+    def _posicion(self, producto, precio):
+        """
+        Devuelve la posición de un producto dentro del índice, buscando entre los
+        productos que tienen su mismo precio.
+        """
+        inicio = bisect_left(self.precios, precio)
+        fin = bisect_right(self.precios, precio)
+        for i in range(inicio, fin):
+            if self.productos[i] is producto:
+                return i
+        return None
+
+    def agregar(self, producto):
+        """
+        Inserta un producto en su posición según el precio.
+
+        Args:
+            producto (Producto): Producto a indexar.
+        """
+        precio = producto.precio.centavos
+        inicio = bisect_left(self.precios, precio)
+        fin = bisect_right(self.precios, precio)
+        # Dentro de un mismo precio se conserva el orden por ID
+        i = inicio
+        while i < fin and self.productos[i].id <= producto.id:
+            i += 1
+        self.precios.insert(i, precio)
+        self.productos.insert(i, producto)
+        self.indexados[producto] = precio
+
+    def eliminar(self, producto):
+        """
+        Quita un producto del índice usando el precio con el que fue indexado.
+
+        Args:
+            producto (Producto): Producto a quitar.
+        """
+        precio = self.indexados.pop(producto, None)
+        if precio is None:
+            return
+        i = self._posicion(producto, precio)
+        if i is not None:
+            del self.precios[i]
+            del self.productos[i]
+
+    def actualizar(self, producto):
+        """
+        Reubica un producto después de modificar su precio.
+
+        Args:
+            producto (Producto): Producto modificado.
+        """
+        self.eliminar(producto)
+        self.agregar(producto)
+
+    def buscar_rango(self, precio_min, precio_max):
+        """
+        Devuelve los productos con precio entre `precio_min` y `precio_max` (inclusive).
+
+        Args:
+            precio_min (Dinero | float): Precio mínimo.
+            precio_max (Dinero | float): Precio máximo.
+
+        Returns:
+            list: Productos del rango, ordenados por precio.
+        """
+        precio_min, precio_max = Dinero.de(precio_min).centavos, Dinero.de(precio_max).centavos
+        inicio = bisect_left(self.precios, precio_min)
+        fin = bisect_right(self.precios, precio_max)
+        return self.productos[inicio:fin]
+
+    def ordenados(self, descendente=False):
+        """
+        Devuelve el catálogo ordenado por precio.
+
+        Args:
+            descendente (bool): True para listar del más caro al más barato.
+
+        Returns:
+            list: Productos ordenados por precio.
+        """
+        if descendente:
+            return self.productos[::-1]
+        return list(self.productos)
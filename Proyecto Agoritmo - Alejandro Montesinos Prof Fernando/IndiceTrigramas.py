@@ -0,0 +1,125 @@
+class IndiceTrigramas:
+    """
+    Índice invertido de trigramas sobre los nombres de los productos.
+
+    Cada nombre se normaliza a minúsculas y se descompone en todas sus subcadenas
+    de 3 caracteres. Para una búsqueda por subcadena solo se verifican los productos
+    que contienen todos los trigramas de la consulta, en lugar de recorrer el catálogo.
+
+    Atributos:
+        trigramas (dict): Trigrama -> conjunto de productos cuyo nombre lo contiene.
+        nombres (dict): Producto -> nombre normalizado con el que fue indexado.
+    """
+
+    def __init__(self):
+        """
+        Inicializa el índice vacío.
+        """
+        self.trigramas = {}
+        self.nombres = {}
+
+    @staticmethod
+    def normalizar(texto):
+        """
+        Normaliza un texto para indexarlo o buscarlo (sin diferenciar mayúsculas/minúsculas).
+        """
+        return texto.lower()
+
+    @staticmethod
+    def obtener_trigramas(texto):
+        """
+        Devuelve el conjunto de trigramas de un texto ya normalizado.
+        """
+        return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+    def construir(self, productos):
+        """
+        Reconstruye el índice completo a partir de una colección de productos.
+
+        Args:
+            productos (iterable): Productos a indexar.
+        """
+        self.trigramas = {}
+        self.nombres = {}
+        for producto in productos:
+            self.agregar(producto)
+
+    def agregar(self, producto):
+        """
+        Indexa el nombre de un producto.
+
+        Args:
+            producto (Producto): Producto a indexar.
+        """
+        nombre = self.normalizar(producto.nombre)
+        self.nombres[producto] = nombre
+        for trigrama in self.obtener_trigramas(nombre):
+            if trigrama not in self.trigramas:
+                self.trigramas[trigrama] = set()
+            self.trigramas[trigrama].add(producto)
+
+    def eliminar(self, producto):
+        """
+        Quita un producto del índice usando el nombre con el que fue indexado.
+
+        Args:
+            producto (Producto): Producto a quitar.
+        """
+        nombre = self.nombres.pop(producto, None)
+        if nombre is None:
+            return
+        for trigrama in self.obtener_trigramas(nombre):
+            productos = self.trigramas.get(trigrama)
+            if productos is not None:
+                productos.discard(producto)
+                if not productos:
+                    del self.trigramas[trigrama]
+
+    def actualizar(self, producto):
+        """
+        Reindexa un producto después de modificar su nombre.
+
+        Args:
+            producto (Producto): Producto modificado.
+        """
+        self.eliminar(producto)
+        self.agregar(producto)
+
+    def buscar(self, texto):
+        """
+        Busca los productos cuyo nombre contiene el texto indicado.
+
+        Se intersectan las listas de los trigramas de la consulta (empezando por la más
+        corta) y solo los candidatos resultantes se verifican con una comparación de subcadena.
+        Las consultas de menos de 3 caracteres no tienen trigramas y se verifican contra
+        todos los nombres indexados.
+
+        Args:
+            texto (str): Texto a buscar.
+
+        Returns:
+            list: Productos encontrados, ordenados por ID.
+        """
+        consulta = self.normalizar(texto)
+        trigramas = self.obtener_trigramas(consulta)
+
+        if trigramas:
+            listas = []
+            for trigrama in trigramas:
+                productos = self.trigramas.get(trigrama)
+                if not productos:  # Algún trigrama no aparece en ningún nombre
+                    return []
+                listas.append(productos)
+            listas.sort(key=len)
+
+            candidatos = set(listas[0])
+            for productos in listas[1:]:
+                candidatos &= productos
+                if not candidatos:
+                    return []
+        else:
+            candidatos = self.nombres.keys()
+
+        encontrados = [producto for producto in candidatos if consulta in self.nombres[producto]]
+        encontrados.sort(key=lambda producto: producto.id)
+        return encontrados
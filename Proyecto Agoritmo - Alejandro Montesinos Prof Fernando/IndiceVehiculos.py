@@ -0,0 +1,135 @@
+class IndiceVehiculos:
+    """
+    Índice inverso de compatibilidad: vehículo -> productos compatibles.
+
+    Los nombres de vehículos se normalizan (minúsculas y espacios simples), por lo que
+    entradas repetidas como "Nissan Sentra" y "nissan  sentra" colapsan en una sola clave.
+
+    Atributos:
+        vehiculos (dict): Nombre normalizado -> conjunto de productos compatibles.
+        nombres (dict): Nombre normalizado -> nombre tal como se registró la primera vez.
+        por_producto (dict): Producto -> conjunto de nombres normalizados indexados.
+    """
+
+    def __init__(self):
+        """
+        Inicializa el índice vacío.
+        """
+        self.vehiculos = {}
+        self.nombres = {}
+        self.por_producto = {}
+
+    @staticmethod
+    def normalizar(nombre):
+        """
+        Normaliza el nombre de un vehículo para compararlo sin diferenciar mayúsculas/minúsculas
+        ni espacios repetidos.
+        """
+        return " ".join(nombre.split()).lower()
+
+    def construir(self, productos):
+        """
+        Reconstruye el índice completo a partir de los vehículos compatibles de cada producto.
+
+        Args:
+            productos (iterable): Productos a indexar.
+        """
+        self.vehiculos = {}
+        self.nombres = {}
+        self.por_producto = {}
+        for producto in productos:
+            self.agregar(producto)
+
+    def agregar(self, producto):
+        """
+        Indexa todos los vehículos compatibles de un producto.
+
+        Args:
+            producto (Producto): Producto a indexar.
+        """
+        self.por_producto.setdefault(producto, set())
+        for vehiculo in producto.compatible:
+            self.agregar_vehiculo(producto, vehiculo)
+
+    def eliminar(self, producto):
+        """
+        Quita un producto de todas las entradas del índice.
+
+        Args:
+            producto (Producto): Producto a quitar.
+        """
+        for clave in self.por_producto.pop(producto, set()):
+            self._quitar(clave, producto)
+
+    def agregar_vehiculo(self, producto, vehiculo):
+        """
+        Registra que un producto es compatible con un vehículo.
+
+        Args:
+            producto (Producto): Producto compatible.
+            vehiculo (str): Nombre del vehículo.
+        """
+        clave = self.normalizar(vehiculo)
+        if clave not in self.vehiculos:
+            self.vehiculos[clave] = set()
+            self.nombres[clave] = vehiculo
+        self.vehiculos[clave].add(producto)
+        self.por_producto.setdefault(producto, set()).add(clave)
+
+    def eliminar_vehiculo(self, producto, vehiculo):
+        """
+        Quita la compatibilidad de un producto con un vehículo, siempre que no quede otra
+        entrada equivalente en su lista de compatibles.
+
+        Args:
+            producto (Producto): Producto modificado.
+            vehiculo (str): Nombre del vehículo eliminado de la lista.
+        """
+        clave = self.normalizar(vehiculo)
+        for restante in producto.compatible:
+            if self.normalizar(restante) == clave:
+                return
+        claves = self.por_producto.get(producto)
+        if claves is not None:
+            claves.discard(clave)
+        self._quitar(clave, producto)
+
+    def _quitar(self, clave, producto):
+        """
+        Quita un producto de la entrada de un vehículo y limpia la entrada si queda vacía.
+        """
+        productos = self.vehiculos.get(clave)
+        if productos is None:
+            return
+        productos.discard(producto)
+        if not productos:
+            del self.vehiculos[clave]
+            del self.nombres[clave]
+
+    def es_compatible(self, producto, vehiculo):
+        """
+        Verifica si un producto es compatible con un vehículo.
+
+        Returns:
+            bool: True si el vehículo está en la lista de compatibles del producto.
+        """
+        return self.normalizar(vehiculo) in self.por_producto.get(producto, ())
+
+    def buscar(self, vehiculo):
+        """
+        Devuelve los productos compatibles con un vehículo.
+
+        Args:
+            vehiculo (str): Nombre del vehículo.
+
+        Returns:
+            list: Productos compatibles, ordenados por ID.
+        """
+        productos = self.vehiculos.get(self.normalizar(vehiculo), ())
+        return sorted(productos, key=lambda producto: producto.id)
+
+    def listar_vehiculos(self):
+        """
+        Devuelve los nombres de todos los vehículos indexados, en orden alfabético.
+        """
+        return sorted(self.nombres.values(), key=str.lower)
@@ -0,0 +1,144 @@
+import threading
+from bisect import bisect_left, bisect_right
+from operator import attrgetter
+
+
+class IndiceVentas:
+    """
+    Índices secundarios de las ventas: por cliente y por fecha.
+
+    Las ventas no se eliminan ni cambian de fecha o cliente, así que los índices solo se
+    actualizan al agregar ventas: una a una al registrarlas (`App.agregar_elemento`) y en
+    lote al cargar una partición (`App.agregar_registros`).
+
+    Por cliente, cada cliente tiene la lista de sus ventas. Por fecha, se mantienen dos
+    listas paralelas ordenadas por (día, id): los días ("AAAA-MM-DD") y las ventas. Un
+    rango de fechas se responde con dos búsquedas binarias sobre los días, sin recorrer el
+    historial. Las ventas suelen llegar en orden de fecha, así que casi siempre se agregan
+    al final de las listas.
+
+    Atributos:
+        por_cliente (dict): Cliente -> ventas del cliente, ordenadas por ID.
+        dias (list): Día de cada venta, en orden ascendente.
+        ventas (list): Ventas en el mismo orden que `dias`.
+        candado (threading.Lock): Protege los índices de las ventas que registran varias
+            cajas a la vez (ver `MotorVentas`).
+    """
+
+    def __init__(self):
+        """
+        Inicializa los índices vacíos.
+        """
+        self.por_cliente = {}
+        self.dias = []
+        self.ventas = []
+        self.candado = threading.Lock()
+
+    @staticmethod
+    def dia(fecha):
+        """
+        Devuelve el día ("AAAA-MM-DD") de una fecha "AAAA-MM-DD[ HH:MM:SS]".
+        """
+        return fecha.split(" ")[0] if fecha else ""
+
+    @staticmethod
+    def _posicion(lista, inicio, fin, venta):
+        """
+        Devuelve dónde insertar una venta en el tramo `lista[inicio:fin]`, ordenado por ID,
+        con búsqueda binaria. Primero se revisa el final, donde suele ir.
+        """
+        if fin == inicio or lista[fin - 1].id < venta.id:
+            return fin
+        while inicio < fin:
+            medio = (inicio + fin) // 2
+            if lista[medio].id < venta.id:
+                inicio = medio + 1
+            else:
+                fin = medio
+        return inicio
+
+    def _indice(self, dia, venta):
+        """
+        Devuelve dónde insertar una venta en las listas por fecha: dentro de su día, en
+        orden de ID.
+        """
+        if not self.dias or self.dias[-1] < dia or (self.dias[-1] == dia and self.ventas[-1].id < venta.id):
+            return len(self.dias)
+        return self._posicion(self.ventas, bisect_left(self.dias, dia), bisect_right(self.dias, dia), venta)
+
+    def agregar(self, venta):
+        """
+        Indexa una venta por su cliente y por su día.
+
+        Args:
+            venta (Venta): Venta a indexar.
+        """
+        dia = self.dia(venta.fecha)
+        with self.candado:
+            ventas_cliente = self.por_cliente.setdefault(venta.cliente, [])
+            ventas_cliente.insert(self._posicion(ventas_cliente, 0, len(ventas_cliente), venta), venta)
+
+            i = self._indice(dia, venta)
+            self.dias.insert(i, dia)
+            self.ventas.insert(i, venta)
+
+    def agregar_lote(self, ventas):
+        """
+        Indexa muchas ventas a la vez, como las de un mes que se carga después de otros más
+        recientes. Insertarlas una a una en medio de las listas movería cada vez todo lo que
+        está después; en cambio se ordenan entre sí y se insertan de una sola vez en su
+        posición. Solo si se intercalan con ventas ya indexadas se mezcla ese tramo.
+
+        Args:
+            ventas (iterable): Ventas a indexar.
+        """
+        nuevas = sorted(((self.dia(venta.fecha), venta) for venta in ventas),
+                        key=lambda par: (par[0], par[1].id))
+        if not nuevas:
+            return
+        with self.candado:
+            desordenados = set()
+            for _, venta in nuevas:
+                ventas_cliente = self.por_cliente.setdefault(venta.cliente, [])
+                if ventas_cliente and ventas_cliente[-1].id > venta.id:
+                    desordenados.add(venta.cliente)
+                ventas_cliente.append(venta)
+            for cliente in desordenados:
+                self.por_cliente[cliente].sort(key=attrgetter("id"))
+
+            inicio = self._indice(*nuevas[0])
+            fin = self._indice(*nuevas[-1])
+            if inicio < fin:
+                nuevas = sorted(list(zip(self.dias[inicio:fin], self.ventas[inicio:fin])) + nuevas,
+                                key=lambda par: (par[0], par[1].id))
+            self.dias[inicio:fin] = [dia for dia, _ in nuevas]
+            self.ventas[inicio:fin] = [venta for _, venta in nuevas]
+
+    def de_cliente(self, cliente):
+        """
+        Devuelve las ventas de un cliente, ordenadas por ID.
+
+        Args:
+            cliente (ClienteNatural | ClienteJuridico): Cliente buscado.
+
+        Returns:
+            list: Ventas del cliente.
+        """
+        with self.candado:
+            return list(self.por_cliente.get(cliente, ()))
+
+    def periodo(self, desde, hasta):
+        """
+        Devuelve las ventas entre dos días (inclusive), con búsqueda binaria.
+
+        Args:
+            desde (str): Día inicial ("AAAA-MM-DD").
+            hasta (str): Día final ("AAAA-MM-DD").
+
+        Returns:
+            list: Ventas del periodo, ordenadas por día y, dentro de un día, por ID.
+        """
+        with self.candado:
+            inicio = bisect_left(self.dias, desde)
+            fin = bisect_right(self.dias, hasta)
+            return self.ventas[inicio:fin]
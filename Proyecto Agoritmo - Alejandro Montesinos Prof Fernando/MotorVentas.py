@@ -0,0 +1,336 @@
+import csv
+import threading
+import time
+from datetime import datetime, timedelta
+
+from ClienteJuridico import ClienteJuridico
+from Dinero import Dinero
+from Venta import Venta
+from Pago import Pago
+from Envio import Envio
+
+# Tipo de pago -> moneda
+TIPOS_PAGO = {
+    "Punto de Venta": "Bolívares",
+    "Pago móvil": "Bolívares",
+    "Transferencia": "Bolívares",
+    "Zelle": "USD",
+    "PayPal": "USD",
+    "Efectivo": "USD",
+}
+METODOS_ENVIO = ("Zoom", "Delivery")
+DIAS_CREDITO = (15, 30)
+
+# Porcentajes enteros, aplicados con `Dinero.porcentaje`
+DESCUENTO_CONTADO_JURIDICO = 5
+IVA = 16
+IGTF = 3
+
+
+class MotorVentas:
+    """
+    Registro de ventas sin interacción: recibe la descripción de un carrito y hace lo mismo
+    que la opción "Registrar venta" del menú (descontar el inventario, calcular descuento,
+    IVA e IGTF, crear los pagos y el envío y registrar los cambios), sin pedir datos por
+    consola. Lo usan el menú y la carga de pedidos por lotes desde archivos JSON Lines o CSV.
+
+    Un pedido es un diccionario con:
+        cliente (str): Cédula o RIF del cliente.
+        productos (list | dict): Lista de {"id", "cantidad"} o diccionario ID -> cantidad.
+        tipo_pago (str): Una de las claves de `TIPOS_PAGO`.
+        metodo_envio (str): "Zoom" o "Delivery".
+        metodo_pago (str): "Contado" (por defecto) o "Crédito" (solo clientes jurídicos).
+        dias (int): Plazo del segundo pago de un crédito, 15 o 30.
+
+    En CSV, los productos van en una columna con el formato "ID:cantidad;ID:cantidad".
+
+    Varias cajas (hilos) pueden registrar ventas en paralelo sobre la misma aplicación. No
+    hay un candado global: el inventario de cada producto tiene su propio candado, que se
+    toma solo mientras se descuenta (`reservar`), y las ventas de un mismo cliente se
+    registran de a una, para que dos no pasen a la vez la revisión de pagos pendientes.
+    Los IDs los asigna `App.nuevo_id`, que es atómico. Quien cambie el inventario fuera de
+    una venta (la sincronización del catálogo, el registro de cambios o el menú) toma el
+    mismo candado con `candado_producto`.
+
+    Atributos:
+        app (App): Aplicación cuyos datos se modifican.
+        candados_productos (dict): ID de producto -> candado de su inventario.
+        candados_clientes (dict): Cédula o RIF -> candado de las ventas del cliente.
+    """
+
+    def __init__(self, app):
+        """
+        Args:
+            app (App): Aplicación cuyos datos se modifican.
+        """
+        self.app = app
+        self.candados_productos = {}
+        self.candados_clientes = {}
+
+    @staticmethod
+    def candado(candados, clave):
+        """
+        Devuelve el candado de `clave`, creándolo la primera vez. `dict.setdefault` es
+        atómico, así que dos hilos nunca reciben candados distintos para la misma clave.
+        """
+        return candados.setdefault(clave, threading.Lock())
+
+    def candado_producto(self, producto):
+        """
+        Devuelve el candado del inventario de un producto, el mismo que toma `reservar`.
+        Se usa con `with` alrededor de cualquier otro cambio del inventario y de su registro
+        en el registro de cambios, para no perder unidades descontadas por una venta
+        simultánea ni registrar los inventarios en otro orden.
+
+        Args:
+            producto (Producto): Producto cuyo inventario se va a cambiar.
+        """
+        return self.candado(self.candados_productos, producto.id)
+
+    @staticmethod
+    def calcular_montos(subtotal, juridico, metodo_pago, moneda):
+        """
+        Calcula los montos de una venta: 5% de descuento a clientes jurídicos que pagan de
+        contado, 16% de IVA y 3% de IGTF si se paga en dólares.
+
+        Cada porcentaje se redondea al centavo una sola vez: el descuento sobre el subtotal,
+        el IVA sobre el subtotal con descuento y el IGTF sobre el total. Así el total es
+        exactamente subtotal - descuento + IVA.
+
+        Args:
+            subtotal (Dinero): Suma de los precios por las cantidades.
+
+        Returns:
+            tuple: (descuento, iva, igtf, total), como `Dinero`.
+        """
+        descuento = Dinero()
+        if juridico and metodo_pago == "Contado":
+            descuento = subtotal.porcentaje(DESCUENTO_CONTADO_JURIDICO)
+        base = subtotal - descuento
+        iva = base.porcentaje(IVA)
+        total = base + iva
+        igtf = Dinero()
+        if moneda == "USD":
+            igtf = total.porcentaje(IGTF)
+        return descuento, iva, igtf, total
+
+    def validar_venta(self, cliente, productos, tipo_pago, metodo_envio, metodo_pago, dias):
+        """
+        Revisa que una venta se pueda registrar, sin modificar nada. El inventario se revisa
+        al reservarlo (`reservar`).
+
+        Raises:
+            ValueError: Si el cliente tiene un pago pendiente, el carrito está vacío o alguna
+                opción no existe.
+        """
+        pendiente = self.app.pago_pendiente(cliente)
+        if pendiente is not None:
+            raise ValueError(f"El cliente tiene el pago pendiente {pendiente.id}.")
+        if not productos:
+            raise ValueError("El carrito está vacío.")
+        for producto, cantidad in productos.items():
+            if not isinstance(cantidad, int) or cantidad <= 0:
+                raise ValueError(f"Cantidad inválida del producto {producto.id}: {cantidad!r}.")
+        if tipo_pago not in TIPOS_PAGO:
+            raise ValueError(f"Tipo de pago desconocido: {tipo_pago!r}.")
+        if metodo_envio not in METODOS_ENVIO:
+            raise ValueError(f"Método de envío desconocido: {metodo_envio!r}.")
+        if metodo_pago == "Crédito":
+            if not isinstance(cliente, ClienteJuridico):
+                raise ValueError("Solo los clientes jurídicos pueden comprar a crédito.")
+            if dias not in DIAS_CREDITO:
+                raise ValueError(f"El plazo del crédito debe ser de 15 o 30 días, no {dias!r}.")
+        elif metodo_pago != "Contado":
+            raise ValueError(f"Método de pago desconocido: {metodo_pago!r}.")
+
+    def registrar_venta(self, cliente, productos, tipo_pago, metodo_envio, metodo_pago="Contado", dias=None,
+                        sincronizar=True):
+        """
+        Registra una venta con sus pagos y su envío. Todo se valida antes de modificar los
+        datos, así que una venta rechazada no deja cambios.
+
+        Con "Contado" se crea un pago completado por el total. Con "Crédito" se paga la mitad
+        (más el IGTF de esa mitad si es en dólares) y se crea un pago pendiente por la otra
+        mitad, con fecha límite dentro de `dias` días.
+
+        Args:
+            cliente (ClienteNatural | ClienteJuridico): Cliente que compra.
+            productos (dict): Producto -> cantidad.
+            tipo_pago (str): Una de las claves de `TIPOS_PAGO`.
+            metodo_envio (str): "Zoom" o "Delivery".
+            metodo_pago (str): "Contado" o "Crédito".
+            dias (int | None): Plazo del segundo pago de un crédito.
+            sincronizar (bool): False para agrupar los cambios de varias ventas y
+                sincronizarlos juntos con `repositorio.sincronizar()`.
+
+        Returns:
+            tuple: (Venta, lista de Pago, Envio).
+
+        Raises:
+            ValueError: Si la venta no se puede registrar (ver `validar_venta` y `reservar`).
+        """
+        app = self.app
+        moneda = TIPOS_PAGO.get(tipo_pago)
+        cliente_id = app.clave_cliente(cliente)
+        with self.candado(self.candados_clientes, cliente_id):
+            self.validar_venta(cliente, productos, tipo_pago, metodo_envio, metodo_pago, dias)
+            venta = self.reservar(cliente, productos, metodo_pago, metodo_envio, moneda)
+
+            if metodo_pago == "Crédito":
+                # Las dos mitades suman exactamente el total; el centavo impar va en la primera
+                inicial, restante = venta.total.dividir(2)
+                if moneda == "USD":
+                    inicial += inicial.porcentaje(IGTF)
+                pagos = [Pago(cliente, venta, inicial, tipo_pago, moneda, estado=True, id=app.nuevo_id("pagos"))]
+                pendiente = Pago(cliente, venta, restante, None, None, id=app.nuevo_id("pagos"))
+                # Fecha límite del pago pendiente
+                limite = datetime.strptime(pendiente.fecha, "%Y-%m-%d %H:%M:%S") + timedelta(days=dias)
+                pendiente.fecha = limite.strftime("%Y-%m-%d %H:%M:%S")
+                pagos.append(pendiente)
+            else:
+                pagos = [Pago(cliente, venta, venta.total, tipo_pago, moneda, estado=True, id=app.nuevo_id("pagos"))]
+            for pago in pagos:
+                app.agregar_elemento("pagos", pago)
+                app.registrar_cambio("pago", app.serializar_pago(pago), False)
+
+        envio = Envio(cliente, venta, metodo_envio, None, None, None, None, id=app.nuevo_id("envios"))
+        app.agregar_elemento("envios", envio)
+        app.registrar_cambio("envio", app.serializar_envio(envio), False)
+        if sincronizar:
+            app.repositorio.sincronizar()
+        return venta, pagos, envio
+
+    def reservar(self, cliente, productos, metodo_pago, metodo_envio, moneda):
+        """
+        Descuenta del inventario las cantidades del carrito y registra la venta, con los
+        candados de sus productos tomados. Los candados se toman en orden de ID, así dos
+        ventas con productos en común nunca se esperan mutuamente. El cambio de la venta se
+        agrega al registro antes de soltarlos, para que los inventarios del registro queden
+        en el mismo orden en que cambiaron.
+
+        Returns:
+            Venta: Venta registrada.
+
+        Raises:
+            ValueError: Si falta inventario de algún producto; en ese caso no se descuenta ninguno.
+        """
+        app = self.app
+        candados = [self.candado(self.candados_productos, producto.id)
+                    for producto in sorted(productos, key=lambda producto: producto.id)]
+        for candado in candados:
+            candado.acquire()
+        try:
+            for producto, cantidad in productos.items():
+                if cantidad > producto.inventario:
+                    raise ValueError(f"No hay inventario suficiente de {producto.nombre} "
+                                     f"({producto.inventario} disponibles, {cantidad} pedidos).")
+            subtotal = Dinero()
+            for producto, cantidad in productos.items():
+                producto.inventario -= cantidad
+                subtotal += producto.precio * cantidad
+            descuento, iva, igtf, total = self.calcular_montos(subtotal, isinstance(cliente, ClienteJuridico),
+                                                               metodo_pago, moneda)
+            venta = Venta(app.nuevo_id("ventas"), datetime.now().strftime("%Y-%m-%d"), cliente, dict(productos),
+                          metodo_pago, metodo_envio, subtotal, descuento, iva, igtf, total)
+            app.agregar_elemento("ventas", venta)
+            app.registrar_cambio("venta", {
+                **app.serializar_venta(venta),
+                "inventarios": [[producto.id, producto.inventario] for producto in productos]
+            }, False)
+        finally:
+            for candado in reversed(candados):
+                candado.release()
+        return venta
+
+    def resolver_pedido(self, pedido):
+        """
+        Convierte un pedido (ver la descripción de la clase) en los argumentos de
+        `registrar_venta`, buscando el cliente por cédula o RIF y los productos por ID.
+
+        Raises:
+            ValueError: Si el cliente o algún producto no existe, o falta un campo.
+        """
+        app = self.app
+        identificacion = str(pedido.get("cliente", ""))
+        cliente = app.clientes_por_cedula.get(identificacion) or app.clientes_por_rif.get(identificacion)
+        if cliente is None:
+            raise ValueError(f"No existe el cliente {identificacion!r}.")
+
+        lineas = pedido.get("productos") or ()
+        if isinstance(lineas, dict):
+            lineas = [{"id": id, "cantidad": cantidad} for id, cantidad in lineas.items()]
+        productos = {}
+        for linea in lineas:
+            producto = app.productos_por_id.get(int(linea["id"]))
+            if producto is None:
+                raise ValueError(f"No existe el producto {linea['id']}.")
+            productos[producto] = productos.get(producto, 0) + int(linea["cantidad"])
+
+        for campo in ("tipo_pago", "metodo_envio"):
+            if not pedido.get(campo):
+                raise ValueError(f"Falta el campo {campo!r}.")
+        dias = pedido.get("dias")
+        return {"cliente": cliente, "productos": productos, "tipo_pago": pedido["tipo_pago"],
+                "metodo_envio": pedido["metodo_envio"], "metodo_pago": pedido.get("metodo_pago") or "Contado",
+                "dias": int(dias) if dias not in (None, "") else None}
+
+    def procesar_pedido(self, pedido, sincronizar=True):
+        """
+        Registra la venta de un pedido.
+
+        Returns:
+            tuple: (Venta, lista de Pago, Envio).
+
+        Raises:
+            ValueError: Si el pedido no es válido o la venta no se puede registrar.
+        """
+        return self.registrar_venta(**self.resolver_pedido(pedido), sincronizar=sincronizar)
+
+    def leer_pedidos(self, ruta):
+        """
+        Genera los pedidos de un archivo JSON Lines (un pedido por línea) o CSV (si la ruta
+        termina en ".csv", con encabezados), leyéndolo de a uno.
+        """
+        if not ruta.lower().endswith(".csv"):
+            yield from self.app.codec_json.leer_lineas(ruta)
+            return
+        with open(ruta, newline="", encoding="utf-8") as file:
+            for fila in csv.DictReader(file):
+                lineas = []
+                for parte in (fila.get("productos") or "").split(";"):
+                    if parte.strip():
+                        id, _, cantidad = parte.partition(":")
+                        lineas.append({"id": id, "cantidad": cantidad or 1})
+                yield {**fila, "productos": lineas}
+
+    def procesar_lote(self, ruta, cada=500):
+        """
+        Registra las ventas de todos los pedidos de un archivo. Los pedidos inválidos se
+        rechazan sin detener el lote. Los cambios se sincronizan a disco cada `cada` pedidos
+        y al final, en vez de uno por uno.
+
+        Args:
+            ruta (str): Archivo JSON Lines o CSV con los pedidos.
+            cada (int): Pedidos entre dos sincronizaciones del registro de cambios.
+
+        Returns:
+            dict: "pedidos" (leídos), "ventas" (registradas), "rechazados" (lista de
+            (número de pedido, motivo)) y "segundos".
+        """
+        resumen = {"pedidos": 0, "ventas": 0, "rechazados": [], "segundos": 0.0}
+        inicio = time.perf_counter()
+        try:
+            for numero, pedido in enumerate(self.leer_pedidos(ruta), 1):
+                resumen["pedidos"] = numero
+                try:
+                    self.procesar_pedido(pedido, sincronizar=False)
+                except (ValueError, KeyError, TypeError) as error:
+                    resumen["rechazados"].append((numero, str(error)))
+                    continue
+                resumen["ventas"] += 1
+                if resumen["ventas"] % cada == 0:
+                    self.app.repositorio.sincronizar()
+        finally:
+            self.app.repositorio.sincronizar()
+        resumen["segundos"] = time.perf_counter() - inicio
+        return resumen
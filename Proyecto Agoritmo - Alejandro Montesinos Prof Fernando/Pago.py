@@ -6,33 +6,42 @@ class Pago:
     Clase que representa un pago asociado a una venta en el sistema.
 
     Atributos:
+        id (int): Número del pago, asignado por el contador de la aplicación (`App.nuevo_id`).
         fecha (str): Fecha y hora en que se realizó el pago.
         cliente (ClienteNatural | ClienteJuridico): Cliente asociado al pago.
         venta (Venta): Venta asociada al pago.
-        monto_pago (float): Monto del pago realizado.
+        monto_pago (Dinero): Monto del pago realizado.
         metodo_pago (str): Método utilizado para realizar el pago (ej. Tarjeta, Efectivo).
         moneda_pago (str): Moneda en la que se realizó el pago.
         estado (bool): Estado del pago (True si está completado, False si está pendiente).
     """
 
-    def __init__(self, cliente, venta, monto_pago, metodo_pago, moneda_pago):
+    __slots__ = ("id", "fecha", "cliente", "venta", "monto_pago", "metodo_pago", "moneda_pago", "estado")
+
+    def __init__(self, cliente, venta, monto_pago, metodo_pago, moneda_pago, fecha=None, estado=False, id=None):
         """
         Inicializa los detalles de un pago.
 
         Args:
             cliente (ClienteNatural | ClienteJuridico): Cliente que realiza el pago.
             venta (Venta): Objeto de la venta asociada.
-            monto_pago (float): Monto total del pago.
+            monto_pago (Dinero): Monto total del pago.
             metodo_pago (str): Método de pago utilizado.
             moneda_pago (str): Moneda del pago.
+            fecha (str): Fecha y hora del pago; por defecto, la actual.
+            estado (bool): Estado del pago; por defecto, pendiente.
+            id (int): Número del pago.
         """
-        self.fecha = datetime.now().strftime("%Y-%m-%d %H:%M:%S")  # Fecha y hora actual en formato legible
+        self.id = id
+        if fecha is None:
+            fecha = datetime.now().strftime("%Y-%m-%d %H:%M:%S")  # Fecha y hora actual en formato legible
+        self.fecha = fecha
         self.cliente = cliente 
         self.venta = venta 
         self.monto_pago = monto_pago 
         self.metodo_pago = metodo_pago  
         self.moneda_pago = moneda_pago  
-        self.estado = False  # Estado inicial del pago (pendiente)
+        self.estado = estado  # Estado inicial del pago (pendiente salvo que se restaure uno guardado)
 
     def show_client(self):
         """
@@ -0,0 +1,165 @@
+import json
+import os
+from datetime import datetime
+
+# Partición de los registros sin fecha
+SIN_FECHA = "sin_fecha"
+
+
+class ParticionesMensuales:
+    """
+    Archivos JSON de una colección divididos por mes (por ejemplo `ventas/2024-11.json`),
+    con un manifiesto que resume cada partición.
+
+    El manifiesto (`manifiesto.json`) guarda, por mes, el archivo, la cantidad de registros,
+    el menor y el mayor ID y cuántos registros están pendientes (estado False). Con él se
+    puede decidir qué particiones abrir sin leerlas: las de un rango de fechas, la que
+    contiene un ID o las que tienen pagos o envíos pendientes.
+
+    Atributos:
+        directorio (str): Carpeta de la colección.
+        ruta_manifiesto (str): Archivo del manifiesto.
+        particiones (dict): Mes ("AAAA-MM") -> resumen de la partición.
+        cargadas (set): Meses cuyas particiones ya se leyeron.
+        codec (CodecJSON): Codificación con la que se leen las particiones.
+    """
+
+    def __init__(self, directorio, codec):
+        """
+        Args:
+            directorio (str): Carpeta de la colección (por ejemplo "ventas").
+            codec (CodecJSON): Codificación de los archivos de datos.
+        """
+        self.directorio = directorio
+        self.codec = codec
+        self.ruta_manifiesto = os.path.join(directorio, "manifiesto.json")
+        self.particiones = {}
+        self.cargadas = set()
+
+    @staticmethod
+    def mes_de(fecha):
+        """
+        Devuelve el mes ("AAAA-MM") de una fecha "AAAA-MM-DD[ HH:MM:SS]", o `SIN_FECHA`.
+        """
+        return fecha[:7] if fecha else SIN_FECHA
+
+    @staticmethod
+    def mes_anterior(meses, hoy=None):
+        """
+        Devuelve el mes que está `meses` meses antes del actual (o de `hoy`).
+        """
+        hoy = hoy or datetime.now()
+        indice = hoy.year * 12 + hoy.month - 1 - meses
+        return f"{indice // 12:04d}-{indice % 12 + 1:02d}"
+
+    def existe(self):
+        """
+        Indica si la colección ya está guardada por meses.
+        """
+        return os.path.exists(self.ruta_manifiesto)
+
+    def abrir(self):
+        """
+        Lee el manifiesto, si existe.
+
+        Returns:
+            bool: True si la colección está guardada por meses.
+        """
+        if not self.existe():
+            return False
+        with open(self.ruta_manifiesto) as file:
+            self.particiones = json.load(file)["particiones"]
+        self.cargadas = set()
+        return True
+
+    def ruta(self, mes):
+        """
+        Devuelve la ruta del archivo de la partición de un mes.
+        """
+        return os.path.join(self.directorio, f"{mes}.json")
+
+    def leer(self, mes):
+        """
+        Genera los registros de la partición de un mes y la marca como cargada.
+        """
+        self.cargadas.add(mes)
+        yield from self.registros(mes)
+
+    def registros(self, mes):
+        """
+        Genera los registros de la partición de un mes sin marcarla como cargada.
+        """
+        ruta = self.ruta(mes)
+        if os.path.exists(ruta):
+            yield from self.codec.leer_arreglo(ruta)
+
+    def sin_cargar(self, meses=None):
+        """
+        Devuelve, en orden, los meses del manifiesto (o de `meses`) que todavía no se leyeron.
+        """
+        meses = self.particiones if meses is None else meses
+        return sorted(mes for mes in meses if mes in self.particiones and mes not in self.cargadas)
+
+    def meses_en_rango(self, desde, hasta):
+        """
+        Devuelve los meses del manifiesto entre los de las fechas `desde` y `hasta` (inclusive).
+        """
+        desde, hasta = self.mes_de(desde), self.mes_de(hasta)
+        return sorted(mes for mes in self.particiones if mes != SIN_FECHA and desde <= mes <= hasta)
+
+    def meses_de_id(self, id):
+        """
+        Devuelve los meses cuyo rango de IDs incluye `id`.
+        """
+        return sorted(mes for mes, resumen in self.particiones.items()
+                      if resumen["id_min"] <= id <= resumen["id_max"])
+
+    def meses_iniciales(self, desde):
+        """
+        Devuelve los meses que se cargan al iniciar: desde el mes `desde` en adelante, los
+        que tienen registros pendientes y los registros sin fecha.
+        """
+        return sorted(mes for mes, resumen in self.particiones.items()
+                      if mes == SIN_FECHA or mes >= desde or resumen["pendientes"])
+
+    def id_maximo(self):
+        """
+        Devuelve el mayor ID guardado, o -1 si no hay particiones.
+        """
+        return max((resumen["id_max"] for resumen in self.particiones.values()), default=-1)
+
+    def actualizar(self, mes, elementos):
+        """
+        Actualiza el resumen de la partición de un mes a partir de sus elementos. Si quedó
+        vacía se quita del manifiesto y se borra su archivo.
+
+        Args:
+            mes (str): Mes de la partición.
+            elementos (list): Ventas, pagos o envíos de la partición.
+        """
+        if not elementos:
+            self.particiones.pop(mes, None)
+            if os.path.exists(self.ruta(mes)):
+                os.remove(self.ruta(mes))
+            return
+        ids = [elemento.id for elemento in elementos]
+        self.particiones[mes] = {
+            "archivo": os.path.basename(self.ruta(mes)),
+            "cantidad": len(elementos),
+            "id_min": min(ids),
+            "id_max": max(ids),
+            "pendientes": sum(getattr(elemento, "estado", True) is False for elemento in elementos),
+        }
+        self.cargadas.add(mes)
+
+    def guardar_manifiesto(self):
+        """
+        Escribe el manifiesto en un archivo temporal y lo reemplaza de una sola vez.
+        Se llama después de escribir las particiones, para que nunca apunte a un archivo
+        que todavía no existe.
+        """
+        with open(self.ruta_manifiesto + ".tmp", "w") as file:
+            json.dump({"particiones": dict(sorted(self.particiones.items()))}, file, indent=4)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(self.ruta_manifiesto + ".tmp", self.ruta_manifiesto)
@@ -0,0 +1,203 @@
+from array import array
+
+from ClienteJuridico import ClienteJuridico
+from Dinero import Dinero
+from MotorVentas import DESCUENTO_CONTADO_JURIDICO, IVA, IGTF
+
+try:
+    import numpy
+except ImportError:  # numpy es opcional: sin él se calcula carrito por carrito
+    numpy = None
+
+MONTOS = ("subtotal", "descuento", "iva", "igtf", "total")
+
+
+class PreciosLote:
+    """
+    Cálculo de los montos de muchos carritos a la vez, para recotizar un día de pedidos o
+    simular un cambio de tasas sobre el historial de ventas.
+
+    Los carritos se reciben por columnas: una fila por línea (carrito, producto y cantidad)
+    y una fila por carrito (tipo de cliente, método de pago y moneda). Con numpy instalado
+    todas las operaciones se hacen sobre arreglos de centavos enteros (int64), sin recorrer
+    los carritos en Python; sin numpy se recorren uno por uno.
+
+    Las reglas son las de `MotorVentas.calcular_montos` y el redondeo el de
+    `Dinero.porcentaje`, así que los montos son idénticos a los de una venta registrada
+    con las mismas tasas.
+
+    Atributos:
+        store (ProductStore): Catálogo del que se toman los precios.
+        descuento (int): Porcentaje de descuento a jurídicos que pagan de contado.
+        iva (int): Porcentaje de IVA.
+        igtf (int): Porcentaje de IGTF de los pagos en dólares.
+        vectorizado (bool): True si se usa numpy.
+        nombre (str): Forma de cálculo, para los reportes.
+    """
+
+    def __init__(self, store, descuento=DESCUENTO_CONTADO_JURIDICO, iva=IVA, igtf=IGTF, vectorizado=True):
+        """
+        Args:
+            store (ProductStore): Catálogo del que se toman los precios.
+            descuento (int): Porcentaje de descuento.
+            iva (int): Porcentaje de IVA.
+            igtf (int): Porcentaje de IGTF.
+            vectorizado (bool): False para no usar numpy aunque esté instalado.
+        """
+        self.store = store
+        self.descuento = descuento
+        self.iva = iva
+        self.igtf = igtf
+        self.vectorizado = vectorizado and numpy is not None
+        self.nombre = "numpy" if self.vectorizado else "Python"
+
+    def calcular(self, carritos, productos, cantidades, juridico, contado, usd, precios=None):
+        """
+        Calcula subtotal, descuento, IVA, IGTF y total de cada carrito.
+
+        Args:
+            carritos (sequence): Número de carrito (de 0 a n-1) de cada línea.
+            productos (sequence): ID del producto de cada línea.
+            cantidades (sequence): Cantidad de cada línea.
+            juridico (sequence): Por carrito, True si el cliente es jurídico.
+            contado (sequence): Por carrito, True si paga de contado.
+            usd (sequence): Por carrito, True si paga en dólares.
+            precios (sequence): Precio en centavos de cada línea; si no se indica, se
+                toma del catálogo.
+
+        Returns:
+            dict: Nombre del monto ("subtotal", "descuento", "iva", "igtf", "total") ->
+                centavos de cada carrito (numpy.ndarray de int64, o array('q') sin numpy).
+
+        Raises:
+            KeyError: Si un producto no está en el catálogo.
+        """
+        if self.vectorizado:
+            return self._calcular_numpy(carritos, productos, cantidades, juridico, contado, usd, precios)
+        return self._calcular_python(carritos, productos, cantidades, juridico, contado, usd, precios)
+
+    @staticmethod
+    def _enteros(valores):
+        """
+        Convierte una secuencia (o un array('q'), sin copiarlo) en un arreglo int64.
+        """
+        # array('q') se convierte con el tipo "long long"; `view` lo deja como int64, el
+        # mismo tipo de los demás arreglos (numpy.add.at es mucho más lento si difieren)
+        return numpy.asarray(valores, dtype=numpy.int64).view(numpy.int64)
+
+    def _precios_numpy(self, productos):
+        """
+        Devuelve el precio en centavos de cada producto. Si los IDs del catálogo son
+        enteros positivos no muy dispersos (como los de la API), se buscan en una tabla
+        ID -> fila; si no, con búsqueda binaria sobre los IDs ordenados.
+        """
+        # Se copian las columnas: una vista sobre el arreglo impediría agregarle filas
+        ids = numpy.array(self.store.ids, dtype=numpy.int64)
+        precios = numpy.array(self.store.precios, dtype=numpy.int64)
+        if not len(productos):
+            return numpy.zeros(0, dtype=numpy.int64)
+        if not len(ids):
+            raise KeyError(int(productos[0]))
+
+        if ids.min() >= 0 and ids.max() < 4 * len(ids) + 1024:
+            tabla = numpy.full(int(ids.max()) + 1, -1, dtype=numpy.int64)
+            tabla[ids] = numpy.arange(len(ids))
+            validos = (productos >= 0) & (productos < len(tabla))
+            filas = tabla[numpy.where(validos, productos, 0)]
+            faltantes = ~validos | (filas < 0)
+        else:
+            orden = numpy.argsort(ids, kind="stable")
+            posiciones = numpy.minimum(numpy.searchsorted(ids[orden], productos), len(ids) - 1)
+            filas = orden[posiciones]
+            faltantes = ids[filas] != productos
+        if faltantes.any():
+            raise KeyError(int(productos[faltantes][0]))
+        return precios[filas]
+
+    @staticmethod
+    def _porcentaje_numpy(centavos, tasa):
+        """
+        `Dinero.porcentaje` sobre un arreglo de centavos.
+        """
+        producto = centavos * tasa
+        return numpy.where(producto >= 0, (producto + 50) // 100, -((50 - producto) // 100))
+
+    def _calcular_numpy(self, carritos, productos, cantidades, juridico, contado, usd, precios):
+        carritos = self._enteros(carritos)
+        cantidades = self._enteros(cantidades)
+        juridico = numpy.asarray(juridico, dtype=bool)
+        contado = numpy.asarray(contado, dtype=bool)
+        usd = numpy.asarray(usd, dtype=bool)
+        if precios is None:
+            precios = self._precios_numpy(self._enteros(productos))
+        else:
+            precios = self._enteros(precios)
+
+        subtotal = numpy.zeros(len(juridico), dtype=numpy.int64)
+        numpy.add.at(subtotal, carritos, precios * cantidades)
+        descuento = numpy.where(juridico & contado, self._porcentaje_numpy(subtotal, self.descuento), 0)
+        base = subtotal - descuento
+        iva = self._porcentaje_numpy(base, self.iva)
+        total = base + iva
+        igtf = numpy.where(usd, self._porcentaje_numpy(total, self.igtf), 0)
+        return {"subtotal": subtotal, "descuento": descuento, "iva": iva, "igtf": igtf, "total": total}
+
+    def _calcular_python(self, carritos, productos, cantidades, juridico, contado, usd, precios):
+        if precios is None:
+            filas = {id: fila for fila, id in enumerate(self.store.ids)}
+            columna = self.store.precios
+            precios = [columna[filas[id]] for id in productos]
+
+        subtotales = array('q', bytes(8 * len(juridico)))
+        for carrito, precio, cantidad in zip(carritos, precios, cantidades):
+            subtotales[carrito] += precio * cantidad
+        resultado = {monto: array('q') for monto in MONTOS}
+        for i, centavos in enumerate(subtotales):
+            subtotal = Dinero(centavos)
+            descuento = subtotal.porcentaje(self.descuento) if juridico[i] and contado[i] else Dinero()
+            base = subtotal - descuento
+            iva = base.porcentaje(self.iva)
+            total = base + iva
+            igtf = total.porcentaje(self.igtf) if usd[i] else Dinero()
+            for monto, valor in zip(MONTOS, (subtotal, descuento, iva, igtf, total)):
+                resultado[monto].append(valor.centavos)
+        return resultado
+
+    @staticmethod
+    def columnas_ventas(ventas, pagos=()):
+        """
+        Arma los argumentos de `calcular` a partir de ventas registradas, con el precio
+        actual de cada producto. La moneda de una venta es la de su primer pago con moneda;
+        las ventas sin pagos se consideran en bolívares.
+
+        Args:
+            ventas (iterable): Ventas a recalcular.
+            pagos (iterable): Pagos de esas ventas.
+
+        Returns:
+            dict: Argumentos de `calcular` por nombre.
+        """
+        monedas = {}
+        for pago in pagos:
+            if pago.moneda_pago:
+                monedas.setdefault(pago.venta.id, pago.moneda_pago)
+        columnas = {nombre: [] for nombre in ("carritos", "productos", "cantidades", "precios",
+                                               "juridico", "contado", "usd")}
+        for carrito, venta in enumerate(ventas):
+            for producto, cantidad in venta.productos.items():
+                columnas["carritos"].append(carrito)
+                columnas["productos"].append(producto.id)
+                columnas["cantidades"].append(cantidad)
+                columnas["precios"].append(producto.precio.centavos)
+            columnas["juridico"].append(isinstance(venta.cliente, ClienteJuridico))
+            columnas["contado"].append(venta.metodo_pago == "Contado")
+            columnas["usd"].append(monedas.get(venta.id) == "USD")
+        return columnas
+
+    @staticmethod
+    def montos(resultado, carrito):
+        """
+        Devuelve los montos de un carrito como `Dinero`, en el orden de
+        `MotorVentas.calcular_montos` más el subtotal: (subtotal, descuento, iva, igtf, total).
+        """
+        return tuple(Dinero(int(resultado[monto][carrito])) for monto in MONTOS)
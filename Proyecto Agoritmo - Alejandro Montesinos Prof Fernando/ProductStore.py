@@ -0,0 +1,201 @@
+import threading
+from array import array
+from itertools import compress
+
+from Dinero import Dinero
+
+
+class ProductStore:
+    """
+    Almacén columnar del catálogo de productos.
+
+    Los ids, precios e inventarios se guardan en arreglos tipados contiguos y las categorías
+    se codifican como enteros contra una tabla de categorías. Cada fila tiene asociada una
+    vista `Producto`, que lee y escribe sus atributos directamente sobre las columnas.
+
+    El almacén se comporta como una secuencia de productos (len, iteración, índice, append
+    y remove), por lo que puede usarse en lugar de la lista de productos de `App`.
+
+    Atributos:
+        ids (array): IDs de los productos (enteros de 64 bits).
+        precios (array): Precios de los productos en centavos (enteros de 64 bits).
+        inventarios (array): Cantidades en inventario (enteros de 64 bits).
+        categorias (array): Código de categoría de cada fila.
+        tabla_categorias (list): Código -> nombre de la categoría.
+        codigos_categorias (dict): Nombre de la categoría -> código.
+        nombres (list): Nombres de los productos.
+        descripciones (list): Descripciones de los productos.
+        compatibles (list): Listas de vehículos compatibles.
+        vistas (list): Fila -> vista `Producto` asociada.
+        candado (threading.Lock): Se toma al agregar o eliminar una fila y al copiar las
+            columnas (ver `copiar_columnas`).
+    """
+
+    def __init__(self):
+        """
+        Inicializa el almacén con todas las columnas vacías.
+        """
+        self.ids = array('q')
+        self.precios = array('q')
+        self.inventarios = array('q')
+        self.categorias = array('i')
+        self.tabla_categorias = []
+        self.codigos_categorias = {}
+        self.nombres = []
+        self.descripciones = []
+        self.compatibles = []
+        self.vistas = []
+        self.candado = threading.Lock()
+
+    def __len__(self):
+        return len(self.vistas)
+
+    def __iter__(self):
+        return iter(self.vistas)
+
+    def __getitem__(self, posicion):
+        return self.vistas[posicion]
+
+    def __contains__(self, producto):
+        return getattr(producto, "_store", None) is self
+
+    def codificar_categoria(self, categoria):
+        """
+        Devuelve el código entero de una categoría, registrándola si es nueva.
+        """
+        codigo = self.codigos_categorias.get(categoria)
+        if codigo is None:
+            codigo = len(self.tabla_categorias)
+            self.tabla_categorias.append(categoria)
+            self.codigos_categorias[categoria] = codigo
+        return codigo
+
+    def insertar_fila(self, vista, id, nombre, descripcion, precio, categoria, inventario, compatible):
+        """
+        Agrega una fila al final de las columnas y la asocia a una vista. El precio se
+        convierte a centavos con `Dinero.de`.
+
+        Returns:
+            int: Número de fila asignado.
+        """
+        centavos = Dinero.de(precio).centavos
+        with self.candado:
+            self.ids.append(id)
+            self.precios.append(centavos)
+            self.inventarios.append(inventario)
+            self.categorias.append(self.codificar_categoria(categoria))
+            self.nombres.append(nombre)
+            self.descripciones.append(descripcion)
+            self.compatibles.append(compatible)
+            self.vistas.append(vista)
+            return len(self.vistas) - 1
+
+    def leer_fila(self, fila):
+        """
+        Devuelve los valores de una fila como tupla, en el orden del constructor de `Producto`.
+        """
+        return (
+            self.ids[fila], self.nombres[fila], self.descripciones[fila], Dinero(self.precios[fila]),
+            self.tabla_categorias[self.categorias[fila]], self.inventarios[fila], self.compatibles[fila]
+        )
+
+    def append(self, producto):
+        """
+        Incorpora al almacén un producto creado en otro almacén, copiando su fila.
+
+        Args:
+            producto (Producto): Producto a incorporar.
+        """
+        if producto._store is self:
+            return
+        valores = producto._store.leer_fila(producto._fila)
+        producto._store = self
+        producto._fila = self.insertar_fila(producto, *valores)
+
+    def remove(self, producto):
+        """
+        Elimina la fila de un producto conservando el orden del resto del catálogo.
+
+        La vista eliminada se desacopla hacia un almacén propio para que las ventas que
+        la referencian sigan mostrando sus datos.
+
+        Args:
+            producto (Producto): Producto a eliminar.
+
+        Raises:
+            ValueError: Si el producto no pertenece al almacén.
+        """
+        if producto._store is not self:
+            raise ValueError("El producto no pertenece al catálogo.")
+        fila = producto._fila
+        valores = self.leer_fila(fila)
+
+        with self.candado:
+            for columna in (self.ids, self.precios, self.inventarios, self.categorias,
+                            self.nombres, self.descripciones, self.compatibles, self.vistas):
+                del columna[fila]
+            for i in range(fila, len(self.vistas)):
+                self.vistas[i]._fila = i
+
+        propio = ProductStore()
+        producto._store = propio
+        producto._fila = propio.insertar_fila(producto, *valores)
+
+    def copiar_columnas(self):
+        """
+        Copia las columnas del almacén, sin las vistas, para serializarlas desde otro hilo.
+
+        Copiar un arreglo o una lista es una sola operación, pero otro hilo puede agregar o
+        eliminar una fila entre dos columnas. Por eso la copia se hace con `candado` tomado,
+        esperando a que termine la fila que se está agregando o eliminando. Las listas de
+        vehículos compatibles se copian una por una, porque el menú de modificación de
+        productos las cambia sin reemplazarlas.
+
+        Returns:
+            ProductStore: Almacén sin vistas con las mismas filas; se recorre con `filas`.
+        """
+        copia = ProductStore()
+        with self.candado:
+            copia.ids = self.ids[:]
+            copia.precios = self.precios[:]
+            copia.inventarios = self.inventarios[:]
+            copia.categorias = self.categorias[:]
+            copia.tabla_categorias = self.tabla_categorias[:]
+            copia.nombres = self.nombres[:]
+            copia.descripciones = self.descripciones[:]
+            copia.compatibles = [list(compatible) for compatible in self.compatibles]
+        return copia
+
+    def filas(self):
+        """
+        Genera los valores de cada fila con `leer_fila`, en el orden del catálogo.
+        """
+        for fila in range(len(self.ids)):
+            yield self.leer_fila(fila)
+
+    def filtrar_precio(self, precio_min, precio_max):
+        """
+        Devuelve los productos con precio entre `precio_min` y `precio_max` (inclusive),
+        recorriendo únicamente la columna de precios.
+        """
+        precio_min, precio_max = Dinero.de(precio_min).centavos, Dinero.de(precio_max).centavos
+        return list(compress(self.vistas, [precio_min <= precio <= precio_max for precio in self.precios]))
+
+    def filtrar_inventario(self, inventario_min):
+        """
+        Devuelve los productos con al menos `inventario_min` unidades, recorriendo
+        únicamente la columna de inventarios.
+        """
+        return list(compress(self.vistas, [inventario >= inventario_min for inventario in self.inventarios]))
+
+    def filtrar_categoria(self, texto):
+        """
+        Devuelve los productos cuya categoría contiene el texto indicado (sin diferenciar
+        mayúsculas/minúsculas). La comparación de texto se hace una vez por categoría
+        distinta y luego se recorre la columna de códigos.
+        """
+        texto = texto.lower()
+        codigos = {codigo for codigo, categoria in enumerate(self.tabla_categorias) if texto in categoria.lower()}
+        if not codigos:
+            return []
+        return list(compress(self.vistas, [codigo in codigos for codigo in self.categorias]))
@@ -1,37 +1,102 @@
+from Dinero import Dinero
+from ProductStore import ProductStore
+
+
 class Producto:
     """
     Clase que representa un producto en el sistema.
 
+    Un producto es una vista liviana sobre una fila de un `ProductStore`: sus atributos
+    se leen y escriben directamente en las columnas del almacén.
+
     Atributos:
         id (int): Identificador único del producto.
         nombre (str): Nombre del producto.
         descripcion (str): Descripción detallada del producto.
-        precio (float): Precio unitario del producto.
+        precio (Dinero): Precio unitario del producto.
         categoria (str): Categoría a la que pertenece el producto.
         inventario (int): Cantidad de productos disponibles en inventario.
         compatible (list): Lista de vehículos compatibles con el producto.
     """
 
-    def __init__(self, id, nombre, descripcion, precio, categoria, inventario, compatible):
+    __slots__ = ("_store", "_fila")
+
+    def __init__(self, id, nombre, descripcion, precio, categoria, inventario, compatible, store=None):
         """
-        Inicializa un producto con los datos básicos y compatibilidades.
+        Inicializa un producto con los datos básicos y compatibilidades, agregando su fila
+        al almacén indicado.
 
         Args:
             id (int): Identificador único del producto.
             nombre (str): Nombre del producto.
             descripcion (str): Descripción del producto.
-            precio (float): Precio del producto.
+            precio (Dinero | float): Precio del producto.
             categoria (str): Categoría a la que pertenece.
             inventario (int): Cantidad disponible en inventario.
             compatible (list): Lista de vehículos compatibles.
+            store (ProductStore): Almacén donde se guarda la fila. Si no se indica,
+                el producto usa un almacén propio.
         """
-        self.id = id
-        self.nombre = nombre
-        self.descripcion = descripcion
-        self.precio = precio
-        self.categoria = categoria
-        self.inventario = inventario
-        self.compatible = compatible
+        if store is None:
+            store = ProductStore()
+        self._store = store
+        self._fila = store.insertar_fila(self, id, nombre, descripcion, precio, categoria, inventario, compatible)
+
+    @property
+    def id(self):
+        return self._store.ids[self._fila]
+
+    @id.setter
+    def id(self, valor):
+        self._store.ids[self._fila] = valor
+
+    @property
+    def nombre(self):
+        return self._store.nombres[self._fila]
+
+    @nombre.setter
+    def nombre(self, valor):
+        self._store.nombres[self._fila] = valor
+
+    @property
+    def descripcion(self):
+        return self._store.descripciones[self._fila]
+
+    @descripcion.setter
+    def descripcion(self, valor):
+        self._store.descripciones[self._fila] = valor
+
+    @property
+    def precio(self):
+        return Dinero(self._store.precios[self._fila])
+
+    @precio.setter
+    def precio(self, valor):
+        self._store.precios[self._fila] = Dinero.de(valor).centavos
+
+    @property
+    def categoria(self):
+        return self._store.tabla_categorias[self._store.categorias[self._fila]]
+
+    @categoria.setter
+    def categoria(self, valor):
+        self._store.categorias[self._fila] = self._store.codificar_categoria(valor)
+
+    @property
+    def inventario(self):
+        return self._store.inventarios[self._fila]
+
+    @inventario.setter
+    def inventario(self, valor):
+        self._store.inventarios[self._fila] = valor
+
+    @property
+    def compatible(self):
+        return self._store.compatibles[self._fila]
+
+    @compatible.setter
+    def compatible(self, valor):
+        self._store.compatibles[self._fila] = valor
 
     def show_compatibles(self):
         """
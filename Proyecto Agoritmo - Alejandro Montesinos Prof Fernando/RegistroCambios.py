@@ -0,0 +1,194 @@
+import json
+import os
+import threading
+import time
+
+
+class RegistroCambios:
+    """
+    Registro de cambios de solo anexado (write-ahead log) en formato JSON Lines.
+
+    Cada cambio se agrega al final del archivo como una línea JSON compacta y se fuerza a
+    disco con fsync, por lo que el costo de confirmar un cambio no depende del tamaño del
+    historial. Al arrancar, los cambios se reproducen sobre la última copia completa de los
+    datos (los archivos JSON), y al compactar el registro se vacía.
+
+    Un punto de control (`punto_control`) pasa los cambios registrados a un segmento anterior
+    (`ruta_anterior`) mientras la copia completa se escribe en segundo plano, y los nuevos
+    cambios siguen en el archivo del registro. El segmento anterior se borra cuando la copia
+    queda escrita; si el proceso termina antes, se reproduce al arrancar junto con el resto.
+
+    Atributos:
+        ruta (str): Archivo del registro.
+        ruta_anterior (str): Segmento con los cambios de un punto de control sin terminar.
+        cantidad (int): Cambios registrados desde la última compactación o punto de control.
+        archivo (file | None): Archivo abierto para anexar, o None si está cerrado.
+        candado (threading.Lock): Serializa las escrituras de distintos hilos.
+        espera_maxima (float): Mayor tiempo, en segundos, que un cambio esperó el candado.
+    """
+
+    def __init__(self, ruta):
+        """
+        Inicializa el registro sin abrir el archivo.
+
+        Args:
+            ruta (str): Archivo del registro.
+        """
+        self.ruta = ruta
+        self.ruta_anterior = ruta + ".anterior"
+        self.cantidad = 0
+        self.archivo = None
+        self.candado = threading.Lock()
+        self.espera_maxima = 0.0
+
+    def leer(self):
+        """
+        Genera los cambios registrados, en orden: primero los del segmento anterior de un
+        punto de control sin terminar, si existe, y luego los del registro.
+
+        Si el proceso terminó mientras escribía la última línea, esa línea incompleta se
+        descarta y se recorta del archivo para que los cambios siguientes no queden pegados a ella.
+        """
+        self.cantidad = 0
+        if os.path.exists(self.ruta_anterior):
+            with open(self.ruta_anterior, "rb") as file:
+                for linea in file:
+                    try:
+                        cambio = json.loads(linea)
+                    except ValueError:
+                        break
+                    self.cantidad += 1
+                    yield cambio
+        if not os.path.exists(self.ruta):
+            return
+        valido = 0
+        with open(self.ruta, "rb") as file:
+            for linea in file:
+                try:
+                    cambio = json.loads(linea)
+                except ValueError:
+                    break
+                if not linea.endswith(b"\n"):
+                    break
+                valido += len(linea)
+                self.cantidad += 1
+                yield cambio
+        if valido < os.path.getsize(self.ruta):
+            with open(self.ruta, "r+b") as file:
+                file.truncate(valido)
+
+    def abrir(self):
+        """
+        Abre el archivo del registro para anexar cambios.
+        """
+        if self.archivo is None:
+            self.archivo = open(self.ruta, "a", encoding="utf-8")
+
+    def agregar(self, operacion, datos, sincronizar=True):
+        """
+        Agrega un cambio al final del registro.
+
+        Args:
+            operacion (str): Tipo de cambio (por ejemplo "venta" o "cliente_eliminado").
+            datos (dict): Datos del cambio.
+            sincronizar (bool): True para forzar el cambio a disco antes de volver. Con False
+                el cambio queda en el búfer hasta la siguiente llamada a `sincronizar`.
+        """
+        linea = json.dumps({"op": operacion, **datos}, separators=(",", ":")) + "\n"
+        inicio = time.perf_counter()
+        with self.candado:
+            self.espera_maxima = max(self.espera_maxima, time.perf_counter() - inicio)
+            self.abrir()
+            self.archivo.write(linea)
+            self.cantidad += 1
+            if sincronizar:
+                self._sincronizar()
+
+    def sincronizar(self):
+        """
+        Fuerza a disco los cambios agregados sin sincronizar.
+        """
+        with self.candado:
+            if self.archivo is not None:
+                self._sincronizar()
+
+    def _sincronizar(self):
+        self.archivo.flush()
+        os.fsync(self.archivo.fileno())
+
+    def compactar(self, guardar):
+        """
+        Guarda una copia completa de los datos y descarta los cambios registrados, que ya
+        quedan incluidos en ella. Mientras tanto ningún otro hilo puede agregar cambios.
+
+        Args:
+            guardar (callable): Función que escribe la copia completa de los datos.
+
+        Returns:
+            Lo que devuelva `guardar`.
+        """
+        with self.candado:
+            resultado = guardar()
+            if self.archivo is not None:
+                self.archivo.close()
+            self.archivo = open(self.ruta, "w", encoding="utf-8")
+            self._sincronizar()
+            self.cantidad = 0
+            if os.path.exists(self.ruta_anterior):
+                os.remove(self.ruta_anterior)
+        return resultado
+
+    def punto_control(self, capturar):
+        """
+        Toma una copia de los datos y pasa los cambios registrados hasta ese momento al
+        segmento anterior, sin que ningún otro hilo agregue cambios mientras tanto. La copia
+        incluye todos los cambios del segmento anterior, así que cuando termine de escribirse
+        se puede descartar con `descartar_anterior`.
+
+        Si quedó un segmento anterior de un punto de control que falló, los cambios se le
+        agregan al final.
+
+        Args:
+            capturar (callable): Función que toma la copia de los datos.
+
+        Returns:
+            tuple: (lo que devuelva `capturar`, segundos que se retuvo el candado).
+        """
+        with self.candado:
+            inicio = time.perf_counter()
+            captura = capturar()
+            if self.archivo is not None:
+                self._sincronizar()
+                self.archivo.close()
+                self.archivo = None
+            if os.path.exists(self.ruta):
+                if os.path.exists(self.ruta_anterior):
+                    with open(self.ruta, "rb") as origen, open(self.ruta_anterior, "ab") as destino:
+                        destino.write(origen.read())
+                        destino.flush()
+                        os.fsync(destino.fileno())
+                else:
+                    os.replace(self.ruta, self.ruta_anterior)
+            self.archivo = open(self.ruta, "w", encoding="utf-8")
+            self._sincronizar()
+            self.cantidad = 0
+            pausa = time.perf_counter() - inicio
+        return captura, pausa
+
+    def descartar_anterior(self):
+        """
+        Borra el segmento anterior cuando la copia del punto de control ya está escrita.
+        """
+        with self.candado:
+            if os.path.exists(self.ruta_anterior):
+                os.remove(self.ruta_anterior)
+
+    def cerrar(self):
+        """
+        Sincroniza y cierra el archivo del registro.
+        """
+        with self.candado:
+            if self.archivo is not None:
+                self._sincronizar()
+                self.archivo.close()
+                self.archivo = None
@@ -0,0 +1,193 @@
+from abc import ABC, abstractmethod
+
+
+class Repositorio(ABC):
+    """
+    Interfaz de almacenamiento de la aplicación.
+
+    Un repositorio carga los datos guardados en `App`, recibe cada cambio que hace la
+    aplicación para que quede guardado, y resuelve las búsquedas e informes de los menús.
+    Las búsquedas devuelven los mismos objetos que usa la aplicación (clientes, ventas,
+    pagos y envíos).
+
+    Es una clase abstracta: un almacenamiento que no implementa todos los métodos
+    abstractos no se puede instanciar.
+
+    Atributos:
+        app (App | None): Aplicación a la que está vinculado el repositorio.
+    """
+
+    def __init__(self):
+        """
+        Inicializa el repositorio sin vincularlo a ninguna aplicación.
+        """
+        self.app = None
+
+    def vincular(self, app):
+        """
+        Vincula el repositorio a la aplicación cuyos datos almacena.
+
+        Args:
+            app (App): Aplicación.
+        """
+        self.app = app
+
+    @abstractmethod
+    def cargar(self):
+        """
+        Carga en la aplicación los datos guardados.
+
+        Returns:
+            dict: Cantidad de registros cargados por colección ("clientes", "productos",
+            "ventas", "pagos", "envios"), "omitidos" y "cambios" recuperados.
+        """
+
+    @abstractmethod
+    def registrar_cambio(self, operacion, datos, sincronizar=True):
+        """
+        Guarda un cambio de la aplicación.
+
+        Args:
+            operacion (str): Tipo de cambio ("cliente", "cliente_eliminado", "producto",
+                "producto_eliminado", "venta", "pago" o "envio").
+            datos (dict): Datos del cambio, con el mismo formato de los archivos JSON.
+            sincronizar (bool): False para agrupar varios cambios y confirmarlos juntos con
+                `sincronizar`.
+        """
+
+    @abstractmethod
+    def sincronizar(self):
+        """
+        Confirma los cambios agregados sin sincronizar.
+        """
+
+    @abstractmethod
+    def cerrar(self):
+        """
+        Confirma los cambios pendientes y libera los recursos del repositorio al salir.
+        """
+
+    @abstractmethod
+    def buscar_cliente(self, identificacion):
+        """
+        Devuelve el cliente con una cédula o RIF, o None si no existe.
+        """
+
+    @abstractmethod
+    def buscar_cliente_correo(self, correo):
+        """
+        Devuelve el primer cliente registrado con un correo, o None si no existe.
+        """
+
+    @abstractmethod
+    def ventas_cliente(self, cliente):
+        """
+        Devuelve las ventas de un cliente, en orden de registro.
+        """
+
+    @abstractmethod
+    def ventas_fecha(self, fecha):
+        """
+        Devuelve las ventas de una fecha (YYYY-MM-DD), en orden de registro.
+        """
+
+    @abstractmethod
+    def ventas_periodo(self, desde, hasta):
+        """
+        Devuelve las ventas entre dos fechas (YYYY-MM-DD, inclusive), ordenadas por fecha
+        y, dentro de un día, en orden de registro.
+        """
+
+    @abstractmethod
+    def pagos_cliente(self, cliente):
+        """
+        Devuelve los pagos de un cliente, en orden de registro.
+        """
+
+    @abstractmethod
+    def pagos_fecha(self, fecha):
+        """
+        Devuelve los pagos de una fecha (YYYY-MM-DD), en orden de registro.
+        """
+
+    @abstractmethod
+    def pagos_metodo(self, metodo_pago):
+        """
+        Devuelve los pagos hechos con un tipo de pago, en orden de registro.
+        """
+
+    @abstractmethod
+    def pagos_moneda(self, moneda):
+        """
+        Devuelve los pagos hechos en una moneda (sin diferenciar mayúsculas/minúsculas),
+        en orden de registro.
+        """
+
+    @abstractmethod
+    def envios_cliente(self, cliente):
+        """
+        Devuelve los envíos de un cliente, en orden de registro.
+        """
+
+    @abstractmethod
+    def envios_fecha(self, fecha):
+        """
+        Devuelve los envíos de una fecha (YYYY-MM-DD), en orden de registro.
+        """
+
+    @abstractmethod
+    def productos_mas_vendidos(self, cantidad=3):
+        """
+        Devuelve los productos con más unidades vendidas.
+
+        Returns:
+            list: Tuplas (nombre del producto, unidades), de mayor a menor.
+        """
+
+    @abstractmethod
+    def productos_mas_enviados(self, cantidad=3):
+        """
+        Devuelve los productos con más unidades enviadas.
+
+        Returns:
+            list: Tuplas (nombre del producto, unidades), de mayor a menor.
+        """
+
+    @abstractmethod
+    def clientes_frecuentes(self, cantidad=3):
+        """
+        Devuelve los clientes con más compras.
+
+        Returns:
+            list: Tuplas (cliente, cantidad de compras), de mayor a menor.
+        """
+
+    @abstractmethod
+    def ventas_totales(self):
+        """
+        Devuelve la cantidad de ventas y la suma exacta de sus totales.
+
+        Returns:
+            tuple: (cantidad de ventas, Dinero).
+        """
+
+    @abstractmethod
+    def pagos_totales(self):
+        """
+        Devuelve la cantidad de pagos y la suma exacta de los montos cobrados y pendientes.
+
+        Returns:
+            tuple: (cantidad de pagos, Dinero cobrado, Dinero pendiente).
+        """
+
+    @abstractmethod
+    def clientes_pagos_pendientes(self):
+        """
+        Devuelve el cliente de cada pago pendiente, en orden de registro.
+        """
+
+    @abstractmethod
+    def clientes_envios_pendientes(self):
+        """
+        Devuelve el cliente de cada envío pendiente, en orden de registro.
+        """
@@ -0,0 +1,119 @@
+from Dinero import Dinero
+from Repositorio import Repositorio
+
+
+class RepositorioJSON(Repositorio):
+    """
+    Repositorio por defecto: archivos JSON (o la instantánea binaria) con registro de cambios.
+
+    Los datos se cargan de la copia completa de `App` más su registro de cambios, y las
+    búsquedas e informes recorren las listas cargadas en memoria; las de ventas por
+    cliente y por fecha usan los índices de `App.indice_ventas`. Las búsquedas por fecha
+    solo cargan las particiones de los meses buscados; las demás búsquedas e informes
+    cargan antes los meses de la colección que todavía no se leyeron.
+    """
+
+    def cargar(self):
+        conteo = self.app.cargar_datos()
+        conteo["cambios"] = self.app.abrir_registro()
+        return conteo
+
+    def registrar_cambio(self, operacion, datos, sincronizar=True):
+        if self.app.registro is not None:
+            self.app.registro.agregar(operacion, datos, sincronizar)
+
+    def sincronizar(self):
+        if self.app.registro is not None:
+            self.app.registro.sincronizar()
+
+    def cerrar(self):
+        self.app.cerrar_registro()
+
+    def buscar_cliente(self, identificacion):
+        return self.app.clientes_por_cedula.get(identificacion) or self.app.clientes_por_rif.get(identificacion)
+
+    def buscar_cliente_correo(self, correo):
+        clientes = self.app.clientes_por_correo.get(correo)
+        return clientes[0] if clientes else None
+
+    def _todos(self, coleccion):
+        """
+        Devuelve la lista completa de una colección, cargando los meses que falten.
+        """
+        self.app.cargar_particiones(coleccion)
+        return getattr(self.app, coleccion)
+
+    def ventas_cliente(self, cliente):
+        self.app.cargar_particiones("ventas")
+        return self.app.indice_ventas.de_cliente(cliente)
+
+    def ventas_fecha(self, fecha):
+        return self.ventas_periodo(fecha, fecha)
+
+    def ventas_periodo(self, desde, hasta):
+        self.app.cargar_particiones("ventas", self.app.particiones["ventas"].meses_en_rango(desde, hasta))
+        return self.app.indice_ventas.periodo(desde, hasta)
+
+    def pagos_cliente(self, cliente):
+        return [pago for pago in self._todos("pagos") if pago.cliente == cliente]
+
+    def pagos_fecha(self, fecha):
+        return [pago for pago in self.app.elementos_periodo("pagos", fecha, fecha)
+                if pago.fecha.split(" ")[0] == fecha]
+
+    def pagos_metodo(self, metodo_pago):
+        return [pago for pago in self._todos("pagos") if pago.metodo_pago == metodo_pago]
+
+    def pagos_moneda(self, moneda):
+        return [pago for pago in self._todos("pagos")
+                if pago.moneda_pago and pago.moneda_pago.lower() == moneda.lower()]
+
+    def envios_cliente(self, cliente):
+        return [envio for envio in self._todos("envios") if envio.cliente == cliente]
+
+    def envios_fecha(self, fecha):
+        return [envio for envio in self.app.elementos_periodo("envios", fecha, fecha)
+                if envio.fecha_envio.split(" ")[0] == fecha]
+
+    @staticmethod
+    def _mayores(conteo, cantidad):
+        """
+        Devuelve los `cantidad` pares (clave, valor) de mayor valor; los empates conservan
+        el orden en que aparecieron.
+        """
+        return sorted(conteo.items(), key=lambda par: -par[1])[:cantidad]
+
+    def productos_mas_vendidos(self, cantidad=3):
+        productos = {}
+        for venta in self._todos("ventas"):
+            for producto, unidades in venta.productos.items():
+                productos[producto.nombre] = productos.get(producto.nombre, 0) + unidades
+        return self._mayores(productos, cantidad)
+
+    def productos_mas_enviados(self, cantidad=3):
+        productos = {}
+        for envio in self._todos("envios"):
+            for producto, unidades in envio.orden_compra.productos.items():
+                productos[producto.nombre] = productos.get(producto.nombre, 0) + unidades
+        return self._mayores(productos, cantidad)
+
+    def clientes_frecuentes(self, cantidad=3):
+        clientes = {}
+        for venta in self._todos("ventas"):
+            clientes[venta.cliente] = clientes.get(venta.cliente, 0) + 1
+        return self._mayores(clientes, cantidad)
+
+    def ventas_totales(self):
+        ventas = self._todos("ventas")
+        return len(ventas), Dinero.sumar(venta.total for venta in ventas)
+
+    def pagos_totales(self):
+        pagos = self._todos("pagos")
+        return (len(pagos), Dinero.sumar(pago.monto_pago for pago in pagos if pago.estado),
+                Dinero.sumar(pago.monto_pago for pago in pagos if not pago.estado))
+
+    def clientes_pagos_pendientes(self):
+        return [pago.cliente for pago in self._todos("pagos") if not pago.estado]
+
+    def clientes_envios_pendientes(self):
+        return [envio.cliente for envio in self._todos("envios") if not envio.estado]
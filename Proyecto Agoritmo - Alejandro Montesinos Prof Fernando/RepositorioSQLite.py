@@ -0,0 +1,661 @@
+import json
+import os
+import sqlite3
+import threading
+
+from Dinero import Dinero
+from ParticionesMensuales import ParticionesMensuales, SIN_FECHA
+from Producto import Producto
+from Repositorio import Repositorio
+from RegistroCambios import RegistroCambios
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS clientes (
+    tipo TEXT NOT NULL,
+    cedula TEXT,
+    rif TEXT,
+    correo TEXT,
+    direccion TEXT,
+    telefono TEXT,
+    nombre TEXT,
+    razon_social TEXT,
+    nombre_contacto TEXT,
+    telf_contacto TEXT,
+    correo_contacto TEXT,
+    eliminado INTEGER NOT NULL DEFAULT 0
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_clientes_cedula ON clientes (cedula);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_clientes_rif ON clientes (rif);
+CREATE INDEX IF NOT EXISTS idx_clientes_correo ON clientes (correo);
+
+CREATE TABLE IF NOT EXISTS productos (
+    id INTEGER PRIMARY KEY,
+    nombre TEXT,
+    descripcion TEXT,
+    precio INTEGER,
+    categoria TEXT,
+    inventario INTEGER,
+    compatible_vehicles TEXT
+);
+
+CREATE TABLE IF NOT EXISTS ventas (
+    id INTEGER PRIMARY KEY,
+    fecha TEXT,
+    cliente_cedula TEXT,
+    cliente_rif TEXT,
+    metodo_pago TEXT,
+    metodo_envio TEXT,
+    subtotal INTEGER,
+    descuento INTEGER,
+    iva INTEGER,
+    igtf INTEGER,
+    total INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_ventas_fecha ON ventas (fecha);
+CREATE INDEX IF NOT EXISTS idx_ventas_cliente ON ventas (cliente_cedula, cliente_rif);
+CREATE INDEX IF NOT EXISTS idx_ventas_rif ON ventas (cliente_rif);
+CREATE INDEX IF NOT EXISTS idx_ventas_metodo_pago ON ventas (metodo_pago);
+
+CREATE TABLE IF NOT EXISTS venta_productos (
+    venta_id INTEGER NOT NULL,
+    producto_id INTEGER NOT NULL,
+    nombre TEXT,
+    precio INTEGER,
+    cantidad INTEGER,
+    PRIMARY KEY (venta_id, producto_id)
+);
+CREATE INDEX IF NOT EXISTS idx_venta_productos_producto ON venta_productos (producto_id, cantidad);
+
+CREATE TABLE IF NOT EXISTS pagos (
+    id INTEGER PRIMARY KEY,
+    venta_id INTEGER,
+    cliente_cedula TEXT,
+    cliente_rif TEXT,
+    monto_pago INTEGER,
+    metodo_pago TEXT,
+    moneda_pago TEXT,
+    estado INTEGER,
+    fecha TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_pagos_fecha ON pagos (fecha);
+CREATE INDEX IF NOT EXISTS idx_pagos_estado ON pagos (estado);
+CREATE INDEX IF NOT EXISTS idx_pagos_metodo_pago ON pagos (metodo_pago);
+CREATE INDEX IF NOT EXISTS idx_pagos_moneda_pago ON pagos (moneda_pago COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_pagos_cedula ON pagos (cliente_cedula);
+CREATE INDEX IF NOT EXISTS idx_pagos_rif ON pagos (cliente_rif);
+
+CREATE TABLE IF NOT EXISTS envios (
+    id INTEGER PRIMARY KEY,
+    venta_id INTEGER,
+    cliente_cedula TEXT,
+    cliente_rif TEXT,
+    servicio_envio TEXT,
+    costo_servicio REAL,
+    nombre_motorizado TEXT,
+    telefono_motorizado TEXT,
+    placa_motorizado TEXT,
+    fecha TEXT,
+    estado INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_envios_fecha ON envios (fecha);
+CREATE INDEX IF NOT EXISTS idx_envios_estado ON envios (estado);
+CREATE INDEX IF NOT EXISTS idx_envios_cedula ON envios (cliente_cedula);
+CREATE INDEX IF NOT EXISTS idx_envios_rif ON envios (cliente_rif);
+"""
+
+COLUMNAS_CLIENTE = ("tipo", "cedula", "rif", "correo", "direccion", "telefono", "nombre", "razon_social",
+                    "nombre_contacto", "telf_contacto", "correo_contacto")
+COLUMNAS_PRODUCTO = ("id", "nombre", "descripcion", "precio", "categoria", "inventario", "compatible_vehicles")
+COLUMNAS_VENTA = ("id", "fecha", "cliente_cedula", "cliente_rif", "metodo_pago", "metodo_envio", "subtotal",
+                  "descuento", "iva", "igtf", "total")
+COLUMNAS_PAGO = ("id", "venta_id", "cliente_cedula", "cliente_rif", "monto_pago", "metodo_pago", "moneda_pago",
+                 "estado", "fecha")
+COLUMNAS_ENVIO = ("id", "venta_id", "cliente_cedula", "cliente_rif", "servicio_envio", "costo_servicio",
+                  "nombre_motorizado", "telefono_motorizado", "placa_motorizado", "fecha", "estado")
+
+# Columnas con montos, guardados como centavos enteros (ver `Dinero`). El costo de los
+# envíos no está en la lista: en `Envio` sigue siendo un número cualquiera.
+MONTOS = {
+    "productos": ("precio",),
+    "venta_productos": ("precio",),
+    "ventas": ("subtotal", "descuento", "iva", "igtf", "total"),
+    "pagos": ("monto_pago",),
+}
+
+# Versión del esquema (PRAGMA user_version). La 0 guardaba los montos como REAL.
+VERSION_ESQUEMA = 1
+
+# Mes ("AAAA-MM") de la fecha de una fila, o SIN_FECHA, como `ParticionesMensuales.mes_de`
+MES = f"CASE WHEN fecha IS NULL OR fecha = '' THEN '{SIN_FECHA}' ELSE substr(fecha, 1, 7) END"
+
+# Máximo de IDs por consulta con IN (...), por debajo del límite de parámetros de SQLite
+IDS_POR_CONSULTA = 500
+
+
+def centavos(fila, tabla):
+    """
+    Convierte a centavos enteros los montos de una fila con el formato de los archivos JSON.
+    """
+    for columna in MONTOS[tabla]:
+        fila[columna] = Dinero.de(fila[columna]).centavos
+    return fila
+
+
+def montos(fila, tabla):
+    """
+    Convierte una fila leída de la base de datos en un diccionario, con sus montos como `Dinero`.
+    """
+    fila = dict(fila)
+    for columna in MONTOS[tabla]:
+        fila[columna] = Dinero(fila[columna])
+    return fila
+
+
+def registro(fila, tabla):
+    """
+    Convierte una fila leída de la base de datos en un registro con el formato de los
+    archivos JSON, con sus montos como números con dos decimales.
+    """
+    fila = dict(fila)
+    for columna in MONTOS.get(tabla, ()):
+        fila[columna] = fila[columna] / 100
+    return fila
+
+
+def insertar(tabla, columnas, reemplazar=False):
+    """
+    Devuelve la sentencia INSERT con parámetros con nombre para las columnas indicadas.
+    """
+    orden = "INSERT OR REPLACE" if reemplazar else "INSERT"
+    return (f"{orden} INTO {tabla} ({', '.join(columnas)}) "
+            f"VALUES ({', '.join(':' + columna for columna in columnas)})")
+
+
+class ParticionesSQLite(ParticionesMensuales):
+    """
+    Meses de ventas, pagos o envíos guardados en una tabla de SQLite, con la misma interfaz
+    de lectura que `ParticionesMensuales`. `App` carga los meses con `cargar_particiones` y
+    `buscar_elemento` igual que con los archivos por mes, pero las filas se leen con
+    consultas sobre el índice de fecha.
+
+    El resumen de cada mes (cantidad, menor y mayor ID y pendientes) se calcula con una
+    consulta al abrir; las filas agregadas después ya están cargadas en la aplicación.
+
+    Atributos:
+        repositorio (RepositorioSQLite): Repositorio que hace las consultas.
+        coleccion (str): "ventas", "pagos" o "envios" (también el nombre de la tabla).
+    """
+
+    def __init__(self, repositorio, coleccion):
+        """
+        Args:
+            repositorio (RepositorioSQLite): Repositorio que hace las consultas.
+            coleccion (str): "ventas", "pagos" o "envios".
+        """
+        # Sin archivos: no se usan `directorio`, `codec` ni el manifiesto
+        self.directorio = self.codec = self.ruta_manifiesto = None
+        self.particiones = {}
+        self.cargadas = set()
+        self.repositorio = repositorio
+        self.coleccion = coleccion
+
+    def existe(self):
+        return True
+
+    def abrir(self):
+        pendientes = "SUM(estado = 0)" if self.coleccion != "ventas" else "0"
+        filas = self.repositorio.consultar(
+            f"SELECT {MES} AS mes, COUNT(*) AS cantidad, MIN(id) AS id_min, MAX(id) AS id_max, "
+            f"{pendientes} AS pendientes FROM {self.coleccion} GROUP BY 1")
+        self.particiones = {fila["mes"]: {clave: fila[clave] for clave in ("cantidad", "id_min", "id_max", "pendientes")}
+                            for fila in filas}
+        self.cargadas = set()
+        return True
+
+    def registros(self, mes):
+        if mes == SIN_FECHA:
+            return self.repositorio.registros(self.coleccion, "fecha IS NULL OR fecha = ''", ())
+        return self.repositorio.registros(self.coleccion, "fecha >= ? AND fecha < ?", (mes, mes + "~"))
+
+    def meses_de_id(self, id):
+        # Con la tabla no hace falta buscar entre los rangos de IDs: se consulta el mes de la fila
+        return [fila["mes"] for fila in self.repositorio.consultar(
+            f"SELECT {MES} AS mes FROM {self.coleccion} WHERE id = ?", (id,))]
+
+    def actualizar(self, mes, elementos):
+        raise NotImplementedError("Las filas de SQLite se actualizan con cada cambio registrado")
+
+    def guardar_manifiesto(self):
+        raise NotImplementedError("Las filas de SQLite se actualizan con cada cambio registrado")
+
+
+class RepositorioSQLite(Repositorio):
+    """
+    Repositorio sobre una base de datos SQLite.
+
+    Cada cambio de la aplicación se escribe en su tabla dentro de una transacción, y las
+    búsquedas e informes se resuelven con consultas SQL sobre columnas indexadas (cédula/RIF,
+    fecha, estado, tipo de pago y moneda). Las consultas devuelven IDs que se traducen a los
+    objetos de la aplicación con sus diccionarios. Los montos se guardan como centavos
+    enteros, así que las sumas de los informes son exactas.
+
+    Al iniciar solo se cargan los clientes, los productos y, de las ventas, pagos y envíos,
+    los últimos `App.meses_recientes` meses y los meses con pagos o envíos pendientes, como
+    con los archivos por mes: las tablas reemplazan a `App.particiones` (`ParticionesSQLite`).
+    Las demás filas se leen cuando se necesitan: las de una búsqueda, por ID, y las de un
+    mes o una venta que no está cargada, con `App.cargar_particiones` y `App.buscar_elemento`.
+    Así la memoria usada depende de lo consultado en la sesión y no del historial completo.
+
+    Si la base de datos está vacía, al cargar se importan los archivos JSON de la aplicación
+    (y su registro de cambios), de modo que se puede cambiar de almacenamiento sin perder datos.
+
+    Atributos:
+        ruta (str): Archivo de la base de datos.
+        conexion (sqlite3.Connection): Conexión abierta, compartida por los hilos de la aplicación.
+        candado (threading.Lock): Serializa el uso de la conexión entre hilos.
+    """
+
+    def __init__(self, ruta="tienda.db"):
+        """
+        Abre (o crea) la base de datos y su esquema.
+
+        Args:
+            ruta (str): Archivo de la base de datos.
+        """
+        super().__init__()
+        self.ruta = ruta
+        self.conexion = sqlite3.connect(ruta, check_same_thread=False)
+        self.conexion.row_factory = sqlite3.Row
+        self.conexion.execute("PRAGMA journal_mode=WAL")
+        self.conexion.executescript(ESQUEMA)
+        self.migrar()
+        self.candado = threading.Lock()
+
+    def migrar(self):
+        """
+        Convierte una base de datos de la versión anterior del esquema, con los montos como
+        REAL, a montos en centavos enteros. SQLite no cambia el tipo de una columna, así
+        que cada tabla con montos se copia a una tabla nueva y se elimina la anterior.
+        """
+        if self.conexion.execute("PRAGMA user_version").fetchone()[0] >= VERSION_ESQUEMA:
+            return
+        script = []
+        for tabla, columnas in MONTOS.items():
+            tipos = {fila["name"]: fila["type"] for fila in self.conexion.execute(f"PRAGMA table_info({tabla})")}
+            if all(tipos[columna] == "INTEGER" for columna in columnas):
+                continue
+            valores = [f"CAST(ROUND({columna} * 100) AS INTEGER)" if columna in columnas else columna
+                       for columna in tipos]
+            script.append((f"ALTER TABLE {tabla} RENAME TO {tabla}_real;",
+                           f"INSERT INTO {tabla} ({', '.join(tipos)}) SELECT {', '.join(valores)} FROM {tabla}_real ORDER BY rowid;",
+                           f"DROP TABLE {tabla}_real;"))
+        # Los índices pasan con las tablas renombradas: se vuelven a crear al final
+        self.conexion.executescript(
+            "BEGIN;\n"
+            + "".join(renombrar + "\n" for renombrar, _, _ in script) + ESQUEMA
+            + "".join(copiar + "\n" + eliminar + "\n" for _, copiar, eliminar in script) + ESQUEMA
+            + f"PRAGMA user_version = {VERSION_ESQUEMA};\nCOMMIT;"
+        )
+
+    def consultar(self, sql, parametros=()):
+        """
+        Ejecuta una consulta y devuelve todas sus filas.
+        """
+        with self.candado:
+            return self.conexion.execute(sql, parametros).fetchall()
+
+    def cargar(self):
+        with self.candado:
+            vacia = not any(self.conexion.execute(f"SELECT 1 FROM {tabla} LIMIT 1").fetchone()
+                            for tabla in ("clientes", "productos", "ventas"))
+        if vacia:
+            conteo = self.importar_JSON()
+            # Todo el historial quedó cargado al importarlo
+            for coleccion in ("ventas", "pagos", "envios"):
+                particiones = self.app.particiones[coleccion] = ParticionesSQLite(self, coleccion)
+                particiones.abrir()
+                particiones.cargadas = set(particiones.particiones)
+            return conteo
+
+        app = self.app
+        conteo = {"clientes": 0, "productos": 0, "ventas": 0, "pagos": 0, "envios": 0, "omitidos": 0, "cambios": 0}
+
+        # Los clientes eliminados se conservan para mostrar sus ventas, pagos y envíos
+        for fila in self.consultar("SELECT * FROM clientes ORDER BY rowid"):
+            cliente = app.crear_cliente(dict(fila))
+            if fila["eliminado"]:
+                clave = ("cedula", fila["cedula"]) if fila["tipo"] == "Natural" else ("rif", fila["rif"])
+                app.clientes_retirados[clave] = cliente
+                continue
+            app.clientes.append(cliente)
+            app.indexar_cliente(cliente)
+            conteo["clientes"] += 1
+
+        for fila in self.consultar("SELECT * FROM productos ORDER BY id"):
+            registro = montos(fila, "productos")
+            registro["compatible_vehicles"] = json.loads(registro["compatible_vehicles"])
+            producto = Producto(*app.valores_registro(registro), store=app.productos)
+            app.productos_por_id[producto.id] = producto
+            app.ultimo_id_producto = max(app.ultimo_id_producto, producto.id)
+            conteo["productos"] += 1
+        app.indice_nombres.construir(app.productos)
+        app.indice_precios.construir(app.productos)
+        app.indice_vehiculos.construir(app.productos)
+
+        desde = None
+        if app.meses_recientes is not None:
+            desde = ParticionesMensuales.mes_anterior(app.meses_recientes - 1)
+        for coleccion in ("ventas", "pagos", "envios"):
+            particiones = app.particiones[coleccion] = ParticionesSQLite(self, coleccion)
+            particiones.abrir()
+            app.proximo_id[coleccion] = max(app.proximo_id[coleccion], particiones.id_maximo() + 1)
+            meses = None if desde is None else particiones.meses_iniciales(desde)
+            conteo["omitidos"] += app.cargar_particiones(coleccion, meses)
+        for coleccion in ("ventas", "pagos", "envios"):
+            conteo[coleccion] = len(getattr(app, coleccion))
+        return conteo
+
+    def registros(self, tabla, condicion, parametros):
+        """
+        Lee las filas de ventas, pagos o envíos que cumplen una condición, en orden de ID,
+        como registros con el formato de los archivos JSON (las ventas con sus productos).
+
+        Returns:
+            list: Registros leídos.
+        """
+        with self.candado:
+            filas = self.conexion.execute(f"SELECT * FROM {tabla} WHERE {condicion} ORDER BY id", parametros).fetchall()
+            if tabla == "ventas":
+                lineas = {}
+                for fila in self.conexion.execute(
+                        "SELECT venta_id, producto_id AS id, nombre, precio, cantidad FROM venta_productos "
+                        f"WHERE venta_id IN (SELECT id FROM ventas WHERE {condicion}) ORDER BY rowid", parametros):
+                    linea = registro(fila, "venta_productos")
+                    del linea["venta_id"]
+                    lineas.setdefault(fila["venta_id"], []).append(linea)
+        if tabla == "ventas":
+            return [{**registro(fila, "ventas"), "productos": lineas.get(fila["id"], [])} for fila in filas]
+        return [{**registro(fila, tabla), "estado": bool(fila["estado"])} for fila in filas]
+
+    def registros_ids(self, tabla, ids):
+        """
+        Lee las filas de ventas, pagos o envíos con los IDs indicados (ver `registros`).
+        """
+        ids = list(ids)
+        registros = []
+        for inicio in range(0, len(ids), IDS_POR_CONSULTA):
+            parte = ids[inicio:inicio + IDS_POR_CONSULTA]
+            registros += self.registros(tabla, f"id IN ({', '.join('?' * len(parte))})", parte)
+        return registros
+
+    def cargar_ids(self, coleccion, ids):
+        """
+        Carga en la aplicación las ventas, pagos o envíos con esos IDs que todavía no están
+        cargados, sin cargar el resto de sus meses. Para los pagos y envíos se cargan antes
+        sus ventas.
+        """
+        por_id = getattr(self.app, coleccion + "_por_id")
+        faltantes = [id for id in ids if id not in por_id]
+        if not faltantes:
+            return
+        registros = self.registros_ids(coleccion, faltantes)
+        if coleccion != "ventas":
+            self.cargar_ids("ventas", {registro["venta_id"] for registro in registros})
+        self.app.agregar_registros(coleccion, registros)
+
+    def importar_JSON(self):
+        """
+        Carga los archivos JSON de la aplicación y su registro de cambios, y copia todos los
+        datos a la base de datos.
+
+        Returns:
+            dict: Conteo de `App.cargar_datos`, con los "cambios" reproducidos del registro.
+        """
+        app = self.app
+        conteo = app.cargar_datos()
+        app.cargar_historial()
+        conteo.update({coleccion: len(getattr(app, coleccion)) for coleccion in ("ventas", "pagos", "envios")})
+        conteo["cambios"] = 0
+        for cambio in RegistroCambios(app.ruta_datos("cambios.jsonl")).leer():
+            app.aplicar_cambio(cambio)
+            conteo["cambios"] += 1
+
+        with self.candado, self.conexion:
+            self.conexion.executemany(insertar("clientes", COLUMNAS_CLIENTE),
+                                      [self._fila_cliente(app.serializar_cliente(cliente)) for cliente in app.clientes])
+            self.conexion.executemany(insertar("clientes", COLUMNAS_CLIENTE + ("eliminado",)),
+                                      [{**self._fila_cliente(app.serializar_cliente(cliente)), "eliminado": 1}
+                                       for cliente in app.clientes_retirados.values()])
+            self.conexion.executemany(insertar("productos", COLUMNAS_PRODUCTO),
+                                      [self._fila_producto(app.serializar_producto(producto)) for producto in app.productos])
+            for venta in app.ventas:
+                self._insertar_venta(app.serializar_venta(venta))
+            self.conexion.executemany(insertar("pagos", COLUMNAS_PAGO),
+                                      [self._fila_pago(app.serializar_pago(pago)) for pago in app.pagos])
+            self.conexion.executemany(insertar("envios", COLUMNAS_ENVIO),
+                                      [app.serializar_envio(envio) for envio in app.envios])
+        return conteo
+
+    @staticmethod
+    def _fila_cliente(datos):
+        return {columna: datos.get(columna) for columna in COLUMNAS_CLIENTE}
+
+    @staticmethod
+    def _fila_producto(datos):
+        fila = centavos({columna: datos[columna] for columna in COLUMNAS_PRODUCTO}, "productos")
+        fila["compatible_vehicles"] = json.dumps(datos["compatible_vehicles"])
+        return fila
+
+    @staticmethod
+    def _fila_pago(datos):
+        return centavos({columna: datos[columna] for columna in COLUMNAS_PAGO}, "pagos")
+
+    def _insertar_venta(self, datos):
+        """
+        Inserta una venta y sus productos, salvo que ya exista.
+        """
+        cursor = self.conexion.execute(insertar("ventas", COLUMNAS_VENTA).replace("INSERT", "INSERT OR IGNORE", 1),
+                                       centavos({columna: datos[columna] for columna in COLUMNAS_VENTA}, "ventas"))
+        if cursor.rowcount:
+            self.conexion.executemany(
+                "INSERT INTO venta_productos (venta_id, producto_id, nombre, precio, cantidad) VALUES (?, ?, ?, ?, ?)",
+                [(datos["id"], linea["id"], linea["nombre"], Dinero.de(linea["precio"]).centavos, linea["cantidad"])
+                 for linea in datos["productos"]]
+            )
+
+    def registrar_cambio(self, operacion, datos, sincronizar=True):
+        with self.candado:
+            self._aplicar(operacion, datos)
+            if sincronizar:
+                self.conexion.commit()
+
+    def _aplicar(self, operacion, datos):
+        """
+        Escribe un cambio en las tablas, sin confirmar la transacción.
+        """
+        if operacion == "cliente":
+            clave = "cedula" if datos["tipo"] == "Natural" else "rif"
+            fila = self._fila_cliente(datos)
+            cursor = self.conexion.execute(
+                f"UPDATE clientes SET {', '.join(f'{columna} = :{columna}' for columna in COLUMNAS_CLIENTE)} "
+                f"WHERE {clave} = :{clave} AND eliminado = 0", fila)
+            if not cursor.rowcount:
+                # Cliente nuevo, o registrado de nuevo después de eliminarlo
+                self.conexion.execute(f"DELETE FROM clientes WHERE {clave} = ?", (datos[clave],))
+                self.conexion.execute(insertar("clientes", COLUMNAS_CLIENTE), fila)
+
+        elif operacion == "cliente_eliminado":
+            clave = "cedula" if "cedula" in datos else "rif"
+            self.conexion.execute(f"UPDATE clientes SET eliminado = 1 WHERE {clave} = ?", (datos[clave],))
+
+        elif operacion == "producto":
+            fila = self._fila_producto(datos)
+            cursor = self.conexion.execute(
+                f"UPDATE productos SET {', '.join(f'{columna} = :{columna}' for columna in COLUMNAS_PRODUCTO)} "
+                f"WHERE id = :id", fila)
+            if not cursor.rowcount:
+                self.conexion.execute(insertar("productos", COLUMNAS_PRODUCTO), fila)
+
+        elif operacion == "producto_eliminado":
+            self.conexion.execute("DELETE FROM productos WHERE id = ?", (datos["id"],))
+
+        elif operacion == "venta":
+            self._insertar_venta(datos)
+            self.conexion.executemany("UPDATE productos SET inventario = ? WHERE id = ?",
+                                      [(inventario, id) for id, inventario in datos["inventarios"]])
+
+        elif operacion == "pago":
+            self.conexion.execute(insertar("pagos", COLUMNAS_PAGO, reemplazar=True), self._fila_pago(datos))
+
+        elif operacion == "envio":
+            self.conexion.execute(insertar("envios", COLUMNAS_ENVIO, reemplazar=True),
+                                  {columna: datos[columna] for columna in COLUMNAS_ENVIO})
+
+    def sincronizar(self):
+        with self.candado:
+            self.conexion.commit()
+
+    def cerrar(self):
+        # La carga del catálogo en segundo plano también registra cambios
+        self.app.catalogo_listo.wait()
+        with self.candado:
+            self.conexion.commit()
+            self.conexion.close()
+
+    def _cliente(self, fila):
+        """
+        Traduce las columnas cliente_cedula/cliente_rif de una fila al cliente de la aplicación.
+        """
+        return self.app.buscar_cliente_guardado({"cliente_cedula": fila["cliente_cedula"],
+                                                 "cliente_rif": fila["cliente_rif"]})
+
+    @staticmethod
+    def _filtro_cliente(cliente):
+        """
+        Devuelve la condición SQL y el parámetro para filtrar por un cliente.
+        """
+        if getattr(cliente, "cedula", None) is not None:
+            return "cliente_cedula = ?", (cliente.cedula,)
+        return "cliente_rif = ?", (cliente.rif,)
+
+    @staticmethod
+    def _filtro_fecha(fecha):
+        """
+        Devuelve la condición SQL y los parámetros para filtrar por un día. Las fechas se
+        guardan como "YYYY-MM-DD" o "YYYY-MM-DD HH:MM:SS", así que un día es el rango de
+        textos desde la fecha hasta la fecha seguida de "~", que puede usar el índice.
+        """
+        return RepositorioSQLite._filtro_periodo(fecha, fecha)
+
+    @staticmethod
+    def _filtro_periodo(desde, hasta):
+        """
+        Devuelve la condición SQL y los parámetros para filtrar entre dos días (inclusive).
+        """
+        return "fecha >= ? AND fecha < ?", (desde, hasta + "~")
+
+    def buscar_cliente(self, identificacion):
+        filas = self.consultar("SELECT cedula, rif FROM clientes WHERE (cedula = ? OR rif = ?) AND eliminado = 0 "
+                               "ORDER BY rowid LIMIT 1", (identificacion, identificacion))
+        if not filas:
+            return None
+        return self.app.clientes_por_cedula.get(filas[0]["cedula"]) or self.app.clientes_por_rif.get(filas[0]["rif"])
+
+    def buscar_cliente_correo(self, correo):
+        filas = self.consultar("SELECT cedula, rif FROM clientes WHERE correo = ? AND eliminado = 0 "
+                               "ORDER BY rowid LIMIT 1", (correo,))
+        if not filas:
+            return None
+        return self.app.clientes_por_cedula.get(filas[0]["cedula"]) or self.app.clientes_por_rif.get(filas[0]["rif"])
+
+    def _elementos(self, coleccion, condicion, parametros, orden="id"):
+        """
+        Devuelve las ventas, pagos o envíos que cumplen una condición, cargando los que
+        todavía no están en la aplicación.
+        """
+        ids = [fila["id"] for fila in self.consultar(f"SELECT id FROM {coleccion} WHERE {condicion} "
+                                                      f"ORDER BY {orden}", parametros)]
+        self.cargar_ids(coleccion, ids)
+        por_id = getattr(self.app, coleccion + "_por_id")
+        # Un pago o envío cuya venta no existe no se carga, como al iniciar
+        return [por_id[id] for id in ids if id in por_id]
+
+    def _ventas(self, condicion, parametros):
+        return self._elementos("ventas", condicion, parametros)
+
+    def _pagos(self, condicion, parametros):
+        return self._elementos("pagos", condicion, parametros)
+
+    def _envios(self, condicion, parametros):
+        return self._elementos("envios", condicion, parametros)
+
+    def ventas_cliente(self, cliente):
+        return self._ventas(*self._filtro_cliente(cliente))
+
+    def ventas_fecha(self, fecha):
+        return self._ventas(*self._filtro_fecha(fecha))
+
+    def ventas_periodo(self, desde, hasta):
+        return self._elementos("ventas", *self._filtro_periodo(desde, hasta), orden="substr(fecha, 1, 10), id")
+
+    def pagos_cliente(self, cliente):
+        return self._pagos(*self._filtro_cliente(cliente))
+
+    def pagos_fecha(self, fecha):
+        return self._pagos(*self._filtro_fecha(fecha))
+
+    def pagos_metodo(self, metodo_pago):
+        return self._pagos("metodo_pago = ?", (metodo_pago,))
+
+    def pagos_moneda(self, moneda):
+        return self._pagos("moneda_pago = ? COLLATE NOCASE", (moneda,))
+
+    def envios_cliente(self, cliente):
+        return self._envios(*self._filtro_cliente(cliente))
+
+    def envios_fecha(self, fecha):
+        return self._envios(*self._filtro_fecha(fecha))
+
+    def productos_mas_vendidos(self, cantidad=3):
+        # Primero se suman las unidades por producto con el índice y luego se agrupan por nombre
+        filas = self.consultar(
+            "SELECT COALESCE(p.nombre, vp.nombre) AS nombre, SUM(vp.unidades) AS unidades "
+            "FROM (SELECT producto_id, nombre, SUM(cantidad) AS unidades, MIN(rowid) AS primera "
+            "      FROM venta_productos GROUP BY producto_id) vp "
+            "LEFT JOIN productos p ON p.id = vp.producto_id "
+            "GROUP BY 1 ORDER BY unidades DESC, MIN(vp.primera) LIMIT ?", (cantidad,))
+        return [(fila["nombre"], fila["unidades"]) for fila in filas]
+
+    def productos_mas_enviados(self, cantidad=3):
+        filas = self.consultar(
+            "SELECT COALESCE(p.nombre, vp.nombre) AS nombre, SUM(vp.cantidad) AS unidades "
+            "FROM envios e JOIN venta_productos vp ON vp.venta_id = e.venta_id "
+            "LEFT JOIN productos p ON p.id = vp.producto_id "
+            "GROUP BY 1 ORDER BY unidades DESC, MIN(e.id) LIMIT ?", (cantidad,))
+        return [(fila["nombre"], fila["unidades"]) for fila in filas]
+
+    def clientes_frecuentes(self, cantidad=3):
+        filas = self.consultar(
+            "SELECT cliente_cedula, cliente_rif, COUNT(*) AS compras FROM ventas "
+            "GROUP BY cliente_cedula, cliente_rif ORDER BY compras DESC, MIN(id) LIMIT ?", (cantidad,))
+        return [(self._cliente(fila), fila["compras"]) for fila in filas]
+
+    def ventas_totales(self):
+        fila = self.consultar("SELECT COUNT(*) AS cantidad, COALESCE(SUM(total), 0) AS centavos FROM ventas")[0]
+        return fila["cantidad"], Dinero(fila["centavos"])
+
+    def pagos_totales(self):
+        fila = self.consultar(
+            "SELECT COUNT(*) AS cantidad, "
+            "COALESCE(SUM(CASE WHEN estado THEN monto_pago END), 0) AS cobrado, "
+            "COALESCE(SUM(CASE WHEN NOT estado THEN monto_pago END), 0) AS pendiente "
+            "FROM pagos")[0]
+        return fila["cantidad"], Dinero(fila["cobrado"]), Dinero(fila["pendiente"])
+
+    def clientes_pagos_pendientes(self):
+        return [self._cliente(fila)
+                for fila in self.consultar("SELECT cliente_cedula, cliente_rif FROM pagos WHERE estado = 0 ORDER BY id")]
+
+    def clientes_envios_pendientes(self):
+        return [self._cliente(fila)
+                for fila in self.consultar("SELECT cliente_cedula, cliente_rif FROM envios WHERE estado = 0 ORDER BY id")]
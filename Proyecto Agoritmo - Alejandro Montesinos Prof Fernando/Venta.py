@@ -11,13 +11,16 @@ class Venta:
         productos (dict): Productos vendidos con su cantidad (clave: Producto, valor: cantidad).
         metodo_pago (str): Método de pago utilizado.
         metodo_envio (str): Método de envío seleccionado.
-        subtotal (float): Subtotal antes de aplicar impuestos y descuentos.
-        descuento (float): Descuento aplicado a la venta.
-        iva (float): Impuesto al valor agregado.
-        igtf (float): Impuesto a las grandes transacciones financieras.
-        total (float): Total final a pagar.
+        subtotal (Dinero): Subtotal antes de aplicar impuestos y descuentos.
+        descuento (Dinero): Descuento aplicado a la venta.
+        iva (Dinero): Impuesto al valor agregado.
+        igtf (Dinero): Impuesto a las grandes transacciones financieras.
+        total (Dinero): Total final a pagar.
     """
 
+    __slots__ = ("id", "fecha", "cliente", "productos", "metodo_pago", "metodo_envio",
+                 "subtotal", "descuento", "iva", "igtf", "total")
+
     def __init__(self, id, fecha, cliente, productos, metodo_pago, metodo_envio, subtotal, descuento, iva, igtf, total):
         self.id = id
         self.fecha = fecha
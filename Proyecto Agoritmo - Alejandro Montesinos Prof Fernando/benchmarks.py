@@ -0,0 +1,1355 @@
+"""
+Mediciones de rendimiento del proyecto sobre datos sintéticos.
+
+Uso:
+    python benchmarks.py catalogo [--tamanos 100000 1000000]
+    python benchmarks.py modelo [--cantidad 200000]
+    python benchmarks.py parser [--mb 300]
+    python benchmarks.py api [--productos 20000] [--timeout 0.5]
+    python benchmarks.py rehidratacion [--ventas 1000000]
+    python benchmarks.py registro [--ventas 10000 100000]
+    python benchmarks.py guardado [--ventas 100000]
+    python benchmarks.py repositorio [--ventas 100000]
+    python benchmarks.py instantanea [--ventas 1000000]
+    python benchmarks.py compartido [--mb 100] [--procesos 4]
+    python benchmarks.py particiones [--ventas 1000000] [--meses 24]
+    python benchmarks.py autoguardado [--ventas 100000] [--cambios 500]
+    python benchmarks.py codec [--ventas 200000]
+    python benchmarks.py pedidos [--pedidos 5000] [--ventas 20000]
+    python benchmarks.py concurrencia [--hilos 16] [--ventas-hilo 300] [--productos 2] [--inventario 1000]
+    python benchmarks.py dinero [--montos 2000000]
+    python benchmarks.py lote [--carritos 1000000] [--productos 10000]
+    python benchmarks.py indice_ventas [--ventas 10000 100000 1000000] [--dias 730]
+"""
+import argparse
+import csv
+import gc
+import multiprocessing
+import json
+import os
+import random
+import sys
+import shutil
+import tempfile
+import threading
+import time
+import tracemalloc
+from array import array
+from datetime import date, timedelta
+from decimal import Decimal, ROUND_HALF_UP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from App import App
+from CodecJSON import CodecJSON, orjson
+from Dinero import Dinero
+from MotorVentas import MotorVentas
+from PreciosLote import PreciosLote, numpy
+from RegistroCambios import RegistroCambios
+from GuardadoAutomatico import GuardadoAutomatico
+from CatalogoMapeado import CatalogoMapeado
+from RepositorioSQLite import RepositorioSQLite
+from RepositorioJSON import RepositorioJSON
+from ParticionesMensuales import ParticionesMensuales
+from ProductStore import ProductStore
+from Producto import Producto
+from ClienteNatural import ClienteNatural
+from ClienteJuridico import ClienteJuridico
+from Venta import Venta
+from Pago import Pago
+from Envio import Envio
+from lector_json import iterar_arreglo, trozos_archivo
+from instantanea_binaria import leer_instantanea
+
+CATEGORIAS = ["aceites", "empacaduras", "grasas", "gomas", "filtros", "frenos", "bujias", "baterias"]
+VEHICULOS = ["Ford Fiesta", "Toyota Corolla", "Nissan Sentra", "Honda Civic", "Chevrolet Aveo"]
+
+
+def generar_productos(cantidad, semilla=0):
+    """
+    Genera tuplas con los argumentos del constructor de `Producto`.
+    """
+    aleatorio = random.Random(semilla)
+    for i in range(cantidad):
+        yield (
+            i + 1, f"Producto sintético {i + 1}", "Alta calidad",
+            round(aleatorio.uniform(1, 100), 2), aleatorio.choice(CATEGORIAS),
+            aleatorio.randint(0, 500), aleatorio.sample(VEHICULOS, aleatorio.randint(0, 3))
+        )
+
+
+class ProductoObjeto:
+    """
+    Producto con un `__dict__` por instancia, como el modelo anterior al almacén columnar.
+    """
+
+    def __init__(self, id, nombre, descripcion, precio, categoria, inventario, compatible):
+        self.id = id
+        self.nombre = nombre
+        self.descripcion = descripcion
+        self.precio = precio
+        self.categoria = categoria
+        self.inventario = inventario
+        self.compatible = compatible
+
+
+def medir_memoria(construir):
+    """
+    Ejecuta `construir` y devuelve (resultado, bytes asignados que siguen vivos).
+    """
+    gc.collect()
+    tracemalloc.start()
+    resultado = construir()
+    actual, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return resultado, actual
+
+
+def cronometrar(funcion, repeticiones=3):
+    """
+    Devuelve el mejor tiempo en segundos de varias ejecuciones de `funcion`.
+    """
+    mejor = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        duracion = time.perf_counter() - inicio
+        mejor = duracion if mejor is None or duracion < mejor else mejor
+    return mejor
+
+
+def benchmark_catalogo(tamanos):
+    """
+    Compara una lista de objetos con el `ProductStore` columnar: memoria y tiempo de los
+    filtros por precio, inventario y categoría.
+    """
+    print(f"{'productos':>10} {'modelo':>10} {'memoria MB':>11} {'precio s':>9} {'invent. s':>9} {'categ. s':>9}")
+    for cantidad in tamanos:
+        # Los datos se generan dentro de la medición para contar también los números y
+        # textos que cada modelo mantiene vivos.
+        objetos, memoria_objetos = medir_memoria(
+            lambda: [ProductoObjeto(*fila) for fila in generar_productos(cantidad)]
+        )
+        tiempos_objetos = (
+            cronometrar(lambda: [p for p in objetos if 20 <= p.precio <= 40]),
+            cronometrar(lambda: [p for p in objetos if p.inventario >= 250]),
+            cronometrar(lambda: [p for p in objetos if "gra" in p.categoria.lower()]),
+        )
+        del objetos
+
+        def construir_store():
+            store = ProductStore()
+            for fila in generar_productos(cantidad):
+                Producto(*fila, store=store)
+            return store
+
+        store, memoria_store = medir_memoria(construir_store)
+        tiempos_store = (
+            cronometrar(lambda: store.filtrar_precio(20, 40)),
+            cronometrar(lambda: store.filtrar_inventario(250)),
+            cronometrar(lambda: store.filtrar_categoria("gra")),
+        )
+        del store
+
+        for modelo, memoria, tiempos in (("objetos", memoria_objetos, tiempos_objetos),
+                                         ("columnar", memoria_store, tiempos_store)):
+            print(f"{cantidad:>10} {modelo:>10} {memoria / 1e6:>11.1f} "
+                  f"{tiempos[0]:>9.4f} {tiempos[1]:>9.4f} {tiempos[2]:>9.4f}")
+
+
+def campos(clase):
+    """
+    Devuelve los nombres de todos los `__slots__` de una clase y sus clases base.
+    """
+    return [nombre for base in reversed(clase.__mro__) for nombre in base.__dict__.get("__slots__", ())]
+
+
+def copiar(clase, original, nombres):
+    """
+    Crea una instancia de `clase` con los mismos valores de atributos que `original`,
+    sin pasar por su constructor.
+    """
+    copia = object.__new__(clase)
+    for nombre in nombres:
+        setattr(copia, nombre, getattr(original, nombre))
+    return copia
+
+
+def benchmark_modelo(cantidad):
+    """
+    Mide con tracemalloc los bytes por objeto de cada clase del modelo con `__slots__`
+    frente a una clase equivalente con `__dict__`, sobre un conjunto de datos sintético.
+    """
+    natural = ClienteNatural("ana@correo.com", "Caracas", "04120000000", "Ana Pérez", "12345678")
+    venta = Venta(0, "2024-11-17", natural, {}, "Contado", "Zoom", 10.0, 0, 1.6, 0, 11.6)
+    constructores = [
+        (ClienteNatural, lambda i: ClienteNatural("correo", "direccion", "telefono", f"nombre {i}", str(i))),
+        (ClienteJuridico, lambda i: ClienteJuridico("correo", "direccion", "telefono", f"empresa {i}", str(i),
+                                                    "contacto", "telefono", "correo")),
+        (Venta, lambda i: Venta(i, "2024-11-17", natural, {}, "Contado", "Zoom", i * 1.5, 0, i * 0.24, 0, i * 1.74)),
+        (Pago, lambda i: Pago(natural, venta, i * 1.74, "Zelle", "USD")),
+        (Envio, lambda i: Envio(natural, venta, "Zoom", None, None, None, None)),
+    ]
+
+    print(f"{'clase':>16} {'con __dict__ B/obj':>19} {'con __slots__ B/obj':>20} {'ahorro':>7}")
+    for clase, construir in constructores:
+        # Los valores se crean fuera de la medición: solo se cuenta el objeto en sí.
+        originales = [construir(i) for i in range(cantidad)]
+        nombres = campos(clase)
+        resultados = []
+        for variante in (type(clase.__name__ + "ConDict", (), {}), clase):
+            copias, memoria = medir_memoria(lambda: [copiar(variante, original, nombres) for original in originales])
+            # Se descuenta la lista que sostiene los objetos
+            resultados.append((memoria - copias.__sizeof__()) / cantidad)
+            del copias
+        antes, despues = resultados
+        print(f"{clase.__name__:>16} {antes:>19.1f} {despues:>20.1f} {1 - despues / antes:>7.0%}")
+
+
+def escribir_catalogo_api(ruta, megabytes):
+    """
+    Escribe en `ruta` un catálogo sintético con el formato de la API de al menos
+    `megabytes` MB. Devuelve la cantidad de productos escritos.
+    """
+    limite = megabytes * 1_000_000
+    escritos = 0
+    cantidad = 0
+    with open(ruta, "w") as file:
+        file.write("[")
+        for id, nombre, descripcion, precio, categoria, inventario, compatible in generar_productos(10 ** 9):
+            registro = json.dumps({
+                "id": id, "name": nombre, "description": descripcion * 20, "price": precio,
+                "category": categoria, "inventory": inventario, "compatible_vehicles": compatible
+            }, indent=4)
+            escritos += file.write(("," if cantidad else "") + registro)
+            cantidad += 1
+            if escritos >= limite:
+                break
+        file.write("]")
+    return cantidad
+
+
+def cargar_en_store(registros):
+    """
+    Construye un `ProductStore` a partir de registros con el formato de la API.
+    """
+    store = ProductStore()
+    for r in registros:
+        Producto(r["id"], r["name"], r["description"], r["price"], r["category"], r["inventory"],
+                 r["compatible_vehicles"], store=store)
+    return store
+
+
+def benchmark_parser(megabytes):
+    """
+    Compara el pico de memoria y el tiempo de cargar un catálogo grande con `json.load`
+    frente al lector incremental, que produce un registro a la vez.
+    """
+    ruta = os.path.join(tempfile.mkdtemp(), "catalogo.json")
+    cantidad = escribir_catalogo_api(ruta, megabytes)
+    print(f"Catálogo sintético: {os.path.getsize(ruta) / 1e6:.0f} MB, {cantidad} productos")
+
+    def json_completo():
+        with open(ruta) as file:
+            return cargar_en_store(json.load(file))
+
+    casos = [
+        ("json.load + store", json_completo),
+        ("incremental + store", lambda: cargar_en_store(iterar_arreglo(trozos_archivo(ruta)))),
+        ("incremental solo", lambda: sum(1 for _ in iterar_arreglo(trozos_archivo(ruta)))),
+    ]
+    print(f"{'modo':>22} {'tiempo s':>9} {'pico MB':>9} {'resultado MB':>13}")
+    for nombre, funcion in casos:
+        gc.collect()
+        inicio = time.perf_counter()
+        funcion()
+        duracion = time.perf_counter() - inicio
+
+        gc.collect()
+        tracemalloc.start()
+        resultado = funcion()
+        actual, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del resultado
+        print(f"{nombre:>22} {duracion:>9.2f} {pico / 1e6:>9.1f} {actual / 1e6:>13.1f}")
+    os.remove(ruta)
+
+
+class ManejadorCatalogo(BaseHTTPRequestHandler):
+    """
+    Responde como la API del catálogo con el catálogo de prueba del servidor: 200 con su
+    ETag y Last-Modified, o 304 si la petición trae el ETag vigente. Cada respuesta se
+    demora `servidor.demora` segundos y su código se anota en `servidor.respuestas`.
+    """
+
+    def do_GET(self):
+        servidor = self.server
+        time.sleep(servidor.demora)
+        if self.headers.get("If-None-Match") == servidor.etag:
+            servidor.respuestas.append(304)
+            self.send_response(304)
+            self.send_header("ETag", servidor.etag)
+            self.end_headers()
+            return
+        servidor.respuestas.append(200)
+        self.send_response(200)
+        self.send_header("ETag", servidor.etag)
+        self.send_header("Last-Modified", servidor.modificado)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(servidor.catalogo)))
+        self.end_headers()
+        self.wfile.write(servidor.catalogo)
+
+    def log_message(self, formato, *args):
+        pass
+
+
+def publicar_catalogo(servidor, registros, version):
+    """
+    Cambia el catálogo que sirve el servidor de prueba por una nueva versión.
+    """
+    servidor.catalogo = json.dumps(registros).encode("utf-8")
+    servidor.etag = f'"v{version}"'
+    servidor.modificado = f"Sun, {version:02d} Nov 2024 10:00:00 GMT"
+
+
+def benchmark_api(cantidad, timeout_api):
+    """
+    Prueba la carga del catálogo de `App.cargar_data_api` contra un servidor HTTP local
+    que sustituye a la API con un catálogo de `cantidad` productos: primera descarga,
+    revalidación con ETag (304), catálogo modificado, API más lenta que `timeout_api`,
+    API caída y, sin caché ni API, el respaldo de productos.json. Muestra el tiempo de
+    cada carga y de dónde salió el catálogo, y comprueba el resultado de cada caso.
+    """
+    directorio = tempfile.mkdtemp()
+    ruta_cache = os.path.join(directorio, "catalogo_cache.json")
+    registros = [{"id": id, "name": nombre, "description": descripcion, "price": precio, "category": categoria,
+                  "inventory": inventario, "compatible_vehicles": compatible}
+                 for id, nombre, descripcion, precio, categoria, inventario, compatible in generar_productos(cantidad)]
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), ManejadorCatalogo)
+    servidor.demora = 0
+    servidor.respuestas = []
+    publicar_catalogo(servidor, registros, 1)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{servidor.server_address[1]}/products.json"
+
+    def cargar():
+        app = App(url_api=url, ruta_cache=ruta_cache, timeout_api=timeout_api, directorio_datos=directorio,
+                  guardado_cada=None)
+        respuestas = len(servidor.respuestas)
+        inicio = time.perf_counter()
+        app.cargar_data_api()
+        duracion = (time.perf_counter() - inicio) * 1000
+        http = servidor.respuestas[respuestas] if len(servidor.respuestas) > respuestas else "-"
+        return app, http, duracion
+
+    def api_lenta():
+        servidor.demora = timeout_api * 10
+
+    def api_caida():
+        # server_close espera a que termine la respuesta demorada del caso anterior
+        servidor.shutdown()
+        servidor.server_close()
+
+    def sin_cache():
+        for ruta in (ruta_cache, ruta_cache + ".meta", ruta_cache + ".tvcm"):
+            os.remove(ruta)
+        with open(os.path.join(directorio, "productos.json"), "w") as file:
+            json.dump([{"id": 1, "nombre": "Respaldo", "descripcion": "", "precio": 1.5, "categoria": "aceites",
+                        "inventario": 1, "compatible_vehicles": []}], file)
+
+    # (caso, preparación, código HTTP esperado, productos esperados, precio esperado del producto 1)
+    precio = Dinero.de(registros[0]["price"])
+    casos = (
+        ("sin caché", None, 200, cantidad, precio),
+        ("caché vigente", None, 304, cantidad, precio),
+        ("catálogo modificado", lambda: publicar_catalogo(servidor, [{**registros[0], "price": 123.45}] + registros[1:], 2),
+         200, cantidad, Dinero(12345)),
+        ("API lenta", api_lenta, "-", cantidad, Dinero(12345)),
+        ("API caída", api_caida, "-", cantidad, Dinero(12345)),
+        ("sin caché ni API", sin_cache, "-", 1, Dinero(150)),
+    )
+    print(f"{cantidad} productos, timeout de la API {timeout_api} s")
+    print(f"{'caso':>20} {'HTTP':>5} {'ms':>8} {'productos':>10} {'correcto':>9}  origen")
+    for nombre, preparar, http_esperado, productos_esperados, precio_esperado in casos:
+        if preparar is not None:
+            preparar()
+        app, http, duracion = cargar()
+        correcto = (http == http_esperado and len(app.productos) == productos_esperados
+                    and app.productos_por_id[1].precio == precio_esperado)
+        if nombre == "API lenta":
+            # La carga no espera la respuesta demorada, solo `timeout_api`
+            correcto = correcto and duracion < servidor.demora * 1000
+        if app.catalogo_compartido is not None:
+            app.catalogo_compartido.cerrar()
+        print(f"{nombre:>20} {http:>5} {duracion:>8.0f} {len(app.productos):>10} {str(correcto):>9}  {app.estado_catalogo}")
+
+    shutil.rmtree(directorio)
+
+
+def escribir_arreglo(ruta, registros):
+    """
+    Escribe en `ruta` un arreglo JSON con el mismo formato que `App.guardar_JSON`, un
+    registro a la vez.
+    """
+    with open(ruta, "w") as file:
+        file.write("[")
+        for i, registro in enumerate(registros):
+            file.write(("," if i else "") + json.dumps(registro, indent=4))
+        file.write("]")
+
+
+def escribir_datos_guardados(directorio, cantidad_ventas, semilla=0, meses=None):
+    """
+    Escribe en `directorio` los cinco archivos de una sesión guardada: clientes, productos
+    y `cantidad_ventas` ventas, cada una con su pago y su envío.
+
+    Con `meses`, las ventas se reparten en partes iguales entre los últimos `meses` meses
+    hasta el actual y solo las del mes actual tienen pagos y envíos pendientes; si no, todas
+    son del 2024-11-17.
+    """
+    aleatorio = random.Random(semilla)
+    cantidad_clientes = max(1, cantidad_ventas // 100)
+    cantidad_productos = 2_000
+
+    def clientes():
+        for i in range(cantidad_clientes):
+            if i % 2:
+                yield {"tipo": "Juridico", "correo": f"empresa{i}@correo.com", "direccion": "Caracas",
+                       "telefono": "04120000000", "razon_social": f"Empresa {i}", "rif": f"J{i}",
+                       "nombre_contacto": "Contacto", "telf_contacto": "04140000000",
+                       "correo_contacto": f"contacto{i}@correo.com"}
+            else:
+                yield {"tipo": "Natural", "correo": f"cliente{i}@correo.com", "direccion": "Caracas",
+                       "telefono": "04120000000", "nombre": f"Cliente {i}", "cedula": str(i)}
+
+    def fecha(id):
+        if meses is None:
+            return "2024-11-17"
+        return ParticionesMensuales.mes_anterior(meses - 1 - id * meses // cantidad_ventas) + "-17"
+
+    def antigua(id):
+        return meses is not None and id * meses // cantidad_ventas < meses - 1
+
+    def referencia(i):
+        return {"cliente_cedula": None if i % 2 else str(i), "cliente_rif": f"J{i}" if i % 2 else None}
+
+    def ventas():
+        for id in range(cantidad_ventas):
+            lineas = [{"id": p, "nombre": f"Producto sintético {p}", "precio": 10.0, "cantidad": aleatorio.randint(1, 5)}
+                      for p in aleatorio.sample(range(1, cantidad_productos + 1), aleatorio.randint(1, 3))]
+            yield {"id": id, "fecha": fecha(id), **referencia(id % cantidad_clientes), "productos": lineas,
+                   "metodo_pago": "Zelle", "metodo_envio": "Zoom", "subtotal": 100.0, "descuento": 0,
+                   "iva": 16.0, "igtf": 3.0, "total": 119.0}
+
+    def pagos():
+        for id in range(cantidad_ventas):
+            yield {**referencia(id % cantidad_clientes), "venta_id": id, "monto_pago": 119.0, "metodo_pago": "Zelle",
+                   "moneda_pago": "USD", "estado": bool(id % 3) or antigua(id), "fecha": fecha(id) + " 10:00:00"}
+
+    def envios():
+        for id in range(cantidad_ventas):
+            yield {**referencia(id % cantidad_clientes), "venta_id": id, "servicio_envio": "Zoom",
+                   "costo_servicio": 3, "nombre_motorizado": None, "telefono_motorizado": None,
+                   "placa_motorizado": None, "fecha": fecha(id), "estado": bool(id % 2) or antigua(id)}
+
+    productos = ({"id": id, "nombre": nombre, "descripcion": descripcion, "precio": precio, "categoria": categoria,
+                  "inventario": inventario, "compatible_vehicles": compatible}
+                 for id, nombre, descripcion, precio, categoria, inventario, compatible
+                 in generar_productos(cantidad_productos, semilla))
+    for nombre, registros in (("clientes.json", clientes()), ("productos.json", productos),
+                              ("ventas.json", ventas()), ("pagos.json", pagos()), ("envios.json", envios())):
+        escribir_arreglo(os.path.join(directorio, nombre), registros)
+
+
+def benchmark_rehidratacion(cantidad_ventas):
+    """
+    Mide el arranque de una sesión guardada: el tiempo de `App.cargar_JSON` para reconstruir
+    clientes, productos, ventas, pagos y envíos con sus referencias resueltas.
+    """
+    directorio = tempfile.mkdtemp()
+    escribir_datos_guardados(directorio, cantidad_ventas)
+    tamano = sum(os.path.getsize(os.path.join(directorio, nombre)) for nombre in os.listdir(directorio))
+    print(f"Datos guardados: {tamano / 1e6:.0f} MB")
+
+    gc.collect()
+    app = App(directorio_datos=directorio)
+    inicio = time.perf_counter()
+    conteo = app.cargar_JSON()
+    duracion = time.perf_counter() - inicio
+    print(", ".join(f"{cantidad} {coleccion}" for coleccion, cantidad in conteo.items()))
+    print(f"Rehidratación: {duracion:.2f} s ({cantidad_ventas / duracion:,.0f} ventas/s)")
+    shutil.rmtree(directorio)
+
+
+def benchmark_registro(tamanos, cambios=200):
+    """
+    Compara el costo de confirmar una venta nueva reescribiendo los cinco archivos con
+    `guardar_JSON` frente a agregarla al registro de cambios, según el tamaño del historial.
+    """
+    print(f"{'ventas':>10} {'guardar_JSON ms':>16} {'registro ms/cambio':>19}")
+    for cantidad_ventas in tamanos:
+        directorio = tempfile.mkdtemp()
+        escribir_datos_guardados(directorio, cantidad_ventas)
+        app = App(directorio_datos=directorio)
+        app.cargar_JSON()
+        venta = app.ventas[-1]
+        cambio = {**app.serializar_venta(venta), "inventarios": [[p.id, p.inventario] for p in venta.productos]}
+
+        completo = cronometrar(lambda: app.guardar_JSON(todo=True), repeticiones=1)
+
+        app.registro = RegistroCambios(app.ruta_datos("cambios.jsonl"))
+        inicio = time.perf_counter()
+        for _ in range(cambios):
+            app.registrar_cambio("venta", cambio)
+        por_cambio = (time.perf_counter() - inicio) / cambios
+        app.registro.cerrar()
+
+        print(f"{cantidad_ventas:>10} {completo * 1000:>16.1f} {por_cambio * 1000:>19.3f}")
+        shutil.rmtree(directorio)
+
+
+def benchmark_guardado(cantidad_ventas):
+    """
+    Compara guardar los cinco archivos uno tras otro con el guardado paralelo de
+    `App.guardar_JSON`, y muestra cuánto se escribe cuando solo cambian algunas colecciones.
+    """
+    directorio = tempfile.mkdtemp()
+    escribir_datos_guardados(directorio, cantidad_ventas)
+    app = App(directorio_datos=directorio)
+    app.cargar_JSON()
+
+    inicio = time.perf_counter()
+    for nombre, coleccion, serializar in (("clientes.json", app.clientes, app.serializar_cliente),
+                                          ("productos.json", app.productos, app.serializar_producto),
+                                          ("ventas.json", app.ventas, app.serializar_venta),
+                                          ("envios.json", app.envios, app.serializar_envio),
+                                          ("pagos.json", app.pagos, app.serializar_pago)):
+        app.escribir_JSON(nombre, coleccion, serializar)
+    print(f"{'Secuencial, cinco archivos':>30}: {(time.perf_counter() - inicio) * 1000:.0f} ms")
+
+    casos = [
+        ("Paralelo, cinco archivos", lambda: app.guardar_JSON(todo=True)),
+        ("Después de una venta", lambda: app.modificados.update(("productos", "ventas/2024-11", "pagos/2024-11",
+                                                                 "envios/2024-11"))),
+        ("Después de editar un cliente", lambda: app.modificados.add("clientes")),
+        ("Sin cambios", lambda: None),
+    ]
+    for nombre, preparar in casos:
+        reporte = preparar() or app.guardar_JSON()
+        print(f"{nombre:>30}: {app.resumen_guardado(reporte)}")
+
+    shutil.rmtree(directorio)
+
+
+def benchmark_repositorio(cantidad_ventas):
+    """
+    Compara las búsquedas e informes de los menús resueltos sobre las listas en memoria
+    (`RepositorioJSON`) con los resueltos por consultas SQL indexadas (`RepositorioSQLite`).
+    Antes mide el arranque desde SQLite, que solo carga los meses recientes y los que tienen
+    pendientes, frente a cargar todas las filas, con las ventas repartidas en 24 meses.
+    """
+    directorio = tempfile.mkdtemp()
+    escribir_datos_guardados(directorio, cantidad_ventas, meses=24)
+    ruta = os.path.join(directorio, "tienda.db")
+    app_json = App(directorio_datos=directorio)
+    app_json.repositorio.cargar()
+    app_sqlite = App(directorio_datos=directorio, repositorio=RepositorioSQLite(ruta))
+    inicio = time.perf_counter()
+    app_sqlite.repositorio.cargar()
+    print(f"Importación a SQLite: {time.perf_counter() - inicio:.2f} s")
+    app_sqlite.catalogo_listo.set()
+    app_sqlite.repositorio.cerrar()
+    del app_sqlite
+
+    def arranque(historial):
+        app = App(directorio_datos=directorio, repositorio=RepositorioSQLite(ruta))
+        app.repositorio.cargar()
+        if historial:
+            app.cargar_historial()
+        return app
+
+    print(f"{'arranque desde SQLite':>30} {'ventas':>10} {'MB':>10} {'s':>10}")
+    for nombre, historial in (("Meses recientes y pendientes", False), ("Todas las filas", True)):
+        inicio = time.perf_counter()
+        app_sqlite, memoria = medir_memoria(lambda: arranque(historial))
+        duracion = time.perf_counter() - inicio
+        print(f"{nombre:>30} {len(app_sqlite.ventas):>10} {memoria / 1e6:>10.1f} {duracion:>10.2f}")
+        if historial:
+            app_sqlite.catalogo_listo.set()
+            app_sqlite.repositorio.cerrar()
+    app_sqlite = arranque(False)
+
+    consultas = [
+        ("Ventas de un cliente", lambda repositorio, app: repositorio.ventas_cliente(app.clientes[-1])),
+        ("Pagos de un cliente", lambda repositorio, app: repositorio.pagos_cliente(app.clientes[-1])),
+        ("Pagos en bolívares", lambda repositorio, app: repositorio.pagos_moneda("Bolívares")),
+        ("Envíos de otra fecha", lambda repositorio, app: repositorio.envios_fecha("2024-11-18")),
+        ("Productos más vendidos", lambda repositorio, app: repositorio.productos_mas_vendidos(3)),
+        ("Clientes frecuentes", lambda repositorio, app: repositorio.clientes_frecuentes(3)),
+        ("Clientes con pagos pendientes", lambda repositorio, app: repositorio.clientes_pagos_pendientes()),
+    ]
+    print(f"{'consulta':>30} {'JSON ms':>10} {'SQLite ms':>10}")
+    for nombre, consulta in consultas:
+        tiempos = [cronometrar(lambda: consulta(app.repositorio, app)) * 1000 for app in (app_json, app_sqlite)]
+        print(f"{nombre:>30} {tiempos[0]:>10.2f} {tiempos[1]:>10.2f}")
+
+    app_sqlite.catalogo_listo.set()
+    app_sqlite.repositorio.cerrar()
+    shutil.rmtree(directorio)
+
+
+def benchmark_instantanea(cantidad_ventas):
+    """
+    Compara los archivos JSON con la instantánea binaria: tamaño en disco, tiempo de
+    decodificar los registros y tiempo de arranque completo (`cargar_JSON` vs. `cargar_binario`).
+    """
+    directorio = tempfile.mkdtemp()
+    escribir_datos_guardados(directorio, cantidad_ventas)
+    app = App(directorio_datos=directorio)
+    app.cargar_JSON()
+    app.guardar_binario(todo=True)
+    del app
+
+    colecciones = ("clientes", "productos", "ventas", "pagos", "envios")
+    tamano_json = sum(os.path.getsize(os.path.join(directorio, nombre + ".json")) for nombre in colecciones)
+    tamano_binario = os.path.getsize(os.path.join(directorio, "datos.tvib"))
+
+    def decodificar_json():
+        for nombre in colecciones:
+            for _ in iterar_arreglo(trozos_archivo(os.path.join(directorio, nombre + ".json"))):
+                pass
+
+    def decodificar_binario():
+        for registros in leer_instantanea(os.path.join(directorio, "datos.tvib")).values():
+            for _ in registros:
+                pass
+
+    def arranque(cargar):
+        gc.collect()
+        app = App(directorio_datos=directorio)
+        inicio = time.perf_counter()
+        cargar(app)
+        return time.perf_counter() - inicio
+
+    filas = [
+        ("Tamaño", f"{tamano_json / 1e6:.1f} MB", f"{tamano_binario / 1e6:.1f} MB"),
+        ("Decodificar registros", f"{cronometrar(decodificar_json, 1):.2f} s",
+         f"{cronometrar(decodificar_binario, 1):.2f} s"),
+        ("Arranque completo", f"{arranque(App.cargar_JSON):.2f} s", f"{arranque(App.cargar_binario):.2f} s"),
+    ]
+    print(f"{cantidad_ventas} ventas")
+    print(f"{'':>22} {'JSON':>10} {'binario':>10}")
+    for nombre, json_, binario in filas:
+        print(f"{nombre:>22} {json_:>10} {binario:>10}")
+
+    shutil.rmtree(directorio)
+
+
+def memoria_proceso():
+    """
+    Devuelve (Rss, Pss) del proceso actual en MB, o None si el sistema no expone
+    /proc/self/smaps_rollup. El Pss reparte las páginas compartidas entre los procesos
+    que las usan.
+    """
+    try:
+        with open("/proc/self/smaps_rollup") as file:
+            valores = dict(linea.split(":", 1) for linea in file if linea.startswith(("Rss:", "Pss:")))
+    except OSError:
+        return None
+    return tuple(int(valores[clave].split()[0]) / 1024 for clave in ("Rss", "Pss"))
+
+
+def _proceso_catalogo(modo, ruta, ids, barrera, resultados):
+    """
+    Carga el catálogo en un proceso como lo haría una `App`, consulta precios por ID y,
+    cuando todos los procesos terminaron de cargar, informa su tiempo y memoria.
+    """
+    inicio = time.perf_counter()
+    if modo == "json":
+        store = cargar_en_store(iterar_arreglo(trozos_archivo(ruta)))
+        por_id = {producto.id: producto for producto in store}
+        precios = [por_id[id].precio for id in ids]
+    else:
+        catalogo = CatalogoMapeado(ruta)
+        precios = [catalogo.precio(id) for id in ids]
+    duracion = time.perf_counter() - inicio
+    barrera.wait()
+    resultados.put((duracion, memoria_proceso(), len(precios)))
+    barrera.wait()
+
+
+def benchmark_compartido(megabytes, procesos):
+    """
+    Compara varios procesos que decodifican cada uno su copia del catálogo JSON con varios
+    procesos que abren el mismo `CatalogoMapeado`: tiempo hasta poder consultar precios por
+    ID y memoria de cada proceso (Rss y Pss).
+    """
+    directorio = tempfile.mkdtemp()
+    ruta_json = os.path.join(directorio, "catalogo.json")
+    ruta_mapeado = ruta_json + ".tvcm"
+    cantidad = escribir_catalogo_api(ruta_json, megabytes)
+    app = App()
+    CatalogoMapeado.escribir(ruta_mapeado, (app.valores_registro(registro)
+                                            for registro in iterar_arreglo(trozos_archivo(ruta_json))))
+    print(f"{cantidad} productos: JSON {os.path.getsize(ruta_json) / 1e6:.0f} MB, "
+          f"mapeado {os.path.getsize(ruta_mapeado) / 1e6:.0f} MB, {procesos} procesos")
+    ids = random.Random(0).choices(range(1, cantidad + 1), k=10_000)
+
+    print(f"{'modo':>10} {'carga s':>9} {'Rss MB':>8} {'Pss MB':>8}")
+    for modo, ruta in (("json", ruta_json), ("mapeado", ruta_mapeado)):
+        barrera = multiprocessing.Barrier(procesos + 1)
+        resultados = multiprocessing.Queue()
+        hijos = [multiprocessing.Process(target=_proceso_catalogo, args=(modo, ruta, ids, barrera, resultados))
+                 for _ in range(procesos)]
+        for hijo in hijos:
+            hijo.start()
+        barrera.wait()
+        medidas = [resultados.get() for _ in hijos]
+        barrera.wait()
+        for hijo in hijos:
+            hijo.join()
+        carga = sum(duracion for duracion, _, _ in medidas) / procesos
+        memoria = [memoria for _, memoria, _ in medidas if memoria is not None]
+        if memoria:
+            rss = sum(valor[0] for valor in memoria) / len(memoria)
+            pss = sum(valor[1] for valor in memoria) / len(memoria)
+            print(f"{modo:>10} {carga:>9.2f} {rss:>8.0f} {pss:>8.0f}")
+        else:
+            print(f"{modo:>10} {carga:>9.2f} {'-':>8} {'-':>8}")
+
+    shutil.rmtree(directorio)
+
+
+def benchmark_particiones(cantidad_ventas, meses):
+    """
+    Compara cargar todos los meses de ventas, pagos y envíos con cargar solo los recientes
+    (`App.meses_recientes`), una búsqueda por una fecha antigua que abre una sola partición
+    y el guardado después de una venta, que reescribe solo el mes actual.
+    """
+    directorio = tempfile.mkdtemp()
+    escribir_datos_guardados(directorio, cantidad_ventas, meses=meses)
+    app = App(directorio_datos=directorio)
+    app.cargar_JSON()
+    inicio = time.perf_counter()
+    app.guardar_JSON()
+    print(f"{cantidad_ventas} ventas en {meses} meses, divididas por mes en {time.perf_counter() - inicio:.2f} s")
+    del app
+
+    def arranque(meses_recientes):
+        gc.collect()
+        app = App(directorio_datos=directorio, meses_recientes=meses_recientes)
+        inicio = time.perf_counter()
+        conteo = app.cargar_JSON()
+        return app, time.perf_counter() - inicio, conteo["ventas"]
+
+    fecha = ParticionesMensuales.mes_anterior(meses // 2) + "-17"
+    print(f"{'':>32} {'todos los meses':>16} {'3 meses':>10}")
+    completa, segundos_completa, ventas_completa = arranque(None)
+    reciente, segundos_reciente, ventas_reciente = arranque(3)
+    print(f"{'Arranque':>32} {segundos_completa:>14.2f} s {segundos_reciente:>8.2f} s")
+    print(f"{'Ventas cargadas':>32} {ventas_completa:>16} {ventas_reciente:>10}")
+
+    tiempos = []
+    for app in (completa, reciente):
+        repositorio = RepositorioJSON()
+        repositorio.vincular(app)
+        inicio = time.perf_counter()
+        encontrados = len(repositorio.pagos_fecha(fecha))
+        tiempos.append(time.perf_counter() - inicio)
+    print(f"{f'Pagos del {fecha} ({encontrados})':>32} {tiempos[0] * 1000:>13.0f} ms {tiempos[1] * 1000:>7.0f} ms")
+    print(f"{'Ventas cargadas después':>32} {len(completa.ventas):>16} {len(reciente.ventas):>10}")
+
+    mes = ParticionesMensuales.mes_anterior(0)
+    reciente.modificados.update(("productos", f"ventas/{mes}", f"pagos/{mes}", f"envios/{mes}"))
+    print(f"Después de una venta: {reciente.resumen_guardado(reciente.guardar_JSON())}")
+
+    shutil.rmtree(directorio)
+
+
+def benchmark_autoguardado(cantidad_ventas, cambios):
+    """
+    Mide cuánto espera el menú para registrar un cambio mientras se guarda la copia completa:
+    con el guardado bloqueante (`RegistroCambios.compactar`, que retiene el candado mientras
+    escribe) y con los puntos de control de `GuardadoAutomatico`, que solo lo retienen para
+    copiar los datos modificados.
+    """
+    directorio = tempfile.mkdtemp()
+    escribir_datos_guardados(directorio, cantidad_ventas, meses=12)
+    app = App(directorio_datos=directorio, guardado_cada=None)
+    app.cargar_JSON()
+    app.guardar_JSON()
+    del app
+
+    def sesion(guardar):
+        """
+        Registra `cambios` pagos de a uno por milisegundo mientras otro hilo guarda
+        continuamente, y devuelve los tiempos de registrar cada cambio.
+        """
+        gc.collect()
+        app = App(directorio_datos=directorio, guardado_cada=None)
+        app.catalogo_listo.set()
+        app.repositorio.cargar()
+        automatico = GuardadoAutomatico(app)
+        pagos = [pago for pago in app.pagos if not pago.estado]
+        terminado = threading.Event()
+        duraciones = []
+
+        def guardar_continuamente():
+            while not terminado.is_set():
+                inicio = time.perf_counter()
+                guardar(app, automatico)
+                duraciones.append(time.perf_counter() - inicio)
+
+        hilo = threading.Thread(target=guardar_continuamente)
+        hilo.start()
+        tiempos = []
+        for pago in (pagos * (cambios // len(pagos) + 1))[:cambios]:
+            pago.estado = not pago.estado
+            inicio = time.perf_counter()
+            app.registrar_cambio("pago", app.serializar_pago(pago))
+            tiempos.append(time.perf_counter() - inicio)
+            time.sleep(0.001)
+        terminado.set()
+        hilo.join()
+        app.registro.cerrar()
+        return sorted(tiempos), duraciones, automatico.metricas
+
+    def compactar(app, automatico):
+        with app.candado_modificados:
+            app.modificados.add("productos")
+        app.registro.compactar(app.guardar_datos)
+
+    def punto_control(app, automatico):
+        with app.candado_modificados:
+            app.modificados.add("productos")
+        automatico.punto_control()
+
+    print(f"{cantidad_ventas} ventas, {cambios} cambios registrados mientras se guarda")
+    print(f"{'':>18} {'guardados':>10} {'guardado ms':>12} {'cambio p50 ms':>14} {'p99 ms':>8} {'máx ms':>8}")
+    for nombre, guardar in (("Bloqueante", compactar), ("Punto de control", punto_control)):
+        tiempos, duraciones, metricas = sesion(guardar)
+        percentil = lambda p: tiempos[min(len(tiempos) - 1, int(len(tiempos) * p))] * 1000
+        print(f"{nombre:>18} {len(duraciones):>10} {sum(duraciones) / len(duraciones) * 1000:>12.0f} "
+              f"{percentil(0.5):>14.2f} {percentil(0.99):>8.2f} {tiempos[-1] * 1000:>8.2f}")
+        if metricas["puntos_control"]:
+            print(f"{'':>18} pausa máxima con el candado: {metricas['pausa_maxima_ms']:.1f} ms")
+
+    shutil.rmtree(directorio)
+
+
+def benchmark_codec(cantidad_ventas):
+    """
+    Compara, sobre un historial de ventas, pagos y envíos, el guardado anterior (lista de
+    diccionarios y `json.dump` con sangría) con cada modo de `CodecJSON`, con json y con
+    orjson si está instalado: registros y MB por segundo al serializar y al deserializar.
+    """
+    directorio = tempfile.mkdtemp()
+    escribir_datos_guardados(directorio, cantidad_ventas)
+    app = App(directorio_datos=directorio)
+    app.cargar_JSON()
+    colecciones = ((app.ventas, app.serializar_venta), (app.pagos, app.serializar_pago),
+                   (app.envios, app.serializar_envio))
+    registros = sum(len(elementos) for elementos, _ in colecciones)
+    ruta = os.path.join(directorio, "historial.json")
+
+    def deserializar_lista():
+        with open(ruta) as file:
+            json.load(file)
+
+    def medir(serializar, deserializar):
+        # Cada colección se escribe en el mismo archivo; se cuenta el tamaño de todas
+        segundos_escritura = 0.0
+        segundos_lectura = 0.0
+        tamano = 0
+        for elementos, serializar_elemento in colecciones:
+            gc.collect()
+            inicio = time.perf_counter()
+            serializar(elementos, serializar_elemento)
+            segundos_escritura += time.perf_counter() - inicio
+            tamano += os.path.getsize(ruta)
+            gc.collect()
+            inicio = time.perf_counter()
+            deserializar()
+            segundos_lectura += time.perf_counter() - inicio
+        return tamano, segundos_escritura, segundos_lectura
+
+    def serializar_anterior(elementos, serializar):
+        with open(ruta, "w") as file:
+            json.dump([serializar(elemento) for elemento in elementos], file, indent=4)
+
+    def codec_medido(codec):
+        def serializar(elementos, serializar_elemento):
+            with open(ruta, "wb") as file:
+                codec.escribir_arreglo(file, map(serializar_elemento, elementos))
+
+        def deserializar():
+            for _ in codec.leer_arreglo(ruta):
+                pass
+        return serializar, deserializar
+
+    variantes = [("anterior (json.dump)", serializar_anterior, deserializar_lista)]
+    for rapido in ((False, True) if orjson is not None else (False,)):
+        for modo in CodecJSON.MODOS:
+            codec = CodecJSON(modo, rapido=rapido)
+            variantes.append((codec.nombre, *codec_medido(codec)))
+
+    print(f"{cantidad_ventas} ventas, {registros} registros entre ventas, pagos y envíos")
+    if orjson is None:
+        print("orjson no está instalado: solo se mide el módulo json")
+    print(f"{'':>22} {'tamaño':>9} {'serializar':>22} {'deserializar':>22}")
+    for nombre, serializar, deserializar in variantes:
+        tamano, escritura, lectura = medir(serializar, deserializar)
+        print(f"{nombre:>22} {tamano / 1e6:>6.1f} MB "
+              f"{registros / escritura:>9.0f} reg/s {tamano / 1e6 / escritura:>5.1f} MB/s "
+              f"{registros / lectura:>9.0f} reg/s {tamano / 1e6 / lectura:>5.1f} MB/s")
+
+    shutil.rmtree(directorio)
+
+
+def escribir_pedidos(ruta, cantidad, clientes, semilla=0):
+    """
+    Escribe `cantidad` pedidos sintéticos de los `clientes` (cédulas o RIF) en un archivo
+    JSON Lines, o CSV si la ruta termina en ".csv" (ver `MotorVentas`).
+    """
+    aleatorio = random.Random(semilla)
+    tipos_pago = ("Punto de Venta", "Pago móvil", "Transferencia", "Zelle", "PayPal", "Efectivo")
+
+    def pedidos():
+        for _ in range(cantidad):
+            yield {"cliente": aleatorio.choice(clientes),
+                   "productos": [{"id": id, "cantidad": aleatorio.randint(1, 2)}
+                                 for id in aleatorio.sample(range(1, 2_001), aleatorio.randint(1, 3))],
+                   "tipo_pago": aleatorio.choice(tipos_pago),
+                   "metodo_envio": aleatorio.choice(("Zoom", "Delivery"))}
+
+    if ruta.endswith(".csv"):
+        with open(ruta, "w", newline="", encoding="utf-8") as file:
+            escritor = csv.DictWriter(file, ["cliente", "productos", "tipo_pago", "metodo_envio", "metodo_pago", "dias"])
+            escritor.writeheader()
+            for pedido in pedidos():
+                lineas = ";".join(f"{linea['id']}:{linea['cantidad']}" for linea in pedido["productos"])
+                escritor.writerow({**pedido, "productos": lineas})
+    else:
+        with open(ruta, "w", encoding="utf-8") as file:
+            for pedido in pedidos():
+                file.write(json.dumps(pedido, ensure_ascii=False) + "\n")
+
+
+def benchmark_pedidos(cantidad_pedidos, cantidad_ventas):
+    """
+    Mide cuántos pedidos por segundo registra `MotorVentas.procesar_lote` sobre un historial
+    de `cantidad_ventas` ventas, leyendo JSON Lines o CSV y sincronizando el registro de
+    cambios por cada pedido o cada 500.
+    """
+    directorio = tempfile.mkdtemp()
+    escribir_datos_guardados(directorio, cantidad_ventas)
+    with open(os.path.join(directorio, "clientes.json")) as file:
+        clientes = [cliente.get("cedula") or cliente.get("rif") for cliente in json.load(file)]
+    for extension in ("jsonl", "csv"):
+        escribir_pedidos(os.path.join(directorio, "pedidos." + extension), cantidad_pedidos, clientes)
+    respaldo = tempfile.mkdtemp()
+    for nombre in os.listdir(directorio):
+        shutil.copy(os.path.join(directorio, nombre), respaldo)
+
+    def medir(extension, cada):
+        # Cada medición parte de los mismos datos guardados
+        shutil.rmtree(directorio)
+        shutil.copytree(respaldo, directorio)
+        app = App(directorio_datos=directorio, guardado_cada=None)
+        app.repositorio.cargar()
+        app.catalogo_listo.set()
+        # Los pagos pendientes de los datos sintéticos se dan por pagados, para que no se rechacen los pedidos
+        for pago in list(app.pagos_pendientes.values()):
+            pago.estado = True
+            app.ubicar("pagos", pago)
+        gc.collect()
+        resumen = app.motor_ventas.procesar_lote(os.path.join(directorio, "pedidos." + extension), cada)
+        app.repositorio.cerrar()
+        return resumen
+
+    print(f"{cantidad_pedidos} pedidos sobre {cantidad_ventas} ventas guardadas")
+    print(f"{'':>28} {'pedidos/s':>10} {'registradas':>12} {'rechazadas':>11}")
+    for extension, cada, nombre in (("jsonl", 1, "JSON Lines, sincronizar c/u"), ("jsonl", 500, "JSON Lines, cada 500"),
+                                    ("csv", 500, "CSV, cada 500")):
+        resumen = medir(extension, cada)
+        print(f"{nombre:>28} {resumen['pedidos'] / resumen['segundos']:>10.0f} {resumen['ventas']:>12} "
+              f"{len(resumen['rechazados']):>11}")
+
+    shutil.rmtree(directorio)
+    shutil.rmtree(respaldo)
+
+
+def benchmark_concurrencia(hilos, ventas_hilo, cantidad_productos, inventario):
+    """
+    Prueba de carga de `MotorVentas.registrar_venta` con `hilos` cajas que venden a la vez
+    los mismos `cantidad_productos` productos, con `inventario` unidades cada uno, hasta
+    agotarlos. Entre llenar el carrito y registrar la venta cada caja cede el turno, como
+    mientras pide los datos del pago, así varias cajas revisan el mismo inventario antes
+    de que se descuente. La mitad de las cajas vende de contado a clientes naturales y la otra mitad
+    a crédito a los mismos clientes jurídicos, y paga enseguida el pago pendiente de cada
+    crédito, como la opción "Registrar pago". Comprueba que ninguna venta falla con otro
+    error que un rechazo, que no se vende más de lo que había, que las unidades vendidas
+    coinciden con el inventario descontado, que no hay IDs repetidos, que los pagos
+    pendientes indexados son los que tienen estado pendiente y que el registro de cambios
+    reproduce los inventarios finales. Como referencia, repite la carga con el descuento de
+    inventario anterior (revisar y restar sin candados), que con esta contención vende más
+    de lo que había; `MotorVentas` nunca.
+    """
+    directorio = tempfile.mkdtemp()
+    escribir_datos_guardados(directorio, 1_000)
+    app = App(directorio_datos=directorio, guardado_cada=None)
+    app.repositorio.cargar()
+    app.catalogo_listo.set()
+    for pago in list(app.pagos_pendientes.values()):
+        pago.estado = True
+        app.ubicar("pagos", pago)
+    productos = [app.productos_por_id[id] for id in range(1, cantidad_productos + 1)]
+    clientes = [cliente for cliente in app.clientes if getattr(cliente, "cedula", None)]
+    juridicos = [cliente for cliente in app.clientes if getattr(cliente, "rif", None)]
+
+    def carga(vender):
+        for producto in productos:
+            producto.inventario = inventario
+        vendidas = [0] * hilos
+        rechazadas = [0] * hilos
+        errores = []
+        barrera = threading.Barrier(hilos)
+
+        def caja(numero):
+            aleatorio = random.Random(numero)
+            credito = numero % 2 == 1
+            barrera.wait()
+            for _ in range(ventas_hilo):
+                carrito = {producto: aleatorio.randint(1, 3)
+                           for producto in aleatorio.sample(productos, min(2, len(productos)))}
+                cliente = aleatorio.choice(juridicos) if credito else clientes[numero % len(clientes)]
+                try:
+                    vender(cliente, carrito, credito)
+                    vendidas[numero] += sum(carrito.values())
+                except ValueError:
+                    rechazadas[numero] += 1
+                except Exception as error:
+                    errores.append(repr(error))
+
+        # Cambios de hilo lo más seguidos posible, para forzar la contención
+        intervalo = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        inicio = time.perf_counter()
+        cajas = [threading.Thread(target=caja, args=(numero,)) for numero in range(hilos)]
+        for hilo in cajas:
+            hilo.start()
+        for hilo in cajas:
+            hilo.join()
+        segundos = time.perf_counter() - inicio
+        sys.setswitchinterval(intervalo)
+        restante = sum(producto.inventario for producto in productos)
+        return sum(vendidas), sum(rechazadas), errores, restante, segundos
+
+    def vender_sin_candados(cliente, carrito, credito):
+        # Como el menú anterior: el inventario se revisaba al llenar el carrito y se
+        # descontaba al final, después de pedir el tipo de pago y el envío
+        for producto, cantidad in carrito.items():
+            if cantidad > producto.inventario:
+                raise ValueError("Sin inventario")
+        time.sleep(0)
+        for producto, cantidad in carrito.items():
+            producto.inventario -= cantidad
+
+    def vender(cliente, carrito, credito):
+        # La misma pausa de la caja que pide los datos del pago, antes de registrar la venta
+        time.sleep(0)
+        if not credito:
+            app.motor_ventas.registrar_venta(cliente, carrito, "Zelle", "Zoom", sincronizar=False)
+            return
+        _, pagos, _ = app.motor_ventas.registrar_venta(cliente, carrito, "Zelle", "Zoom", "Crédito", 15,
+                                                       sincronizar=False)
+        pendiente = pagos[-1]
+        pendiente.metodo_pago, pendiente.moneda_pago, pendiente.estado = "Zelle", "USD", True
+        app.registrar_cambio("pago", app.serializar_pago(pendiente), False)
+
+    total = inventario * cantidad_productos
+    print(f"{hilos} cajas x {ventas_hilo} ventas sobre {cantidad_productos} productos con {inventario} unidades cada uno")
+    print(f"{'':>22} {'vendidas':>9} {'descontadas':>12} {'sobreventa':>11} {'rechazadas':>11} {'errores':>8} "
+          f"{'ventas/s':>9}")
+    antes = len(app.ventas)
+    for nombre, funcion in (("Sin candados", vender_sin_candados), ("MotorVentas", vender)):
+        vendidas, rechazadas, errores, restante, segundos = carga(funcion)
+        aceptadas = hilos * ventas_hilo - rechazadas - len(errores)
+        print(f"{nombre:>22} {vendidas:>9} {total - restante:>12} {max(0, vendidas - total):>11} {rechazadas:>11} "
+              f"{len(errores):>8} {aceptadas / segundos:>9.0f}")
+        for error in sorted(set(errores)):
+            print(f"{'':>22} {errores.count(error)} x {error}")
+        assert not errores, f"{nombre}: {len(errores)} ventas fallaron con errores inesperados"
+        if funcion is vender:
+            assert vendidas == total - restante <= total, f"{nombre}: se vendió más inventario del que había"
+        elif vendidas <= total:
+            print(f"{'':>22} sin sobreventa: suba --hilos o baje --inventario para ver la carrera")
+    app.repositorio.sincronizar()
+
+    nuevas = app.ventas[antes:]
+    repetidos = sum(len(ids) - len(set(ids)) for ids in ([venta.id for venta in app.ventas],
+                                                          [pago.id for pago in app.pagos],
+                                                          [envio.id for envio in app.envios]))
+    vendido = {producto: 0 for producto in productos}
+    for venta in nuevas:
+        for producto, cantidad in venta.productos.items():
+            vendido[producto] += cantidad
+    cuadra = all(inventario - vendido[producto] == producto.inventario >= 0 for producto in productos)
+    pendientes = {pago.id for pago in app.pagos if not pago.estado}
+    indexados = set(app.pagos_pendientes) == pendientes == {id for delcliente in app.pendientes_por_cliente.values()
+                                                            for id in delcliente}
+    finales = [producto.inventario for producto in productos]
+    app.repositorio.cerrar()
+
+    recuperada = App(directorio_datos=directorio, guardado_cada=None)
+    recuperada.repositorio.cargar()
+    recuperada.catalogo_listo.set()
+    reproducidos = [recuperada.productos_por_id[producto.id].inventario for producto in productos] == finales
+    recuperada.repositorio.cerrar()
+    print(f"MotorVentas: {len(nuevas)} ventas ({sum(venta.metodo_pago == 'Crédito' for venta in nuevas)} a crédito), "
+          f"IDs repetidos: {repetidos}, inventario = inicial - vendido: {cuadra}, pagos pendientes indexados: "
+          f"{indexados}, registro de cambios reproduce los inventarios: {reproducidos}")
+
+    shutil.rmtree(directorio)
+
+
+def benchmark_dinero(cantidad_montos):
+    """
+    Compara float, `Decimal` y `Dinero` (centavos enteros) al sumar montos, como el
+    informe de ventas totales, y al calcular el IVA de cada monto redondeado al centavo.
+    La suma exacta se obtiene de los centavos con enteros de Python.
+    """
+    aleatorio = random.Random(0)
+    centavos = [aleatorio.randint(1, 500_000) for _ in range(cantidad_montos)]
+    exacto = sum(centavos)
+    variantes = (
+        ("float", [c / 100 for c in centavos],
+         lambda montos: sum(montos),
+         lambda montos: [round(monto * 0.16, 2) for monto in montos]),
+        ("Decimal", [Decimal(c).scaleb(-2) for c in centavos],
+         lambda montos: sum(montos, Decimal(0)),
+         lambda montos: [(monto * 16 / 100).quantize(Decimal("0.01"), ROUND_HALF_UP) for monto in montos]),
+        ("Dinero", [Dinero(c) for c in centavos],
+         Dinero.sumar,
+         lambda montos: [monto.porcentaje(16) for monto in montos]),
+    )
+
+    print(f"{cantidad_montos} montos, suma exacta {Dinero(exacto)}")
+    print(f"{'':>8} {'suma s':>8} {'montos/s':>12} {'suma':>18} {'error':>14} {'IVA s':>8} {'IVA montos/s':>13}")
+    for nombre, montos, sumar, calcular_iva in variantes:
+        suma = sumar(montos)
+        segundos_suma = cronometrar(lambda: sumar(montos))
+        segundos_iva = cronometrar(lambda: calcular_iva(montos), repeticiones=1)
+        # Diferencia con la suma exacta, en centavos, a partir del texto de la suma
+        error = Decimal(str(suma)).scaleb(2) - exacto
+        print(f"{nombre:>8} {segundos_suma:>8.3f} {cantidad_montos / segundos_suma:>12.0f} {str(suma):>18} "
+              f"{error:>+11.4f} ct {segundos_iva:>8.3f} {cantidad_montos / segundos_iva:>13.0f}")
+
+
+def benchmark_lote(cantidad_carritos, cantidad_productos):
+    """
+    Calcula los montos de `cantidad_carritos` carritos sintéticos (de 1 a 5 líneas) con el
+    cálculo de una venta (`MotorVentas.calcular_montos`, carrito por carrito) y con
+    `PreciosLote`, sin y con numpy. Comprueba que los montos de todos los carritos son
+    idénticos en las tres formas.
+    """
+    store = ProductStore()
+    productos = [Producto(*fila, store=store) for fila in generar_productos(cantidad_productos)]
+    aleatorio = random.Random(0)
+    columnas = {"carritos": array('q'), "productos": array('q'), "cantidades": array('q'),
+                "juridico": [], "contado": [], "usd": []}
+    for carrito in range(cantidad_carritos):
+        for _ in range(aleatorio.randint(1, 5)):
+            columnas["carritos"].append(carrito)
+            columnas["productos"].append(aleatorio.randint(1, cantidad_productos))
+            columnas["cantidades"].append(aleatorio.randint(1, 10))
+        columnas["juridico"].append(aleatorio.random() < 0.3)
+        columnas["contado"].append(aleatorio.random() < 0.8)
+        columnas["usd"].append(aleatorio.random() < 0.5)
+    lineas = len(columnas["carritos"])
+
+    def escalar():
+        # Como `MotorVentas.reservar`: subtotal con Dinero y luego calcular_montos
+        totales = []
+        juridico, contado, usd = columnas["juridico"], columnas["contado"], columnas["usd"]
+        carrito_actual, subtotal = 0, Dinero()
+        for carrito, id, cantidad in zip(columnas["carritos"], columnas["productos"], columnas["cantidades"]):
+            if carrito != carrito_actual:
+                totales.append(MotorVentas.calcular_montos(
+                    subtotal, juridico[carrito_actual], "Contado" if contado[carrito_actual] else "Crédito",
+                    "USD" if usd[carrito_actual] else "Bolívares"))
+                carrito_actual, subtotal = carrito, Dinero()
+            subtotal += productos[id - 1].precio * cantidad
+        totales.append(MotorVentas.calcular_montos(
+            subtotal, juridico[carrito_actual], "Contado" if contado[carrito_actual] else "Crédito",
+            "USD" if usd[carrito_actual] else "Bolívares"))
+        return totales
+
+    print(f"{cantidad_carritos} carritos, {lineas} líneas, {cantidad_productos} productos")
+    if numpy is None:
+        print("numpy no está instalado: solo se mide el cálculo en Python")
+    inicio = time.perf_counter()
+    referencia = escalar()
+    segundos = time.perf_counter() - inicio
+    print(f"{'calcular_montos':>16} {segundos:>8.3f} s {cantidad_carritos / segundos:>12.0f} carritos/s")
+
+    for vectorizado in ((False, True) if numpy is not None else (False,)):
+        lote = PreciosLote(store, vectorizado=vectorizado)
+        gc.collect()
+        inicio = time.perf_counter()
+        resultado = lote.calcular(**columnas)
+        segundos = time.perf_counter() - inicio
+        identicos = all(PreciosLote.montos(resultado, carrito)[1:] == montos
+                        for carrito, montos in enumerate(referencia))
+        print(f"{'PreciosLote ' + lote.nombre:>16} {segundos:>8.3f} s {cantidad_carritos / segundos:>12.0f} carritos/s"
+              f"   montos idénticos: {'sí' if identicos else 'NO'}")
+
+
+def benchmark_indice_ventas(tamanos, dias):
+    """
+    Compara las búsquedas de ventas recorriendo la lista completa, como antes de
+    `IndiceVentas`, con las de `RepositorioJSON` sobre los índices por cliente y por fecha,
+    para historiales de distintos tamaños repartidos en `dias` días.
+    """
+    inicio_historial = date(2024, 1, 1)
+    print(f"{'ventas':>10} {'consulta':>18} {'recorrido ms':>13} {'índice ms':>10} {'resultados':>11}")
+    for cantidad in tamanos:
+        directorio = tempfile.mkdtemp()
+        app = App(directorio_datos=directorio, guardado_cada=None)
+        clientes = [ClienteNatural(f"cliente{i}@correo.com", "Caracas", "04120000000", f"Cliente {i}", str(i))
+                    for i in range(max(1, cantidad // 100))]
+        aleatorio = random.Random(0)
+        inicio = time.perf_counter()
+        for id in range(cantidad):
+            fecha = (inicio_historial + timedelta(days=id * dias // cantidad)).isoformat()
+            app.agregar_elemento("ventas", Venta(id, fecha, aleatorio.choice(clientes), {}, "Contado", "Zoom",
+                                                 Dinero(), Dinero(), Dinero(), Dinero(), Dinero()))
+        print(f"{cantidad:>10} {'carga':>18} {'':>13} {(time.perf_counter() - inicio) * 1000:>10.0f}")
+
+        cliente = clientes[-1]
+        dia = (inicio_historial + timedelta(days=dias // 2)).isoformat()
+        hasta = (inicio_historial + timedelta(days=dias // 2 + 29)).isoformat()
+        consultas = (
+            ("cliente", lambda: [venta for venta in app.ventas if venta.cliente == cliente],
+             lambda: app.repositorio.ventas_cliente(cliente)),
+            ("un día", lambda: [venta for venta in app.ventas if venta.fecha.split(" ")[0] == dia],
+             lambda: app.repositorio.ventas_fecha(dia)),
+            ("30 días", lambda: [venta for venta in app.ventas if dia <= venta.fecha.split(" ")[0] <= hasta],
+             lambda: app.repositorio.ventas_periodo(dia, hasta)),
+        )
+        for nombre, recorrido, indice in consultas:
+            assert recorrido() == indice()
+            print(f"{'':>10} {nombre:>18} {cronometrar(recorrido) * 1000:>13.2f} "
+                  f"{cronometrar(indice) * 1000:>10.3f} {len(indice()):>11}")
+        shutil.rmtree(directorio)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks de la tienda de vehículos.")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    catalogo = subparsers.add_parser("catalogo", help="Lista de objetos vs. ProductStore columnar.")
+    catalogo.add_argument("--tamanos", type=int, nargs="+", default=[100_000, 1_000_000])
+
+    modelo = subparsers.add_parser("modelo", help="Bytes por objeto con __dict__ vs. __slots__.")
+    modelo.add_argument("--cantidad", type=int, default=200_000)
+
+    parser_json = subparsers.add_parser("parser", help="json.load vs. lector incremental del catálogo.")
+    parser_json.add_argument("--mb", type=int, default=300)
+
+    api = subparsers.add_parser("api", help="Carga del catálogo contra una API local: ETag, 304 y respaldos.")
+    api.add_argument("--productos", type=int, default=20_000)
+    api.add_argument("--timeout", type=float, default=0.5)
+
+    rehidratacion = subparsers.add_parser("rehidratacion", help="Arranque desde los archivos JSON guardados.")
+    rehidratacion.add_argument("--ventas", type=int, default=1_000_000)
+
+    registro = subparsers.add_parser("registro", help="Reescritura completa vs. registro de cambios.")
+    registro.add_argument("--ventas", type=int, nargs="+", default=[10_000, 100_000])
+
+    guardado = subparsers.add_parser("guardado", help="Guardado secuencial vs. paralelo de las colecciones modificadas.")
+    guardado.add_argument("--ventas", type=int, default=100_000)
+
+    repositorio = subparsers.add_parser("repositorio", help="Búsquedas en memoria vs. consultas SQL indexadas.")
+    repositorio.add_argument("--ventas", type=int, default=100_000)
+
+    instantanea = subparsers.add_parser("instantanea", help="Archivos JSON vs. instantánea binaria.")
+    instantanea.add_argument("--ventas", type=int, default=1_000_000)
+
+    compartido = subparsers.add_parser("compartido", help="Catálogo JSON por proceso vs. catálogo mapeado compartido.")
+    compartido.add_argument("--mb", type=int, default=100)
+    compartido.add_argument("--procesos", type=int, default=4)
+
+    particiones = subparsers.add_parser("particiones", help="Carga de todos los meses vs. solo los recientes.")
+    particiones.add_argument("--ventas", type=int, default=1_000_000)
+    particiones.add_argument("--meses", type=int, default=24)
+
+    autoguardado = subparsers.add_parser("autoguardado", help="Guardado bloqueante vs. puntos de control en segundo plano.")
+    autoguardado.add_argument("--ventas", type=int, default=100_000)
+    autoguardado.add_argument("--cambios", type=int, default=500)
+
+    codec = subparsers.add_parser("codec", help="Serializar y deserializar el historial con cada codificación JSON.")
+    codec.add_argument("--ventas", type=int, default=200_000)
+
+    pedidos = subparsers.add_parser("pedidos", help="Pedidos por segundo de la carga de pedidos por lotes.")
+    pedidos.add_argument("--pedidos", type=int, default=5_000)
+    pedidos.add_argument("--ventas", type=int, default=20_000)
+
+    concurrencia = subparsers.add_parser("concurrencia", help="Ventas en paralelo sobre los mismos productos.")
+    concurrencia.add_argument("--hilos", type=int, default=16)
+    concurrencia.add_argument("--ventas-hilo", type=int, default=300)
+    concurrencia.add_argument("--productos", type=int, default=2)
+    concurrencia.add_argument("--inventario", type=int, default=1_000)
+
+    dinero = subparsers.add_parser("dinero", help="Sumas y porcentajes con float, Decimal y centavos enteros.")
+    dinero.add_argument("--montos", type=int, default=2_000_000)
+
+    lote = subparsers.add_parser("lote", help="Montos de muchos carritos: venta por venta vs. PreciosLote.")
+    lote.add_argument("--carritos", type=int, default=1_000_000)
+    lote.add_argument("--productos", type=int, default=10_000)
+
+    indice_ventas = subparsers.add_parser("indice_ventas", help="Búsquedas de ventas: recorrido completo vs. índices.")
+    indice_ventas.add_argument("--ventas", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    indice_ventas.add_argument("--dias", type=int, default=730)
+
+    args = parser.parse_args()
+    if args.benchmark == "catalogo":
+        benchmark_catalogo(args.tamanos)
+    elif args.benchmark == "modelo":
+        benchmark_modelo(args.cantidad)
+    elif args.benchmark == "parser":
+        benchmark_parser(args.mb)
+    elif args.benchmark == "api":
+        benchmark_api(args.productos, args.timeout)
+    elif args.benchmark == "rehidratacion":
+        benchmark_rehidratacion(args.ventas)
+    elif args.benchmark == "registro":
+        benchmark_registro(args.ventas)
+    elif args.benchmark == "guardado":
+        benchmark_guardado(args.ventas)
+    elif args.benchmark == "repositorio":
+        benchmark_repositorio(args.ventas)
+    elif args.benchmark == "instantanea":
+        benchmark_instantanea(args.ventas)
+    elif args.benchmark == "compartido":
+        benchmark_compartido(args.mb, args.procesos)
+    elif args.benchmark == "particiones":
+        benchmark_particiones(args.ventas, args.meses)
+    elif args.benchmark == "autoguardado":
+        benchmark_autoguardado(args.ventas, args.cambios)
+    elif args.benchmark == "codec":
+        benchmark_codec(args.ventas)
+    elif args.benchmark == "pedidos":
+        benchmark_pedidos(args.pedidos, args.ventas)
+    elif args.benchmark == "concurrencia":
+        benchmark_concurrencia(args.hilos, args.ventas_hilo, args.productos, args.inventario)
+    elif args.benchmark == "dinero":
+        benchmark_dinero(args.montos)
+    elif args.benchmark == "lote":
+        benchmark_lote(args.carritos, args.productos)
+    elif args.benchmark == "indice_ventas":
+        benchmark_indice_ventas(args.ventas, args.dias)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+"""
+Formato binario de las copias completas de los datos (instantáneas).
+
+Un archivo guarda varias colecciones, cada una en formato columnar: los valores de cada
+campo se escriben juntos en un bloque precedido por su longitud. Los números se guardan
+como enteros o reales de 8 bytes, y los textos repetidos (categorías, vehículos, tipos de
+pago, monedas, fechas) se escriben una sola vez en una tabla de textos, y cada fila
+guarda solo su posición en la tabla.
+
+Estructura del archivo (enteros sin signo, little-endian):
+
+    "TVIB"  versión (u16)  cantidad de colecciones (u32)
+    por colección: nombre, cantidad de filas (u64), cantidad de campos (u32)
+        por campo: nombre, tipo (texto JSON), longitud del bloque (u64), bloque
+
+Los nombres y tipos se escriben como longitud (u16) seguida del texto en UTF-8. Los tipos
+de campo son "entero", "real", "booleano", "texto", ["lista", tipo] y
+["registro", [[nombre, tipo], ...]]; cualquier valor puede ser None.
+"""
+import json
+import os
+import struct
+import sys
+from array import array
+
+MAGICO = b"TVIB"
+VERSION = 1
+
+_TIPOS_ARREGLO = {"entero": "q", "real": "d"}
+
+
+def _bytes_arreglo(arreglo):
+    """
+    Devuelve los bytes de un arreglo de números en el orden del archivo (little-endian).
+    """
+    if sys.byteorder == "big":
+        arreglo = array(arreglo.typecode, arreglo)
+        arreglo.byteswap()
+    return arreglo.tobytes()
+
+
+def _leer_arreglo(codigo, datos):
+    arreglo = array(codigo)
+    arreglo.frombytes(datos)
+    if sys.byteorder == "big":
+        arreglo.byteswap()
+    return arreglo
+
+
+def _texto_corto(texto):
+    datos = texto.encode("utf-8")
+    return struct.pack("<H", len(datos)) + datos
+
+
+def _codificar_textos(textos):
+    """
+    Codifica textos sin nulos como desplazamientos (u32) seguidos del texto concatenado.
+    """
+    codificados = [texto.encode("utf-8") for texto in textos]
+    desplazamientos = array("I", [0])
+    total = 0
+    for codificado in codificados:
+        total += len(codificado)
+        desplazamientos.append(total)
+    return _bytes_arreglo(desplazamientos) + b"".join(codificados)
+
+
+def _decodificar_textos(datos, cantidad):
+    tamano = 4 * (cantidad + 1)
+    desplazamientos = _leer_arreglo("I", datos[:tamano])
+    texto = bytes(datos[tamano:])
+    return [texto[desplazamientos[i]:desplazamientos[i + 1]].decode("utf-8") for i in range(cantidad)]
+
+
+def codificar_columna(tipo, valores):
+    """
+    Codifica los valores de un campo en su bloque binario.
+
+    El bloque empieza con un byte que indica si hay nulos; en ese caso le sigue un byte
+    por fila (1 si es None). Los nulos se guardan como 0 o texto vacío.
+
+    Args:
+        tipo (str | list): Tipo del campo.
+        valores (list): Valores del campo, uno por fila.
+
+    Returns:
+        bytes: Bloque del campo.
+    """
+    nulos = bytes(valor is None for valor in valores)
+    partes = [b"\x01" + nulos if any(nulos) else b"\x00"]
+
+    if isinstance(tipo, str) and tipo in _TIPOS_ARREGLO:
+        partes.append(_bytes_arreglo(array(_TIPOS_ARREGLO[tipo], (0 if valor is None else valor for valor in valores))))
+
+    elif tipo == "booleano":
+        partes.append(bytes(bool(valor) for valor in valores))
+
+    elif tipo == "texto":
+        textos = ["" if valor is None else valor for valor in valores]
+        tabla = {}
+        for texto in textos:
+            tabla.setdefault(texto, len(tabla))
+        if len(tabla) * 2 <= len(textos):
+            # Tabla de textos: cada texto distinto una vez y un índice (u32) por fila
+            partes.append(b"T" + struct.pack("<I", len(tabla)) + _codificar_textos(tabla))
+            partes.append(_bytes_arreglo(array("I", (tabla[texto] for texto in textos))))
+        else:
+            partes.append(b"P" + _codificar_textos(textos))
+
+    elif tipo[0] == "lista":
+        # Desplazamientos (u64) de cada fila dentro de la columna de elementos
+        desplazamientos = array("Q", [0])
+        elementos = []
+        for valor in valores:
+            elementos.extend(valor or ())
+            desplazamientos.append(len(elementos))
+        bloque = codificar_columna(tipo[1], elementos)
+        partes += [_bytes_arreglo(desplazamientos), struct.pack("<Q", len(bloque)), bloque]
+
+    elif tipo[0] == "registro":
+        for nombre, tipo_campo in tipo[1]:
+            bloque = codificar_columna(tipo_campo, [None if valor is None else valor[nombre] for valor in valores])
+            partes += [struct.pack("<Q", len(bloque)), bloque]
+
+    else:
+        raise ValueError(f"Tipo de campo desconocido: {tipo!r}")
+    return b"".join(partes)
+
+
+def decodificar_columna(tipo, datos, cantidad):
+    """
+    Decodifica el bloque binario de un campo.
+
+    Args:
+        tipo (str | list): Tipo del campo.
+        datos (memoryview): Bloque del campo.
+        cantidad (int): Cantidad de filas.
+
+    Returns:
+        list: Valores del campo, uno por fila.
+    """
+    posicion = 1
+    nulos = None
+    if datos[0]:
+        nulos = bytes(datos[1:1 + cantidad])
+        posicion += cantidad
+
+    if isinstance(tipo, str) and tipo in _TIPOS_ARREGLO:
+        valores = _leer_arreglo(_TIPOS_ARREGLO[tipo], datos[posicion:posicion + 8 * cantidad]).tolist()
+
+    elif tipo == "booleano":
+        valores = [bool(valor) for valor in datos[posicion:posicion + cantidad]]
+
+    elif tipo == "texto":
+        modo = bytes(datos[posicion:posicion + 1])
+        posicion += 1
+        if modo == b"T":
+            (distintos,) = struct.unpack_from("<I", datos, posicion)
+            posicion += 4
+            tamano = 4 * (distintos + 1)
+            fin_tabla = posicion + tamano + _leer_arreglo("I", datos[posicion:posicion + tamano])[-1]
+            tabla = _decodificar_textos(datos[posicion:fin_tabla], distintos)
+            indices = _leer_arreglo("I", datos[fin_tabla:fin_tabla + 4 * cantidad])
+            valores = [tabla[indice] for indice in indices]
+        else:
+            valores = _decodificar_textos(datos[posicion:], cantidad)
+
+    elif tipo[0] == "lista":
+        tamano = 8 * (cantidad + 1)
+        desplazamientos = _leer_arreglo("Q", datos[posicion:posicion + tamano])
+        posicion += tamano
+        (longitud,) = struct.unpack_from("<Q", datos, posicion)
+        posicion += 8
+        elementos = decodificar_columna(tipo[1], datos[posicion:posicion + longitud], desplazamientos[-1])
+        valores = [elementos[desplazamientos[i]:desplazamientos[i + 1]] for i in range(cantidad)]
+
+    elif tipo[0] == "registro":
+        nombres = []
+        columnas = []
+        for nombre, tipo_campo in tipo[1]:
+            (longitud,) = struct.unpack_from("<Q", datos, posicion)
+            posicion += 8
+            nombres.append(nombre)
+            columnas.append(decodificar_columna(tipo_campo, datos[posicion:posicion + longitud], cantidad))
+            posicion += longitud
+        valores = [dict(zip(nombres, fila)) for fila in zip(*columnas)]
+
+    else:
+        raise ValueError(f"Tipo de campo desconocido: {tipo!r}")
+
+    if nulos is not None:
+        valores = [None if nulo else valor for valor, nulo in zip(valores, nulos)]
+    return valores
+
+
+def escribir_instantanea(ruta, colecciones):
+    """
+    Escribe una instantánea en un archivo temporal y lo reemplaza de una sola vez.
+
+    Args:
+        ruta (str): Archivo de la instantánea.
+        colecciones (dict): Nombre -> (esquema, registros), donde el esquema es una lista de
+            (campo, tipo) y los registros son diccionarios con esos campos.
+
+    Returns:
+        int: Bytes escritos.
+    """
+    with open(ruta + ".tmp", "wb") as file:
+        file.write(MAGICO + struct.pack("<HI", VERSION, len(colecciones)))
+        for nombre, (esquema, registros) in colecciones.items():
+            file.write(_texto_corto(nombre) + struct.pack("<QI", len(registros), len(esquema)))
+            for campo, tipo in esquema:
+                bloque = codificar_columna(tipo, [registro.get(campo) for registro in registros])
+                file.write(_texto_corto(campo) + _texto_corto(json.dumps(tipo)) + struct.pack("<Q", len(bloque)))
+                file.write(bloque)
+        file.flush()
+        os.fsync(file.fileno())
+        escritos = file.tell()
+    os.replace(ruta + ".tmp", ruta)
+    return escritos
+
+
+def leer_instantanea(ruta):
+    """
+    Lee una instantánea escrita por `escribir_instantanea`.
+
+    Cada colección se decodifica recién cuando se recorre: primero sus campos, columna por
+    columna, y luego se generan los registros uno a uno, con los mismos diccionarios que se
+    guardan en los archivos JSON.
+
+    Args:
+        ruta (str): Archivo de la instantánea.
+
+    Returns:
+        dict: Nombre de la colección -> generador de sus registros.
+
+    Raises:
+        ValueError: Si el archivo no es una instantánea o su versión no es compatible.
+    """
+    with open(ruta, "rb") as file:
+        datos = memoryview(file.read())
+    if bytes(datos[:4]) != MAGICO:
+        raise ValueError(f"{ruta} no es una instantánea binaria")
+    version, cantidad_colecciones = struct.unpack_from("<HI", datos, 4)
+    if version != VERSION:
+        raise ValueError(f"Versión de instantánea no compatible: {version}")
+    posicion = 10
+
+    def texto_corto():
+        nonlocal posicion
+        (longitud,) = struct.unpack_from("<H", datos, posicion)
+        posicion += 2 + longitud
+        return bytes(datos[posicion - longitud:posicion]).decode("utf-8")
+
+    colecciones = {}
+    for _ in range(cantidad_colecciones):
+        nombre = texto_corto()
+        filas, cantidad_campos = struct.unpack_from("<QI", datos, posicion)
+        posicion += 12
+        campos = []
+        for _ in range(cantidad_campos):
+            campo = texto_corto()
+            tipo = json.loads(texto_corto())
+            (longitud,) = struct.unpack_from("<Q", datos, posicion)
+            posicion += 8
+            campos.append((campo, tipo, datos[posicion:posicion + longitud]))
+            posicion += longitud
+        colecciones[nombre] = _registros(campos, filas)
+    return colecciones
+
+
+def _registros(campos, filas):
+    """
+    Decodifica las columnas de una colección y genera sus registros.
+    """
+    nombres = [campo for campo, _, _ in campos]
+    columnas = [decodificar_columna(tipo, bloque, filas) for _, tipo, bloque in campos]
+    for fila in zip(*columnas):
+        yield dict(zip(nombres, fila))
@@ -0,0 +1,109 @@
+"""
+Lectura incremental de arreglos JSON.
+
+Permite recorrer un arreglo JSON de nivel superior (como el catálogo de la API o
+productos.json) elemento por elemento a partir de trozos de texto o bytes, sin
+decodificar el documento completo en memoria.
+"""
+import codecs
+import json
+
+TAMANO_TROZO = 64 * 1024
+
+_decodificador = json.JSONDecoder()
+_ESPACIOS = " \t\n\r"
+_SEPARADORES = _ESPACIOS + ",]"
+
+
+def trozos_archivo(ruta, tamano=TAMANO_TROZO):
+    """
+    Genera el contenido de un archivo en trozos de bytes.
+
+    Args:
+        ruta (str): Ruta del archivo.
+        tamano (int): Tamaño de cada trozo en bytes.
+    """
+    with open(ruta, "rb") as file:
+        while True:
+            trozo = file.read(tamano)
+            if not trozo:
+                break
+            yield trozo
+
+
+def iterar_arreglo(trozos):
+    """
+    Genera uno a uno los elementos de un arreglo JSON recibido en trozos.
+
+    Solo se mantiene en memoria el texto pendiente de decodificar, que es a lo sumo
+    un elemento más un trozo.
+
+    Args:
+        trozos (iterable): Trozos del documento, como `bytes` (UTF-8) o `str`.
+
+    Raises:
+        ValueError: Si el documento no es un arreglo JSON válido.
+    """
+    decodificador_utf8 = codecs.getincrementaldecoder("utf-8")()
+    texto = ""
+    posicion = 0
+    abierto = False  # Ya se leyó el "["
+    esperando_elemento = True  # Falta un elemento (al inicio o después de una coma)
+    fin_datos = False
+    leidos = 0
+    trozos = iter(trozos)
+
+    while True:
+        # Salta espacios y separadores antes del siguiente elemento
+        while posicion < len(texto) and texto[posicion] in _ESPACIOS:
+            posicion += 1
+
+        if posicion < len(texto):
+            caracter = texto[posicion]
+            if not abierto:
+                if caracter != "[":
+                    raise ValueError("El documento no es un arreglo JSON.")
+                abierto = True
+                posicion += 1
+                continue
+            if caracter == "]":
+                if esperando_elemento and leidos:
+                    raise ValueError("Coma final inesperada en el arreglo JSON.")
+                return
+            if caracter == ",":
+                if esperando_elemento:
+                    raise ValueError("Coma inesperada en el arreglo JSON.")
+                esperando_elemento = True
+                posicion += 1
+                continue
+            if not esperando_elemento:
+                raise ValueError("Falta una coma entre elementos del arreglo JSON.")
+
+            try:
+                elemento, fin = _decodificador.raw_decode(texto, posicion)
+            except json.JSONDecodeError:
+                if fin_datos:
+                    raise ValueError("Arreglo JSON incompleto o inválido.")
+                fin = None
+            # El elemento solo está completo si lo sigue un separador: un número al final
+            # del texto (por ejemplo "2" de "2.5") podría continuar en el siguiente trozo.
+            if fin is not None and (fin_datos or (fin < len(texto) and texto[fin] in _SEPARADORES)):
+                posicion = fin
+                esperando_elemento = False
+                leidos += 1
+                yield elemento
+                continue
+        elif fin_datos:
+            raise ValueError("Arreglo JSON incompleto.")
+
+        # Se necesita más texto: se descarta lo ya consumido y se agrega un trozo
+        trozo = next(trozos, None)
+        if trozo is None:
+            fin_datos = True
+            pendiente = decodificador_utf8.decode(b"", final=True)
+        elif isinstance(trozo, bytes):
+            pendiente = decodificador_utf8.decode(trozo)
+        else:
+            pendiente = trozo
+        texto = texto[posicion:] + pendiente
+        posicion = 0
@@ -1,7 +1,45 @@
+import argparse
+
 from App import App
+from CodecJSON import CodecJSON
+from RepositorioJSON import RepositorioJSON
+from RepositorioSQLite import RepositorioSQLite
 
 def main():
-    app = App()
-    app.start()
+    parser = argparse.ArgumentParser(description="Tienda de vehículos")
+    parser.add_argument("--almacenamiento", choices=("json", "sqlite"), default="json",
+                        help="Dónde se guardan los datos (por defecto, archivos JSON)")
+    parser.add_argument("--base-datos", default="tienda.db",
+                        help="Archivo de la base de datos SQLite")
+    parser.add_argument("--formato", choices=("json", "binario"), default="json",
+                        help="Formato de la copia completa de los datos con almacenamiento json")
+    parser.add_argument("--meses-recientes", type=int, default=3,
+                        help="Meses de ventas, pagos y envíos que se cargan al iniciar (0 para todos)")
+    parser.add_argument("--guardado-cada", type=float, default=300,
+                        help="Segundos máximos entre puntos de control del guardado automático (0 para desactivarlo)")
+    parser.add_argument("--json-compacto", action="store_true",
+                        help="Guardar los archivos JSON sin sangría ni espacios")
+    parser.add_argument("--exportar-jsonl", metavar="CARPETA",
+                        help="Exportar ventas, pagos y envíos a archivos JSON Lines y salir")
+    parser.add_argument("--importar-jsonl", metavar="CARPETA",
+                        help="Importar ventas, pagos y envíos de archivos JSON Lines y salir")
+    parser.add_argument("--pedidos", metavar="ARCHIVO",
+                        help="Registrar las ventas de un archivo de pedidos (JSON Lines o CSV) y salir")
+    argumentos = parser.parse_args()
+
+    if argumentos.almacenamiento == "sqlite":
+        repositorio = RepositorioSQLite(argumentos.base_datos)
+    else:
+        repositorio = RepositorioJSON()
+    app = App(repositorio=repositorio, formato=argumentos.formato,
+              meses_recientes=argumentos.meses_recientes or None,
+              guardado_cada=argumentos.guardado_cada or None,
+              codec_json=CodecJSON("compacto" if argumentos.json_compacto else "indentado"))
+    if argumentos.pedidos:
+        app.ejecutar_pedidos(argumentos.pedidos)
+    elif argumentos.exportar_jsonl or argumentos.importar_jsonl:
+        app.ejecutar_JSONL(argumentos.importar_jsonl, argumentos.exportar_jsonl)
+    else:
+        app.start()
 
-main()
\ No newline at end of file
+main()